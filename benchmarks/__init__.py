@@ -0,0 +1 @@
+# Benchmarks for the ingest pipeline; run from the repo root with `python -m benchmarks.<name>`.
@@ -0,0 +1,66 @@
+"""Shared timing helpers for the benchmark scripts."""
+from __future__ import annotations
+
+import multiprocessing as mp
+import resource
+import sys
+import time
+from typing import Any, Callable
+
+
+def _peak_rss_mb() -> float:
+    # Prefer VmHWM on Linux: ru_maxrss survives exec, so a spawned child would
+    # report the parent's peak
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _child(conn, fn: Callable, args: tuple) -> None:
+    base = _peak_rss_mb()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    conn.send((elapsed, _peak_rss_mb(), base))
+    conn.close()
+
+
+def measure_isolated(fn: Callable, *args: Any) -> dict:
+    """Run ``fn(*args)`` in a fresh process so peak RSS isn't shared between runs."""
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(child, fn, args))
+    proc.start()
+    elapsed, peak, base = parent.recv()
+    proc.join()
+    return {"seconds": elapsed, "peak_rss_mb": peak, "rss_delta_mb": peak - base}
+
+
+def best_of(fn: Callable, *args: Any, repeat: int = 3) -> float:
+    """Best wall time over ``repeat`` in-process runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(rows: list[dict], columns: list[str]) -> None:
+    widths = {c: max(len(c), *(len(_fmt(r.get(c))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(c)).ljust(widths[c]) for c in columns))
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
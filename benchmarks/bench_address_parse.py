@@ -0,0 +1,84 @@
+"""Throughput of the vectorized address parser against the per-row apply.
+
+    python -m benchmarks.bench_address_parse --rows 100000 --min-speedup 10
+
+Speedups are against the original per-row path, which rebuilt and sorted the
+state-token table on every call; the scalar parser with the hoisted table is
+reported alongside for reference. Both gated paths are timed best-of
+``--repeat``; the exit status only reflects ``--min-speedup`` when it is given,
+since a ratio near the threshold moves with timing noise.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+
+import pandas as pd
+
+from benchmarks._common import best_of, print_table
+from ingest.scripts.enrich import STATE_MAP, _parse_address, parse_addresses
+
+
+def _legacy_parse_address(raw):
+    # Per-call token table, as enrich_markets built it before parse_addresses
+    sorted({**STATE_MAP, **{abbr.lower(): abbr for abbr in STATE_MAP.values()}}.items(), key=lambda kv: -len(kv[0]))
+    return _parse_address(raw)
+
+
+def make_addresses(rows: int, seed: int = 7) -> pd.Series:
+    rng = random.Random(seed)
+    states = list(STATE_MAP) + sorted(set(STATE_MAP.values()))
+    streets = ["Main St", "Market Rd", "Farm Ln", "County Road 12", "Elm Street", "Hwy 50"]
+    cities = ["Columbus", "Springfield", "Kansas City", "Portland", "Athens", "Fairview", "Salem"]
+    values = []
+    for i in range(rows):
+        street = f"{rng.randint(1, 9999)} {rng.choice(streets)}"
+        city = rng.choice(cities)
+        state = rng.choice(states)
+        zipcode = f"{rng.randint(1000, 99999):05d}"
+        roll = rng.random()
+        if roll < 0.7:
+            values.append(f"{street}, {city}, {state} {zipcode}")
+        elif roll < 0.85:
+            values.append(f"{street}, {city}, {state} {zipcode}, USA")
+        elif roll < 0.95:
+            values.append(f"{street} {city} {state}")
+        else:
+            values.append(rng.choice([None, "", f"Near the {city} fairgrounds"]))
+    return pd.Series(values, dtype="string")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=None, help="Exit 1 below this speedup (e.g. 10)")
+    args = parser.parse_args()
+
+    addresses = make_addresses(args.rows)
+    legacy = best_of(lambda: addresses.apply(_legacy_parse_address), repeat=args.repeat)
+    scalar = best_of(lambda: addresses.apply(_parse_address), repeat=1)
+    vector = best_of(lambda: parse_addresses(addresses), repeat=args.repeat)
+
+    rows = [
+        {"parser": "apply (per-call token sort)", "seconds": legacy},
+        {"parser": "apply(_parse_address)", "seconds": scalar},
+        {"parser": "parse_addresses", "seconds": vector},
+    ]
+    for row in rows:
+        row["rows_per_sec"] = int(args.rows / row["seconds"])
+        row["speedup"] = f"{legacy / row['seconds']:.1f}x"
+    print_table(rows, ["parser", "seconds", "rows_per_sec", "speedup"])
+
+    speedup = legacy / vector
+    if args.min_speedup is None:
+        print(f"speedup: {speedup:.1f}x")
+        return
+    print(f"speedup: {speedup:.1f}x (required {args.min_speedup:.0f}x)")
+    if speedup < args.min_speedup:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Wall time and peak RSS of the pandas and Arrow backends (``--backend arrow``).
+
+Stage timings come from the in-process profiler on primed caches, so they
+cover schema coercion, enrichment and validation rather than Excel parsing;
+``cli validate`` then runs in a fresh process per backend for peak RSS.
+
+    python -m benchmarks.bench_arrow_backend --rows 100000 --datasets farmers_market,csa,food_hub
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks._common import measure_isolated, print_table
+from benchmarks.bench_low_memory import run_cli
+from benchmarks.synthetic import write_datasets
+
+ROOT = Path(__file__).resolve().parents[1]
+STAGES = ("enrich_markets", "basic_validate")
+
+
+def stage_times(workspace: str, backend: str) -> dict:
+    from ingest.scripts import cli
+    from ingest.scripts.profiling import Profiler
+
+    os.chdir(workspace)
+    base, _ = cli._prepare_datasets(backend=backend)
+    with Profiler().activate() as profiler:
+        cli._run_pipeline(base, backend=backend)
+    return {r["stage"]: r["wall_s"] for r in profiler.records if r["stage"] in STAGES}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Total rows across datasets")
+    parser.add_argument("--datasets", default="farmers_market,csa,food_hub")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ws = Path(tmp)
+        (ws / "ingest").symlink_to(ROOT / "src" / "ingest", target_is_directory=True)
+        write_datasets(ws / "data" / "raw", args.rows, args.datasets.split(","), seed=11)
+
+        results = []
+        for backend in ("pandas", "arrow"):
+            # Prime this backend's cache entries before timing anything
+            measure_isolated(run_cli, str(ws), "validate", "--backend", backend)
+            times = stage_times(str(ws), backend)
+            stats = measure_isolated(run_cli, str(ws), "validate", "--backend", backend)
+            results.append({"backend": backend, **times, **stats})
+        print_table(results, ["backend", *STAGES, "seconds", "peak_rss_mb", "rss_delta_mb"])
+        for name in STAGES:
+            print(f"{name}: {results[0][name] / results[1][name]:.2f}x faster with --backend arrow")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Single-pass centroid engine against the per-group ZIP and city loops.
+
+    python -m benchmarks.bench_centroids --rows 1000000 --min-speedup 5
+
+``legacy`` is generate_zip_centroids + generate_city_centroids as they were
+before ``compute_centroids`` (a Python loop over the ZIP groups, iterrows with
+a per-group count lookup for cities). The outputs are checked for equality.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import best_of, print_table
+from ingest.scripts.centroids import compute_centroids
+from ingest.scripts.enrich import with_zip_means
+
+
+def _legacy_zip_centroids(df: pd.DataFrame) -> dict:
+    centroids = {}
+    coords = df[['zip', 'zip_lat', 'zip_lon']].dropna(subset=['zip_lat', 'zip_lon'])
+    for zip_code, group in coords.groupby('zip'):
+        zip_str = str(zip_code).strip()
+        if zip_code and zip_str:
+            centroids[zip_str] = [float(group['zip_lat'].mean()), float(group['zip_lon'].mean())]
+    if not centroids:
+        return centroids
+    prefix_frame = coords.copy()
+    prefix_frame['prefix'] = prefix_frame['zip'].astype(str).str[:3]
+    for prefix, row in prefix_frame.groupby('prefix')[['zip_lat', 'zip_lon']].mean().iterrows():
+        if prefix and prefix not in centroids:
+            centroids[prefix] = [float(row['zip_lat']), float(row['zip_lon'])]
+    return centroids
+
+
+def _legacy_city_centroids(df: pd.DataFrame) -> dict:
+    city_data = df[['search_city_norm', 'search_state_norm', 'latitude', 'longitude']].copy()
+    city_data = city_data.dropna(subset=['search_city_norm', 'latitude', 'longitude'])
+    keys = ['search_city_norm', 'search_state_norm']
+    grouped = city_data.groupby(keys)[['latitude', 'longitude']].mean()
+    counts = city_data.groupby(keys).size()
+    centroids, totals, states = {}, {}, {}
+    for (city, state), row in grouped.iterrows():
+        lat, lon = float(row['latitude']), float(row['longitude'])
+        if city:
+            states.setdefault(city, set()).add(state or '')
+            centroids[f"{city}|{state}" if state else city] = [lat, lon]
+            t_lat, t_lon, t_count = totals.get(city, (0.0, 0.0, 0))
+            count = int(counts.loc[(city, state)])
+            totals[city] = (t_lat + lat * count, t_lon + lon * count, t_count + count)
+    for city, (lat_sum, lon_sum, count) in totals.items():
+        if len({s for s in states[city] if s}) <= 1:
+            centroids.setdefault(city, [lat_sum / count, lon_sum / count])
+    return centroids
+
+
+def make_frame(rows: int, seed: int = 23) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    zips = np.char.zfill(rng.integers(500, 99999, 30_000).astype(str), 5)
+    cities = np.array([f"city {i}" for i in range(20_000)], dtype=object)
+    states = np.array(["", "OH", "CA", "NY", "TX", "WA"], dtype=object)
+    df = pd.DataFrame({
+        "zip": zips[rng.zipf(1.3, rows) % len(zips)],
+        "search_city_norm": cities[rng.zipf(1.2, rows) % len(cities)],
+        "search_state_norm": states[rng.integers(0, len(states), rows)],
+        "latitude": rng.uniform(25, 49, rows),
+        "longitude": rng.uniform(-124, -67, rows),
+    })
+    df.loc[rng.random(rows) < 0.03, "zip"] = ""
+    df.loc[rng.random(rows) < 0.02, "latitude"] = np.nan
+    return with_zip_means(df)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=5.0)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    legacy = best_of(lambda: (_legacy_zip_centroids(df), _legacy_city_centroids(df)), repeat=1)
+    engine = best_of(lambda: compute_centroids(df), repeat=args.repeat)
+
+    centroids = compute_centroids(df)
+    if centroids.zip_centroids() != _legacy_zip_centroids(df) or centroids.city_centroids() != _legacy_city_centroids(df):
+        sys.exit("centroid outputs differ")
+
+    rows = [
+        {"path": "legacy loops", "seconds": legacy},
+        {"path": "compute_centroids", "seconds": engine},
+    ]
+    for row in rows:
+        row["rows_per_sec"] = int(args.rows / row["seconds"])
+        row["speedup"] = f"{legacy / row['seconds']:.1f}x"
+    print_table(rows, ["path", "seconds", "rows_per_sec", "speedup"])
+    print(f"zip: {len(centroids.zip)}  zip3: {len(centroids.zip3)}  city: {len(centroids.city)}")
+
+    speedup = legacy / engine
+    print(f"speedup: {speedup:.1f}x (required {args.min_speedup:.0f}x)")
+    if speedup < args.min_speedup:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
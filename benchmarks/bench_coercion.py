@@ -0,0 +1,85 @@
+"""Per-dtype micro-benchmark of the schema coercion engine.
+
+    python -m benchmarks.bench_coercion --rows 200000
+
+Each schema dtype is coerced from an Excel-like object column (mixed
+types, padding, some unparseable values). ``legacy`` is what
+``apply_schema`` spent on such a column before ``coerce``: a per-value
+lambda for bools, and a second whole-column strip for strings. ``int`` and
+``category`` are new types and have no legacy path.
+"""
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import best_of, print_table
+from ingest.scripts.coerce import coerce_column
+
+
+def _legacy_bool(series: pd.Series) -> pd.Series:
+    return series.map(lambda v: bool(int(v)) if pd.notna(v) and str(v).strip().isdigit() else bool(v) if pd.notna(v) else False)
+
+
+def _legacy_str(series: pd.Series) -> pd.Series:
+    # Schema strip, then the global df.apply strip over every string column
+    return series.astype("string").str.strip().str.strip()
+
+
+LEGACY = {
+    "bool": _legacy_bool,
+    "float": lambda s: pd.to_numeric(s, errors="coerce"),
+    "datetime": lambda s: pd.to_datetime(s, errors="coerce", utc=True),
+    "str": _legacy_str,
+}
+
+
+def make_columns(rows: int, seed: int = 11) -> dict:
+    rng = np.random.default_rng(seed)
+
+    def pick(choices):
+        return pd.Series(np.array(choices, dtype=object)[rng.integers(0, len(choices), rows)], dtype=object)
+
+    numbers = rng.uniform(-120, 120, rows).round(4)
+    floats = pd.Series(numbers, dtype=object)
+    floats[rng.random(rows) < 0.02] = "n/a"
+    floats[rng.random(rows) < 0.05] = None
+    ints = pd.Series(rng.integers(0, 99999, rows), dtype=object)
+    ints[rng.random(rows) < 0.03] = " 1200 "
+    ints[rng.random(rows) < 0.01] = "unknown"
+    dates = pd.Series(pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D"), dtype=object)
+    dates[rng.random(rows) < 0.05] = None
+    text = pd.Series([f"  Market {i} " for i in rng.integers(0, 50_000, rows)], dtype=object)
+    return {
+        "bool": pick([1, 0, "1", "0", None, True, "Y"]),
+        "float": floats,
+        "int": ints,
+        "datetime": dates,
+        "str": text,
+        "category": pick([" OH", "CA ", "NY", "TX", None, "wa"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", choices=["pandas", "arrow"], default="pandas")
+    args = parser.parse_args()
+
+    results = []
+    for typ, series in make_columns(args.rows).items():
+        new = best_of(lambda: coerce_column(series, typ, args.backend), repeat=args.repeat)
+        _, failed = coerce_column(series, typ, args.backend)
+        row = {"dtype": typ, "legacy_s": "-", "engine_s": new, "speedup": "-", "failed": failed}
+        if typ in LEGACY:
+            legacy = best_of(lambda: LEGACY[typ](series), repeat=1 if typ == "bool" else args.repeat)
+            row.update(legacy_s=legacy, speedup=f"{legacy / new:.1f}x")
+        results.append(row)
+    print_table(results, ["dtype", "legacy_s", "engine_s", "speedup", "failed"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Blocked near-duplicate detection at scale.
+
+    python -m benchmarks.bench_duplicates --rows 500000
+
+Markets are scattered around the synthetic cities; a share of them is listed
+again by another dataset with a reworded name ("Farmers Market" -> "Market
+CSA"), an abbreviated address, a few metres of coordinate jitter and
+sometimes no coordinates at all. The planted clusters are the ground truth
+for precision and recall. ``all_pairs`` is the number of comparisons the
+stage would need without blocking.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import best_of, print_table
+from benchmarks.synthetic import CITIES
+from ingest.scripts.duplicates import canonical_records, find_duplicates, load_config
+
+DATASETS = ["farmers_market", "csa", "on_farm_market", "food_hub", "agritourism"]
+SUFFIXES = ["Farmers Market", "Market", "Farm Stand", "CSA", "Food Hub"]
+STREETS = [("Street", "St"), ("Avenue", "Ave"), ("Road", "Rd"), ("Boulevard", "Blvd"), ("Lane", "Ln")]
+
+
+def make_frame(rows: int, duplicate_rate: float = 0.1, seed: int = 25) -> pd.DataFrame:
+    """``rows`` listings, ``duplicate_rate`` of them copies of another; ``truth`` is the planted cluster."""
+    rng = np.random.default_rng(seed)
+    words = np.array(["".join(rng.choice(list("bcdfghjklmnprstvwz"), 3)) + w for w in ("a", "e", "o", "u") for _ in range(600)], dtype=object)
+    copies = int(rows * duplicate_rate)
+    base = rows - copies
+
+    city = rng.integers(0, len(CITIES), base)
+    lat = np.array([c[4] for c in CITIES])[city] + rng.normal(0, 0.4, base)
+    lon = np.array([c[5] for c in CITIES])[city] + rng.normal(0, 0.4, base)
+    street = rng.integers(0, len(STREETS), base)
+    name = words[rng.integers(0, len(words), base)] + " " + words[rng.integers(0, len(words), base)]
+    suffix = rng.integers(0, len(SUFFIXES), base)
+    number = rng.integers(1, 9999, base).astype(str)
+    road = words[rng.integers(0, len(words), base)]
+    place = np.array([f"{c[0]}, {c[2]}" for c in CITIES], dtype=object)[city]
+    zips = np.array([c[3] for c in CITIES], dtype=object)[city] + np.char.zfill(rng.integers(0, 100, base).astype(str), 2).astype(object)
+    dataset = rng.integers(0, len(DATASETS), base)
+
+    source = rng.choice(base, copies)
+    shift = rng.integers(1, len(DATASETS), copies)
+    long_name = np.array([s for s, _ in STREETS], dtype=object)
+    short_name = np.array([s for _, s in STREETS], dtype=object)
+
+    df = pd.DataFrame({
+        "source_dataset": np.array(DATASETS, dtype=object)[np.r_[dataset, (dataset[source] + shift) % len(DATASETS)]],
+        "listing_name": np.r_[
+            name + " " + np.array(SUFFIXES, dtype=object)[suffix],
+            "The " + name[source] + " " + np.array(SUFFIXES, dtype=object)[rng.integers(0, len(SUFFIXES), copies)],
+        ],
+        "full_address": np.r_[
+            number + " " + road + " " + long_name[street] + ", " + place + ", " + zips,
+            number[source] + " " + road[source] + " " + short_name[street[source]] + ", " + place[source] + " " + zips[source],
+        ],
+        "zip": np.r_[zips, zips[source]],
+        "latitude": np.r_[lat, lat[source] + rng.normal(0, 0.0003, copies)],
+        "longitude": np.r_[lon, lon[source] + rng.normal(0, 0.0003, copies)],
+        "truth": np.r_[np.arange(base), source],
+    })
+    df.loc[base + np.flatnonzero(rng.random(copies) < 0.1), ["latitude", "longitude"]] = np.nan
+    df["record_id"] = df["source_dataset"] + ":" + pd.Series(np.arange(rows)).astype(str)
+    return df
+
+
+def _pairs(labels: np.ndarray) -> set:
+    """Unordered row pairs sharing a label (clusters are small)."""
+    frame = pd.DataFrame({"label": labels, "row": np.arange(len(labels))})
+    frame = frame[frame.groupby("label")["row"].transform("size") > 1]
+    joined = frame.merge(frame, on="label")
+    joined = joined[joined["row_x"] < joined["row_y"]]
+    return set(zip(joined["row_x"], joined["row_y"]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    args = parser.parse_args()
+
+    config = load_config("src/ingest/config/dedupe.yml")
+    df = make_frame(args.rows, args.duplicate_rate)
+    report: dict = {}
+    cluster_ids = find_duplicates(df, config, report)
+    found, truth = _pairs(cluster_ids.to_numpy()), _pairs(df["truth"].to_numpy())
+    hits = len(found & truth)
+    precision = hits / max(len(found), 1)
+    recall = hits / max(len(truth), 1)
+
+    detect = best_of(lambda: find_duplicates(df, config), repeat=args.repeat)
+    canonical = best_of(lambda: canonical_records(df, cluster_ids, config["priority"]), repeat=1)
+    print_table(
+        [
+            {"step": "find_duplicates", "seconds": detect, "rows_per_sec": int(args.rows / detect)},
+            {"step": "canonical_records", "seconds": canonical, "rows_per_sec": int(args.rows / canonical)},
+        ],
+        ["step", "seconds", "rows_per_sec"],
+    )
+    all_pairs = args.rows * (args.rows - 1) // 2
+    print(
+        f"candidate pairs: {report['candidate_pairs']:,} blocked, {report['compared_pairs']:,} compared "
+        f"({report['compared_pairs'] / all_pairs:.2e} of {all_pairs:,} all pairs)"
+    )
+    print(f"clusters: {report['clusters']:,}  records in clusters: {report['records_in_clusters']:,}")
+    print(f"precision: {precision:.3f}  recall: {recall:.3f} (required {args.min_recall:.2f})")
+    if recall < args.min_recall:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare pd.read_excel against the projected streaming reader.
+
+    python -m benchmarks.bench_excel_reader --rows 20000 --extra-columns 40
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import measure_isolated, print_table
+from ingest.scripts.ingest_excel import ingest_excel, projected_columns
+
+SCHEMA = "ingest/config/schema.yml"
+MAPPING = "ingest/config/mapping_programs.yml"
+EXPORTS = "ingest/config/export_profiles.yml"
+
+
+def make_workbook(path: Path, rows: int, extra_columns: int) -> None:
+    rng = np.random.default_rng(7)
+    data = {
+        "listing_id": np.arange(1, rows + 1),
+        "listing_name": [f"Market {i}" for i in range(rows)],
+        "location_address": [f"{i} Main St, Columbus, Ohio {43000 + i % 900:05d}" for i in range(rows)],
+        "location_x": rng.uniform(-120, -70, rows),
+        "location_y": rng.uniform(25, 48, rows),
+        "orgnization": ["Org"] * rows,
+        "FNAP_1": rng.integers(0, 2, rows),
+        "FNAP_2": rng.integers(0, 2, rows),
+        "SNAP_option": ["Accept EBT at a central location"] * rows,
+        "SNAP_option_1": rng.integers(0, 2, rows),
+        "location_desc": ["Parking lot"] * rows,
+    }
+    # USDA workbooks carry dozens of product/season columns we never read
+    for i in range(extra_columns):
+        data[f"extra_{i}"] = [f"value {i}-{j % 17}" for j in range(rows)]
+    pd.DataFrame(data).to_excel(path, index=False)
+
+
+def run_engine(path: str, engine: str) -> None:
+    columns = projected_columns(SCHEMA, MAPPING, EXPORTS) if engine == "stream" else None
+    ingest_excel(path, SCHEMA, engine=engine, columns=columns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--extra-columns", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "farmersmarket_bench.xlsx"
+        make_workbook(path, args.rows, args.extra_columns)
+        results = []
+        for engine in ("pandas", "stream"):
+            stats = measure_isolated(run_engine, str(path), engine)
+            results.append({"engine": engine, **stats})
+        print_table(results, ["engine", "seconds", "peak_rss_mb", "rss_delta_mb"])
+        print(f"speedup: {results[0]['seconds'] / results[1]['seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
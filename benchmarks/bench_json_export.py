@@ -0,0 +1,86 @@
+"""Row-format JSON export: the old to_json/loads/dump round trip vs the chunked writer.
+
+Both write the ``search`` profile's columns of an enriched synthetic frame.
+Peak RSS is measured in a fresh process per writer; both load the same pickled
+frame first, so the difference is the writer's own footprint.
+
+    python -m benchmarks.bench_json_export --rows 200000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from benchmarks._common import best_of, measure_isolated, print_table
+from benchmarks.synthetic import make_listings
+
+SCHEMA = "ingest/config/schema.yml"
+MAPPING = "ingest/config/mapping_programs.yml"
+EXPORTS = "ingest/config/export_profiles.yml"
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    from ingest.scripts.cli import _tag_dataset
+    from ingest.scripts.enrich import enrich_markets
+    from ingest.scripts.ingest_excel import apply_schema
+    from ingest.scripts.map_programs import map_program_flags
+
+    base = _tag_dataset(apply_schema(make_listings(rows, seed=4), SCHEMA), "farmers_market", "Farmers Markets", "farmers_market")
+    df = enrich_markets(map_program_flags(base, MAPPING))
+    with open(EXPORTS, "r", encoding="utf-8") as f:
+        fields = yaml.safe_load(f)["search"]["fields"]
+    return df[[c for c in fields if c in df.columns]]
+
+
+def write_legacy(data: pd.DataFrame, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(json.loads(data.to_json(orient="records")), out, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_streaming(data: pd.DataFrame, path: str) -> None:
+    from ingest.scripts.json_writer import write_json_records
+
+    with open(path, "w", encoding="utf-8") as out:
+        write_json_records(data, out)
+
+
+WRITERS = {"legacy": write_legacy, "streaming": write_streaming}
+
+
+def load_and_write(frame_path: str, writer: str, out_path: str) -> None:
+    WRITERS[writer](pd.read_pickle(frame_path), out_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_frame(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_path = Path(tmp) / "frame.pkl"
+        data.to_pickle(frame_path)
+        results, outputs = [], {}
+        for name, writer in WRITERS.items():
+            out_path = str(Path(tmp) / f"{name}.json")
+            seconds = best_of(writer, data, out_path, repeat=args.repeat)
+            isolated = measure_isolated(load_and_write, str(frame_path), name, out_path)
+            outputs[name] = Path(out_path).read_bytes()
+            results.append({
+                "writer": name,
+                "seconds": seconds,
+                "peak_rss_mb": isolated["peak_rss_mb"],
+                "bytes": len(outputs[name]),
+            })
+        print_table(results, ["writer", "seconds", "peak_rss_mb", "bytes"])
+        print(f"identical output: {outputs['legacy'] == outputs['streaming']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Peak RSS and wall time of ``cli validate`` / ``cli run`` with and without ``--low-memory``.
+
+Each mode runs in a fresh process against the same synthetic workbooks; the
+ingest cache is primed first so both measure the pipeline, not Excel parsing.
+``validate`` covers only the DataFrame stages the mode changes; ``run`` adds
+the exports, whose JSON serialization sets the end-to-end peak.
+
+    python -m benchmarks.bench_low_memory --rows 100000 --datasets farmers_market,csa,food_hub
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks._common import measure_isolated, print_table
+from benchmarks.synthetic import write_datasets
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_cli(workspace: str, command: str, *args: str) -> None:
+    from typer.testing import CliRunner
+
+    from ingest.scripts.cli import APP
+
+    os.chdir(workspace)
+    result = CliRunner().invoke(APP, [command, *args])
+    if result.exit_code != 0:
+        raise RuntimeError(f"cli {command} failed: {result.output}") from result.exception
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Total rows across datasets")
+    parser.add_argument("--datasets", default="farmers_market,csa,food_hub")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ws = Path(tmp)
+        (ws / "ingest").symlink_to(ROOT / "src" / "ingest", target_is_directory=True)
+        write_datasets(ws / "data" / "raw", args.rows, args.datasets.split(","), seed=11)
+        measure_isolated(run_cli, str(ws), "validate")
+
+        results = []
+        for command in ("validate", "run"):
+            for mode, flags in (("default", ()), ("low_memory", ("--low-memory",))):
+                stats = measure_isolated(run_cli, str(ws), command, *flags)
+                results.append({"command": command, "mode": mode, **stats})
+        print_table(results, ["command", "mode", "seconds", "peak_rss_mb", "rss_delta_mb"])
+        for default, lean in zip(results[::2], results[1::2]):
+            saved = default["rss_delta_mb"] - lean["rss_delta_mb"]
+            print(f"{default['command']}: peak RSS delta {saved:.1f} MB lower ({saved / default['rss_delta_mb']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Token-index queries against the linear haystack scan the map does today.
+
+    python -m benchmarks.bench_search_index --rows 100000 --queries 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+import pandas as pd
+
+from benchmarks._common import best_of, print_table
+from ingest.scripts.enrich import _normalize_text
+from ingest.scripts.search_index import build_index, query
+
+WORDS = [
+    "farm", "farmers", "market", "fresh", "harvest", "green", "valley", "orchard", "community", "garden",
+    "organic", "saturday", "downtown", "county", "fair", "co", "op", "csa", "berry", "produce",
+]
+CITIES = ["columbus", "springfield", "kansas city", "portland", "athens", "fairview", "salem", "miami"]
+STATES = ["oh", "il", "mo", "or", "ga", "tn", "ma", "fl"]
+
+
+def make_frame(rows: int, seed: int = 3) -> pd.DataFrame:
+    rng = random.Random(seed)
+    hay, city, state, zips = [], [], [], []
+    for _ in range(rows):
+        c = rng.choice(CITIES)
+        s = rng.choice(STATES)
+        z = f"{rng.randint(1000, 99999):05d}"
+        words = " ".join(rng.choices(WORDS, k=rng.randint(3, 10)))
+        hay.append(f"{words} {rng.randint(1, 9999)} main st {c} {s} {z}")
+        city.append(c)
+        state.append(s.upper())
+        zips.append(z)
+    return pd.DataFrame({
+        "record_id": [f"r{i}" for i in range(rows)],
+        "search_haystack": hay,
+        "search_city_norm": city,
+        "search_state_norm": state,
+        "search_zip": zips,
+    })
+
+
+def linear_scan(haystacks: list[str], text: str) -> list[int]:
+    # Mirrors the map: every term must occur somewhere in the normalized haystack
+    terms = _normalize_text(text).split()
+    return [i for i, hay in enumerate(haystacks) if all(t in hay for t in terms)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    started = time.perf_counter()
+    index = build_index(df)
+    build_seconds = time.perf_counter() - started
+    size_mb = len(json.dumps(index, separators=(",", ":"))) / 1e6
+
+    rng = random.Random(11)
+    vocab = WORDS + CITIES + STATES
+    queries = [" ".join(rng.sample(vocab, rng.randint(1, 3))) for _ in range(args.queries)]
+    haystacks = [_normalize_text(h) for h in df["search_haystack"]]
+
+    scan = best_of(lambda: [linear_scan(haystacks, q) for q in queries], repeat=1)
+    indexed = best_of(lambda: [query(index, q) for q in queries], repeat=3)
+
+    print(f"index build: {build_seconds:.2f}s, {len(index['terms'])} terms, {size_mb:.1f} MB JSON")
+    print_table(
+        [
+            {"method": "linear scan", "ms_per_query": 1000 * scan / len(queries)},
+            {"method": "token index", "ms_per_query": 1000 * indexed / len(queries)},
+        ],
+        ["method", "ms_per_query"],
+    )
+    print(f"speedup: {scan / indexed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Grid-index radius queries against a brute-force haversine scan.
+
+    python -m benchmarks.bench_spatial_index --markets 100000 --queries 500 --miles 25
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import best_of, print_table
+from ingest.scripts.spatial_index import CELL_DEGREES, GridIndex, brute_force_radius
+
+
+def make_markets(n: int, seed: int = 5) -> pd.DataFrame:
+    # Clustered around metro centres inside the continental US, like the real data
+    rng = np.random.default_rng(seed)
+    centres = np.column_stack([rng.uniform(26, 48, 300), rng.uniform(-123, -70, 300)])
+    picks = centres[rng.integers(0, len(centres), n)]
+    return pd.DataFrame({
+        "latitude": picks[:, 0] + rng.normal(0, 0.6, n),
+        "longitude": picks[:, 1] + rng.normal(0, 0.8, n),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--markets", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--miles", type=float, default=25.0)
+    parser.add_argument("--cell-degrees", type=float, default=CELL_DEGREES)
+    args = parser.parse_args()
+
+    df = make_markets(args.markets)
+    lat = df["latitude"].to_numpy()
+    lon = df["longitude"].to_numpy()
+    rng = np.random.default_rng(9)
+    centres = df.sample(args.queries, random_state=1).to_numpy() + rng.normal(0, 0.1, (args.queries, 2))
+
+    started = time.perf_counter()
+    index = GridIndex(df["latitude"], df["longitude"], args.cell_degrees)
+    build = time.perf_counter() - started
+
+    for clat, clon in centres[:20]:
+        assert index.query_radius(clat, clon, args.miles).tolist() == brute_force_radius(clat, clon, args.miles, lat, lon).tolist()
+
+    brute = best_of(lambda: [brute_force_radius(a, b, args.miles, lat, lon) for a, b in centres], repeat=1)
+    grid = best_of(lambda: [index.query_radius(a, b, args.miles) for a, b in centres], repeat=3)
+
+    print(f"index build: {build * 1000:.1f} ms for {args.markets} markets, {len(index.cell_ids)} cells")
+    print_table(
+        [
+            {"method": "brute force", "ms_per_query": 1000 * brute / len(centres)},
+            {"method": "grid index", "ms_per_query": 1000 * grid / len(centres)},
+        ],
+        ["method", "ms_per_query"],
+    )
+    print(f"speedup: {brute / grid:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
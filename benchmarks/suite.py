@@ -0,0 +1,175 @@
+"""Pipeline benchmark suite on synthetic data, with JSON baselines.
+
+Times each public stage (``ingest_excel``, ``map_program_flags``,
+``enrich_markets``, ``basic_validate``, ``export_from_profile`` and both
+centroid generators) at ``--rows`` plus an end-to-end ``cli run``. Excel
+reading and the end-to-end run use their own, smaller row counts because
+writing large workbooks dominates otherwise.
+
+    python -m benchmarks.suite --rows 100000 --save benchmarks/baselines/local.json
+    python -m benchmarks.suite --rows 100000 --baseline benchmarks/baselines/local.json --threshold 1.25
+
+With ``--baseline`` the process exits with status 1 when any benchmark is more
+than ``--threshold`` times slower than its baseline (benchmarks faster than
+``--min-seconds`` in both runs are ignored as noise). Compare baselines only
+from the same machine and row counts.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from benchmarks._common import print_table
+from benchmarks.synthetic import make_listings, write_datasets, write_listings
+
+ROOT = Path(__file__).resolve().parents[1]
+SUITE_VERSION = 1
+
+
+def _time(fn: Callable, setup: Callable | None = None, repeat: int = 3) -> float:
+    """Best wall time of ``fn(setup())``; setup (e.g. copying inputs) is not timed."""
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg) if setup else fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _workspace(tmp: Path) -> Path:
+    # Pipeline paths are relative to a repo-shaped working directory
+    (tmp / "ingest").symlink_to(ROOT / "src" / "ingest", target_is_directory=True)
+    (tmp / "data" / "raw").mkdir(parents=True)
+    return tmp
+
+
+def run_suite(rows: int, excel_rows: int, run_rows: int, repeat: int = 3) -> dict:
+    """Run every benchmark inside a temporary workspace and return the results document."""
+    from typer.testing import CliRunner
+
+    from ingest.scripts import cli
+    from ingest.scripts.enrich import enrich_markets, generate_city_centroids, generate_zip_centroids
+    from ingest.scripts.export_artifacts import export_from_profile
+    from ingest.scripts.ingest_excel import apply_schema, ingest_excel
+    from ingest.scripts.map_programs import map_program_flags
+    from ingest.scripts.validate import basic_validate
+
+    results: Dict[str, dict] = {}
+
+    def record(name: str, n: int, seconds: float) -> None:
+        results[name] = {"rows": n, "seconds": round(seconds, 4), "rows_per_s": round(n / seconds, 1) if seconds else None}
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        ws = _workspace(Path(tmp))
+        os.chdir(ws)
+        try:
+            workbook = write_listings(make_listings(excel_rows, seed=1), ws / "bench.xlsx")
+            record("ingest_excel", excel_rows, _time(lambda: ingest_excel(str(workbook), cli.SCHEMA), repeat=repeat))
+
+            raw = make_listings(rows, seed=2)
+            base = cli._tag_dataset(apply_schema(raw, cli.SCHEMA), "farmers_market", "Farmers Markets", "farmers_market")
+            record("map_program_flags", len(base), _time(lambda df: map_program_flags(df, cli.MAPPING), base.copy, repeat))
+            mapped = map_program_flags(base.copy(), cli.MAPPING)
+            record("enrich_markets", len(mapped), _time(enrich_markets, mapped.copy, repeat))
+            enriched = enrich_markets(mapped)
+            record("basic_validate", len(enriched), _time(basic_validate, enriched.copy, repeat))
+            valid, _ = basic_validate(enriched)
+            record("export_from_profile", len(valid), _time(lambda: export_from_profile(valid, cli.EXPORTS), repeat=repeat))
+            record("generate_zip_centroids", len(valid), _time(lambda: generate_zip_centroids(valid), repeat=repeat))
+            record("generate_city_centroids", len(valid), _time(lambda: generate_city_centroids(valid), repeat=repeat))
+
+            write_datasets(ws / "data" / "raw", run_rows, ["farmers_market", "csa"], seed=3)
+            runner = CliRunner()
+
+            def end_to_end() -> None:
+                result = runner.invoke(cli.APP, ["run", "--no-cache"])
+                if result.exit_code != 0:
+                    raise RuntimeError(f"cli run failed: {result.output}") from result.exception
+
+            record("cli_run", run_rows, _time(end_to_end, repeat=1))
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "version": SUITE_VERSION,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "config": {"rows": rows, "excel_rows": excel_rows, "run_rows": run_rows, "repeat": repeat},
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_seconds: float = 0.05) -> List[dict]:
+    """One row per benchmark present in both documents; ``regressed`` marks threshold breaches."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = result["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        noise = max(result["seconds"], base["seconds"]) < min_seconds
+        rows.append({
+            "benchmark": name,
+            "baseline_s": base["seconds"],
+            "current_s": result["seconds"],
+            "ratio": ratio,
+            "regressed": ratio > threshold and not noise,
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows for the in-memory stage benchmarks")
+    parser.add_argument("--excel-rows", type=int, default=20_000, help="Rows in the ingest_excel workbook")
+    parser.add_argument("--run-rows", type=int, default=20_000, help="Rows across the end-to-end run's workbooks")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", type=Path, help="Write the results JSON here (e.g. a new baseline)")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown ratio before failing")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Ignore benchmarks faster than this")
+    args = parser.parse_args()
+
+    current = run_suite(args.rows, args.excel_rows, args.run_rows, args.repeat)
+    print_table(
+        [{"benchmark": name, **result} for name, result in current["results"].items()],
+        ["benchmark", "rows", "seconds", "rows_per_s"],
+    )
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"saved {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != current["config"]:
+            print(f"[warn] baseline config {baseline.get('config')} differs from this run's {current['config']}", file=sys.stderr)
+        rows = compare(current, baseline, args.threshold, args.min_seconds)
+        print()
+        print_table(rows, ["benchmark", "baseline_s", "current_s", "ratio", "regressed"])
+        regressed = [r["benchmark"] for r in rows if r["regressed"]]
+        if regressed:
+            print(f"slower than {args.threshold:.2f}x baseline: {', '.join(regressed)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""USDA-shaped synthetic listings for benchmarks.
+
+Rows look like the real download: mixed address formats (full and abbreviated
+states, ZIP+4, trailing country, city-only, non-ASCII city names, blanks),
+FNAP/SNAP flags with their text columns, update timestamps, a share of
+duplicate listing ids and bad coordinates (out of range, missing, swapped).
+
+    python -m benchmarks.synthetic --rows 100000 --out data/raw --format xlsx
+    python -m benchmarks.synthetic --rows 1000000 --out /tmp/bench --format parquet --datasets farmers_market,csa
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# (city, state, abbreviation, 3-digit ZIP prefix, latitude, longitude)
+CITIES = [
+    ("Columbus", "Ohio", "OH", "432", 39.96, -83.00),
+    ("Springfield", "Illinois", "IL", "627", 39.78, -89.65),
+    ("Springfield", "Missouri", "MO", "658", 37.21, -93.29),
+    ("Portland", "Oregon", "OR", "972", 45.52, -122.68),
+    ("Portland", "Maine", "ME", "041", 43.66, -70.26),
+    ("Kansas City", "Missouri", "MO", "641", 39.10, -94.58),
+    ("Athens", "Georgia", "GA", "306", 33.95, -83.38),
+    ("Salem", "Massachusetts", "MA", "019", 42.52, -70.90),
+    ("Miami", "Florida", "FL", "331", 25.76, -80.19),
+    ("Austin", "Texas", "TX", "787", 30.27, -97.74),
+    ("Denver", "Colorado", "CO", "802", 39.74, -104.99),
+    ("Seattle", "Washington", "WA", "981", 47.61, -122.33),
+    ("Madison", "Wisconsin", "WI", "537", 43.07, -89.40),
+    ("Asheville", "North Carolina", "NC", "288", 35.60, -82.55),
+    ("Burlington", "Vermont", "VT", "054", 44.48, -73.21),
+    ("Santa Fe", "New Mexico", "NM", "875", 35.69, -105.94),
+    ("Española", "New Mexico", "NM", "875", 35.99, -106.08),
+    ("San Juan", "Puerto Rico", "PR", "009", 18.47, -66.11),
+    ("Honolulu", "Hawaii", "HI", "968", 21.31, -157.86),
+    ("Anchorage", "Alaska", "AK", "995", 61.22, -149.90),
+    ("Washington", "District of Columbia", "DC", "200", 38.91, -77.04),
+    ("New York", "New York", "NY", "100", 40.71, -74.01),
+    ("Los Angeles", "California", "CA", "900", 34.05, -118.24),
+    ("Des Moines", "Iowa", "IA", "503", 41.59, -93.62),
+]
+STREETS = ["Main St", "Market Street", "Oak Ave", "1st Avenue", "Farm Rd", "County Road 12", "Elm St.", "Harbor Blvd"]
+NAMES = ["Farmers Market", "Fresh Market", "Harvest Market", "Community Market", "CSA", "Food Hub", "Farm Stand"]
+PREFIXES = ["Downtown", "Northside", "Green Valley", "Riverfront", "Old Town", "Saturday", "Union Square", "Hilltop"]
+PROGRAMS = ["WIC", "SNAP", "Double Up Food Bucks", "WIC FMNP", "SFMNP"]
+SNAP_TEXT = [
+    "Accept EBT at a central location",
+    "Individual vendors accept EBT",
+    "Accept EBT at a central location; Individual vendors accept EBT",
+    None,
+]
+
+PREFIX_BY_DATASET = {
+    "farmers_market": "farmersmarket_",
+    "csa": "csa_",
+    "food_hub": "foodhub_",
+    "on_farm_market": "onfarmmarket_",
+    "agritourism": "agritourism_",
+}
+
+
+def _addresses(rng: np.random.Generator, city_idx: np.ndarray) -> list:
+    n = len(city_idx)
+    numbers = rng.integers(1, 9999, n)
+    streets = rng.integers(0, len(STREETS), n)
+    zips = rng.integers(0, 100, n)
+    style = rng.choice(8, n, p=[0.4, 0.2, 0.1, 0.08, 0.08, 0.06, 0.04, 0.04])
+    out = []
+    for i in range(n):
+        city, state, abbr, prefix, _, _ = CITIES[city_idx[i]]
+        zipcode = f"{prefix}{zips[i]:02d}"
+        street = f"{numbers[i]} {STREETS[streets[i]]}"
+        s = style[i]
+        if s == 0:
+            out.append(f"{street}, {city}, {state} {zipcode}")
+        elif s == 1:
+            out.append(f"{street}, {city}, {abbr} {zipcode}")
+        elif s == 2:
+            out.append(f"{street}, {city}, {abbr} {zipcode}-{numbers[i] % 10000:04d}")
+        elif s == 3:
+            out.append(f"{street}, {city}, {state} {zipcode}, USA")
+        elif s == 4:
+            out.append(f"{city}, {state} {zipcode}")
+        elif s == 5:
+            out.append(f"{street} {city} {abbr}")
+        elif s == 6:
+            out.append(f"  {street.upper()},  {city.upper()}, {abbr}  ")
+        else:
+            out.append(None)
+    return out
+
+
+def make_listings(
+    rows: int,
+    seed: int = 0,
+    offset: int = 0,
+    duplicate_rate: float = 0.01,
+    bad_coordinate_rate: float = 0.005,
+    extra_columns: int = 0,
+) -> pd.DataFrame:
+    """Raw (pre-schema) listings with the USDA column names."""
+    rng = np.random.default_rng(seed)
+    city_idx = rng.integers(0, len(CITIES), rows)
+    base_lat = np.array([c[4] for c in CITIES])[city_idx]
+    base_lon = np.array([c[5] for c in CITIES])[city_idx]
+    lat = base_lat + rng.normal(0, 0.15, rows)
+    lon = base_lon + rng.normal(0, 0.15, rows)
+
+    flags = rng.random((rows, 5)) < np.array([0.35, 0.6, 0.25, 0.2, 0.15])
+    # One label per flag combination, looked up by the combination's bitmask
+    labels = np.array(
+        [", ".join(p for bit, p in enumerate(PROGRAMS) if code >> bit & 1) or None for code in range(1 << len(PROGRAMS))],
+        dtype=object,
+    )
+    programs = labels[flags @ (1 << np.arange(len(PROGRAMS)))]
+    incentives = np.where(flags[:, 2], "Double Up Food Bucks match up to $20", None)
+    snap_idx = rng.integers(0, len(SNAP_TEXT), rows)
+    stamps = pd.date_range("2019-01-01", periods=2000, freq="D").strftime("%Y-%m-%d 12:00:00")
+    updated = np.asarray(stamps, dtype=object)[rng.integers(0, len(stamps), rows)]
+
+    names = [
+        f"{PREFIXES[a]} {CITIES[c][0]} {NAMES[b]}"
+        for a, b, c in zip(rng.integers(0, len(PREFIXES), rows), rng.integers(0, len(NAMES), rows), city_idx)
+    ]
+    df = pd.DataFrame({
+        "listing_id": np.arange(offset + 1, offset + rows + 1),
+        "update_time": updated,
+        "listing_name": names,
+        "location_address": _addresses(rng, city_idx),
+        "location_x": lon,
+        "location_y": lat,
+        "orgnization": np.where(rng.random(rows) < 0.7, "Local Growers Association", None),
+        "SNAP_option": [SNAP_TEXT[i] for i in snap_idx],
+        "SNAP_option_1": (snap_idx % 2 == 0).astype(int),
+        "SNAP_option_2": (snap_idx >= 1).astype(int),
+        "FNAP": programs,
+        "FNAP_1": flags[:, 0].astype(int),
+        "FNAP_2": flags[:, 1].astype(int),
+        "FNAP_3": flags[:, 2].astype(int),
+        "FNAP_4": flags[:, 3].astype(int),
+        "FNAP_5": flags[:, 4].astype(int),
+        "FNAP_3_desc": incentives,
+    })
+
+    # Duplicate listing ids (re-listed markets)
+    dupes = rng.random(rows) < duplicate_rate
+    if dupes.any() and rows > 1:
+        df.loc[dupes, "listing_id"] = rng.choice(df["listing_id"].to_numpy(), int(dupes.sum()))
+
+    # Bad coordinates: out of range, missing, or lat/lon swapped
+    bad = np.flatnonzero(rng.random(rows) < bad_coordinate_rate)
+    kinds = rng.integers(0, 3, len(bad))
+    df.loc[bad[kinds == 0], "location_x"] = 999.0
+    df.loc[bad[kinds == 1], "location_y"] = np.nan
+    swap = bad[kinds == 2]
+    df.loc[swap, ["location_x", "location_y"]] = df.loc[swap, ["location_y", "location_x"]].to_numpy()
+
+    # USDA workbooks carry dozens of product/season columns we never read
+    for i in range(extra_columns):
+        df[f"extra_{i}"] = np.where(rng.random(rows) < 0.5, f"Y{i}", None)
+    return df
+
+
+def write_listings(df: pd.DataFrame, path: Path) -> Path:
+    """Write ``df`` as ``.xlsx`` or ``.parquet`` depending on the suffix."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+
+def write_datasets(
+    out_dir: Path,
+    rows: int,
+    datasets: list[str],
+    fmt: str = "xlsx",
+    seed: int = 0,
+    **kwargs,
+) -> list[Path]:
+    """One file per dataset named like a staged download (``farmersmarket_<date>.xlsx``)."""
+    paths = []
+    per_dataset = max(1, rows // max(1, len(datasets)))
+    for i, key in enumerate(datasets):
+        df = make_listings(per_dataset, seed=seed + i, offset=i * per_dataset, **kwargs)
+        paths.append(write_listings(df, Path(out_dir) / f"{PREFIX_BY_DATASET[key]}2025-01-01.{fmt}"))
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Total rows across datasets")
+    parser.add_argument("--out", type=Path, default=Path("data/raw"))
+    parser.add_argument("--format", choices=["xlsx", "parquet"], default="xlsx")
+    parser.add_argument("--datasets", default="farmers_market", help="Comma-separated dataset keys")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--bad-coordinate-rate", type=float, default=0.005)
+    parser.add_argument("--extra-columns", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_datasets(
+        args.out,
+        args.rows,
+        [d.strip() for d in args.datasets.split(",") if d.strip()],
+        args.format,
+        args.seed,
+        duplicate_rate=args.duplicate_rate,
+        bad_coordinate_rate=args.bad_coordinate_rate,
+        extra_columns=args.extra_columns,
+    )
+    for path in paths:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Shared pieces of the Arrow execution backend (``--backend arrow``).
+
+The pandas backend coerces schema ``str`` columns to Python-backed ``string``
+and normalizes text with ``.str`` methods and ``apply``. With the Arrow
+backend those columns are ``string[pyarrow]`` and the work runs through
+``pyarrow.compute``:
+
+- schema coercion (``coerce_str``, ``coerce_bool``) here, shared with the
+  pandas backend through ``coerce``,
+- search-column normalization and ZIP extraction in ``enrich``,
+- the row validation masks in ``validate``.
+
+Every kernel matches the pandas results exactly. Arrow's regex and whitespace
+classes are ASCII-only while Python's are Unicode-aware, so rows with
+non-ASCII text (or the ``\\x1c``-``\\x1f`` separators Python treats as
+whitespace) fall back to the Python implementation (``with_fallback``).
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import infer_dtype, is_bool_dtype, is_numeric_dtype
+
+BACKENDS = ("pandas", "arrow")
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+# Python's ASCII whitespace (str.isspace / re's \s on str)
+_WS = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f "
+_WS_CLASS = "[\\t\\n\\x0b\\x0c\\r\\x1c-\\x1f ]"
+# Rows with these characters need Python's whitespace semantics
+_ARROW_WS_GAPS = "[\\x1c-\\x1f]"
+
+
+def check_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Available: {', '.join(BACKENDS)}")
+    return backend
+
+
+def to_arrow(series: pd.Series) -> pa.Array:
+    """Null-aware Arrow array for ``series`` (zero-copy for ``string[pyarrow]``)."""
+    arr = pa.array(series, from_pandas=True)
+    return arr.combine_chunks() if isinstance(arr, pa.ChunkedArray) else arr
+
+
+def _to_numpy(arr: pa.Array) -> np.ndarray:
+    return arr.to_numpy(zero_copy_only=False)
+
+
+def _python_rows(arr: pa.Array, whitespace: bool = True) -> np.ndarray:
+    """Rows the ASCII kernels can't handle: non-ASCII text, optionally \\x1c-\\x1f."""
+    mask = ~_to_numpy(pc.fill_null(pc.string_is_ascii(arr), True))
+    if whitespace:
+        mask |= _to_numpy(pc.fill_null(pc.match_substring_regex(arr, _ARROW_WS_GAPS), False))
+    return mask
+
+
+def with_fallback(
+    arr: pa.Array,
+    fast: Callable[[pa.Array], pa.Array],
+    slow: Callable[[str], object],
+    whitespace: bool = True,
+) -> pa.Array:
+    """``fast(arr)`` with non-ASCII rows replaced by ``slow(value)``.
+
+    ``whitespace`` also sends rows containing \\x1c-\\x1f to ``slow``, for
+    kernels whose result depends on what counts as whitespace.
+    """
+    result = fast(arr)
+    fallback = _python_rows(arr, whitespace)
+    if fallback.any():
+        values = arr.filter(pa.array(fallback)).to_pylist()
+        result = pc.replace_with_mask(result, pa.array(fallback), pa.array([slow(v) for v in values], type=result.type))
+    return result
+
+
+def string_series(arr: pa.Array, index: pd.Index) -> pd.Series:
+    return pd.Series(pd.arrays.ArrowStringArray(arr.cast(pa.large_string())), index=index)
+
+
+def coerce_str(series: pd.Series) -> pd.Series:
+    """``series.astype("string").str.strip()`` as ``string[pyarrow]``."""
+    if isinstance(series.dtype, pd.StringDtype) or infer_dtype(series, skipna=True) in ("string", "empty"):
+        arr = to_arrow(series.astype(object) if series.dtype == object else series).cast(pa.string())
+    else:
+        # Non-string values keep pandas' str() formatting (1.0 -> "1.0")
+        arr = to_arrow(series.astype("string")).cast(pa.string())
+    stripped = with_fallback(arr, lambda a: pc.ascii_trim(a, characters=_WS), lambda v: v.strip())
+    return string_series(stripped, series.index)
+
+
+def string_flags(series: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Truth values of a string column, plus which rows were actually parsed.
+
+    Digit strings are true when non-zero, other non-empty strings are true;
+    ``parsed`` is False for the latter (missing and empty values count as
+    parsed: they are simply false).
+    """
+    arr = to_arrow(series.astype(object) if series.dtype == object else series).cast(pa.string())
+    trimmed = pc.ascii_trim(arr, characters=_WS)
+    digits = _to_numpy(pc.fill_null(pc.match_substring_regex(trimmed, "^[0-9]+$"), False))
+    nonzero = _to_numpy(pc.fill_null(pc.match_substring_regex(trimmed, "[1-9]"), False))
+    non_empty = _to_numpy(pc.fill_null(pc.greater(pc.utf8_length(arr), 0), False))
+    result = np.where(digits, nonzero, non_empty)
+    parsed = digits | ~non_empty
+    fallback = _python_rows(arr)
+    if fallback.any():
+        values = arr.filter(pa.array(fallback)).to_pylist()
+        result[fallback] = [_python_bool(v) for v in values]
+        parsed[fallback] = [v is None or v == "" or v.strip().isdigit() for v in values]
+    return result.astype(bool), parsed
+
+
+def coerce_bool(series: pd.Series) -> pd.Series | None:
+    """Same truth values as the per-value ``bool(int(v))``/``bool(v)`` rule, without a lambda.
+
+    Returns None for mixed-type columns (``coerce.coerce_bool`` splits those).
+    """
+    if is_bool_dtype(series.dtype) and series.dtype == bool:
+        return series.copy()
+    if is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype):
+        # bool(int(v)) for whole numbers, bool(v) otherwise: both are v != 0
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        return pd.Series(~np.isnan(values) & (values != 0), index=series.index)
+    if infer_dtype(series, skipna=True) not in ("string", "empty"):
+        return None
+    return pd.Series(string_flags(series)[0], index=series.index)
+
+
+def _python_bool(value: str | None) -> bool:
+    if value is None:
+        return False
+    return bool(int(value)) if value.strip().isdigit() else bool(value)
+
+
+__all__ = ["coerce_bool", "coerce_str", "string_flags", "string_series", "to_arrow", "with_fallback", "BACKENDS", "STRING_DTYPE"]
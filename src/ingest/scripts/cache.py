@@ -0,0 +1,113 @@
+"""Content-addressed cache for parsed Excel sources.
+
+Entries are keyed on the SHA-256 of the raw workbook plus the schema file,
+the parser code and any other inputs that change the parsed frame, stored as
+Parquet under ``data/cache/`` and evicted least-recently-used first.
+"""
+from __future__ import annotations
+
+import os
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+CACHE_DIR = Path("data/cache")
+CACHE_VERSION = "1"
+MAX_ENTRIES = 32
+MAX_BYTES = 512 * 1024 * 1024
+
+
+def cache_key(*parts: str) -> str:
+    """Combine input digests (source, schema, ...) into a single cache key."""
+    h = sha256(CACHE_VERSION.encode("utf-8"))
+    for part in parts:
+        h.update(b"\0")
+        h.update(str(part).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: Path) -> Path:
+    return cache_dir / f"{key}.parquet"
+
+
+def load(key: str, cache_dir: Path = CACHE_DIR, string_storage: str = "python") -> pd.DataFrame | None:
+    """Return the cached frame for ``key`` or None on a miss.
+
+    ``string_storage`` is the storage ``string`` columns come back with
+    (``"pyarrow"`` for the Arrow backend).
+    """
+    path = _entry_path(key, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        with pd.option_context("mode.string_storage", string_storage):
+            df = pd.read_parquet(path)
+    except Exception:
+        # Corrupt or truncated entry: drop it and treat as a miss
+        path.unlink(missing_ok=True)
+        return None
+    # Bump mtime so eviction stays least-recently-used
+    os.utime(path, None)
+    return df
+
+
+def store(key: str, df: pd.DataFrame, cache_dir: Path = CACHE_DIR) -> bool:
+    """Write ``df`` under ``key``; returns False when the frame can't be cached."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(key, cache_dir)
+    tmp = path.with_suffix(".parquet.tmp")
+    try:
+        df.to_parquet(tmp, index=False)
+    except Exception:
+        # Mixed-type object columns are not representable in Parquet
+        tmp.unlink(missing_ok=True)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def _entries(cache_dir: Path) -> Iterable[Path]:
+    if not cache_dir.exists():
+        return []
+    return cache_dir.glob("*.parquet")
+
+
+def evict(
+    cache_dir: Path = CACHE_DIR,
+    max_entries: int | None = MAX_ENTRIES,
+    max_bytes: int | None = MAX_BYTES,
+) -> list[str]:
+    """Remove least-recently-used entries until both limits hold."""
+    entries = sorted(
+        ((p, p.stat()) for p in _entries(cache_dir)),
+        key=lambda item: item[1].st_mtime,
+        reverse=True,
+    )
+    removed: list[str] = []
+    kept = 0
+    total = 0
+    for path, st in entries:
+        over_count = max_entries is not None and kept >= max_entries
+        over_bytes = max_bytes is not None and total + st.st_size > max_bytes
+        if over_count or over_bytes:
+            path.unlink(missing_ok=True)
+            removed.append(path.stem)
+            continue
+        kept += 1
+        total += st.st_size
+    return removed
+
+
+def summarize(sources_meta: list[dict]) -> dict:
+    """Aggregate per-source cache outcomes for the manifest."""
+    states = [m.get("cache") for m in sources_meta]
+    return {
+        "enabled": any(s in {"hit", "miss"} for s in states),
+        "hits": sum(1 for s in states if s == "hit"),
+        "misses": sum(1 for s in states if s == "miss"),
+    }
+
+
+__all__ = ["cache_key", "load", "store", "evict", "summarize", "CACHE_DIR"]
@@ -0,0 +1,163 @@
+"""ZIP, ZIP3-prefix and city centroids computed together (``compute_centroids``).
+
+One pass prepares the coordinates and group codes of a validated frame; the
+aggregates then reproduce the arithmetic of the per-group loops they replace
+exactly, so ``zip.centroids.json`` and ``city.centroids.json`` don't change by
+a single bit:
+
+- ZIP centroids are ``Series.mean`` of each ZIP's ``zip_lat``/``zip_lon``,
+  i.e. numpy's pairwise sum. Groups of the same size are summed together as
+  the rows of one matrix, which sums each row the same way.
+- ZIP3-prefix and city|state centroids are pandas groupby means
+  (compensated sums in row order), computed by a single groupby over both
+  sets of rows stacked.
+- The city fallback (for a city seen in at most one state) is the
+  count-weighted average of its city|state means.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+Centroid = List[float]
+
+
+def _series_means(values: np.ndarray, codes: np.ndarray, groups: int) -> np.ndarray:
+    """``Series.mean`` of ``values`` per code (0..groups-1)."""
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    means = np.full((groups, values.shape[1]), np.nan)
+    for col in range(values.shape[1]):
+        ordered = np.ascontiguousarray(values[order, col])
+        for size in np.unique(counts[counts > 0]):
+            rows = np.flatnonzero(counts == size)
+            block = ordered[starts[rows, None] + np.arange(size)]
+            means[rows, col] = block.sum(axis=1) / size
+    return means
+
+
+def zip_means(df: pd.DataFrame) -> pd.DataFrame:
+    """Mean ``latitude``/``longitude`` per ZIP as ``zip_lat``/``zip_lon``, indexed by ZIP."""
+    coords = df[['zip', 'latitude', 'longitude']].copy()
+    coords['latitude'] = pd.to_numeric(coords['latitude'], errors='coerce')
+    coords['longitude'] = pd.to_numeric(coords['longitude'], errors='coerce')
+    coords = coords.dropna(subset=['zip', 'latitude', 'longitude'])
+    if coords.empty:
+        return pd.DataFrame(columns=['zip_lat', 'zip_lon'])
+    means = coords.groupby('zip')[['latitude', 'longitude']].mean()
+    means.columns = ['zip_lat', 'zip_lon']
+    return means
+
+
+class Centroids:
+    """The centroid tables of one frame: ``zip`` (5-digit), ``zip3`` and ``city``."""
+
+    def __init__(self, zip: Dict[str, Centroid], zip3: Dict[str, Centroid], city: Dict[str, Centroid]):
+        self.zip = zip
+        self.zip3 = zip3
+        self.city = city
+
+    def zip_centroids(self) -> Dict[str, Centroid]:
+        """ZIP centroids plus prefix fallbacks for ZIPs not in the data (``zip.centroids.json``)."""
+        merged = dict(self.zip)
+        for prefix, centroid in self.zip3.items():
+            merged.setdefault(prefix, centroid)
+        return merged
+
+    def city_centroids(self) -> Dict[str, Centroid]:
+        """``city|STATE`` centroids plus single-state city fallbacks (``city.centroids.json``)."""
+        return self.city
+
+
+def _zip_codes(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """(zip_lat, zip_lon) of the rows that have them, their ZIP codes and the sorted ZIP values."""
+    lat = df['zip_lat'].to_numpy(dtype='float64', na_value=np.nan)
+    lon = df['zip_lon'].to_numpy(dtype='float64', na_value=np.nan)
+    rows = np.flatnonzero(~np.isnan(lat) & ~np.isnan(lon))
+    # NA ZIPs still get a (stringified) prefix, as astype(str) gives them one
+    codes, uniques = pd.factorize(df['zip'].iloc[rows], sort=True, use_na_sentinel=False)
+    return np.column_stack((lat[rows], lon[rows])), codes, pd.Series(uniques)
+
+
+def _city_codes(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+    """(latitude, longitude) of the rows with a city and coordinates, their codes and the sorted (city, state) keys."""
+    lat = pd.to_numeric(df['latitude'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    lon = pd.to_numeric(df['longitude'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    city, state = df['search_city_norm'], df['search_state_norm']
+    # groupby drops rows with a missing key
+    rows = np.flatnonzero(~np.isnan(lat) & ~np.isnan(lon) & city.notna().to_numpy() & state.notna().to_numpy())
+    city_codes, city_names = pd.factorize(city.iloc[rows].to_numpy(dtype=object), sort=True)
+    state_codes, state_names = pd.factorize(state.iloc[rows].to_numpy(dtype=object), sort=True)
+    # (city, state) pairs, sorted like groupby's keys
+    width = max(len(state_names), 1)
+    pairs, codes = np.unique(city_codes * width + state_codes, return_inverse=True)
+    keys = pd.DataFrame({'city': city_names[pairs // width], 'state': state_names[pairs % width]})
+    return np.column_stack((lat[rows], lon[rows])), codes.reshape(-1), keys
+
+
+def _groupby_means(values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """pandas groupby means per code; every code in 0..max must have rows."""
+    if not len(codes):
+        return np.zeros((0, values.shape[1]))
+    return pd.DataFrame(values).groupby(codes, sort=True).mean().to_numpy()
+
+
+def _as_dict(keys, means: np.ndarray, keep: np.ndarray) -> Dict[str, Centroid]:
+    return dict(zip((keys[i] for i in np.flatnonzero(keep)), means[keep].tolist()))
+
+
+def _city_fallbacks(
+    cities: pd.DataFrame,
+    means: np.ndarray,
+    counts: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cities seen in at most one non-empty state, with their count-weighted centroid."""
+    city_codes, names = pd.factorize(cities['city'], sort=True)
+    groups = np.bincount(city_codes)
+    states = np.bincount(city_codes, weights=(cities['state'] != '').to_numpy())
+    first = np.concatenate(([0], np.cumsum(groups)[:-1]))
+    keep = (states <= 1) & (names != '')
+    # At most two groups ('' and one state) per kept city; add them in key order
+    first, pair = first[keep], groups[keep] == 2
+    weighted = means * counts[:, None]
+    totals = 0.0 + weighted[first]
+    totals[pair] += weighted[first[pair] + 1]
+    total_counts = counts[first].astype('float64')
+    total_counts[pair] += counts[first[pair] + 1]
+    return names[keep], totals / total_counts[:, None]
+
+
+def compute_centroids(df: pd.DataFrame) -> Centroids:
+    """ZIP, ZIP3 and city centroids of a validated, enriched markets frame."""
+    zip_values, zip_codes, zips = _zip_codes(df)
+    city_values, city_codes, cities = _city_codes(df)
+
+    # ZIP: Series.mean per group; missing and blank ZIPs get none
+    means = _series_means(zip_values, zip_codes, len(zips))
+    zip_keys = zips.astype(str).str.strip()
+    zip_table = _as_dict(zip_keys.tolist(), means, zips.notna().to_numpy() & (zip_keys != '').to_numpy())
+
+    # ZIP3 prefixes and city|state groups: one groupby over both row sets
+    prefix_codes, prefixes = pd.factorize(zips.astype(str).str[:3], sort=True)
+    codes = np.concatenate((prefix_codes[zip_codes], len(prefixes) + city_codes))
+    means = _groupby_means(np.concatenate((zip_values, city_values)), codes)
+    prefix_means, city_means = means[:len(prefixes)], means[len(prefixes):]
+
+    zip3_table: Dict[str, Centroid] = {}
+    if zip_table:
+        # Prefix fallbacks are only provided next to real ZIP centroids
+        zip3_table = _as_dict(list(prefixes), prefix_means, np.asarray(prefixes != ''))
+
+    city_keys = [f"{c}|{s}" if s else c for c, s in zip(cities['city'], cities['state'])]
+    city_table = _as_dict(city_keys, city_means, (cities['city'] != '').to_numpy())
+    counts = np.bincount(city_codes, minlength=len(cities))
+    for name, centroid in zip(*_city_fallbacks(cities, city_means, counts)):
+        city_table.setdefault(name, centroid.tolist())
+
+    return Centroids(zip_table, zip3_table, city_table)
+
+
+__all__ = ["compute_centroids", "zip_means", "Centroids"]
@@ -0,0 +1,113 @@
+"""Per-stage Parquet checkpoints for ``cli run --from/--to``.
+
+``run`` writes the output of each pipeline stage under ``data/staging/``:
+
+- ``ingested.parquet``: the combined, de-duplicated sources,
+- ``mapped.parquet`` / ``enriched.parquet``: after program mapping and enrichment,
+- ``validated.parquet`` + ``rejected.parquet``: the valid and rejected rows.
+
+Every file is tagged (in its Parquet schema metadata) with the stage key: a
+digest chained from the raw-file hashes, the config files and the code of
+each stage up to that one, so editing a mapping file or ``enrich.py`` makes
+the enriched and validated checkpoints stale while the ingested one stays
+current. ``status`` tells the three cases apart; stale files are removed
+with ``invalidate``.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ingest.scripts.cache import cache_key
+
+CHECKPOINT_DIR = Path("data/staging")
+CHECKPOINT_VERSION = "1"
+# Pipeline stages in order; every stage but export leaves a checkpoint
+STAGES = ("ingest", "map", "enrich", "validate", "export")
+FILES: Dict[str, Tuple[str, ...]] = {
+    "ingest": ("ingested",),
+    "map": ("mapped",),
+    "enrich": ("enriched",),
+    "validate": ("validated", "rejected"),
+}
+_META_KEY = b"freshlocalharvest:checkpoint"
+
+
+def stage_key(parent: str, *parts: str) -> str:
+    """Key of a stage whose input has key ``parent`` ('' for ingest) and whose own inputs digest to ``parts``."""
+    return cache_key(CHECKPOINT_VERSION, parent, *parts)
+
+
+def paths(stage: str, directory: Path = CHECKPOINT_DIR) -> List[Path]:
+    return [directory / f"{name}.parquet" for name in FILES[stage]]
+
+
+def _read_tag(path: Path) -> dict | None:
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata[_META_KEY])
+    except Exception:
+        return None
+
+
+def status(stage: str, key: str, directory: Path = CHECKPOINT_DIR) -> str:
+    """``current``, ``stale`` (written for other inputs, or unreadable) or ``missing``."""
+    files = paths(stage, directory)
+    if not any(p.exists() for p in files):
+        return "missing"
+    tags = [_read_tag(p) if p.exists() else None for p in files]
+    return "current" if all(tag and tag.get("key") == key for tag in tags) else "stale"
+
+
+def save(stage: str, frames: Sequence[pd.DataFrame], key: str, info: dict | None = None, directory: Path = CHECKPOINT_DIR) -> bool:
+    """Write the stage's frames tagged with ``key``; returns False when a frame can't be stored.
+
+    ``info`` (JSON-serializable) is kept in the tag and returned by ``load``.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tag = json.dumps({"stage": stage, "key": key, "rows": [len(f) for f in frames], "info": info or {}}).encode("utf-8")
+    written = []
+    for frame, path in zip(frames, paths(stage, directory)):
+        tmp = path.with_suffix(".parquet.tmp")
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            pq.write_table(table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: tag}), tmp)
+        except Exception:
+            # Mixed-type object columns are not representable in Parquet; don't
+            # leave half a stage behind
+            tmp.unlink(missing_ok=True)
+            invalidate([stage], directory)
+            return False
+        written.append((tmp, path))
+    for tmp, path in written:
+        os.replace(tmp, path)
+    return True
+
+
+def load(stage: str, directory: Path = CHECKPOINT_DIR, string_storage: str = "python") -> Tuple[List[pd.DataFrame], dict]:
+    """The stage's frames and ``info``; check ``status`` first."""
+    files = paths(stage, directory)
+    with pd.option_context("mode.string_storage", string_storage):
+        frames = [pd.read_parquet(p) for p in files]
+    return frames, (_read_tag(files[0]) or {}).get("info", {})
+
+
+def invalidate(stages: Sequence[str], directory: Path = CHECKPOINT_DIR) -> List[str]:
+    """Remove the checkpoints of ``stages``; returns the stages that had files."""
+    removed = []
+    for stage in stages:
+        files = [p for p in paths(stage, directory) if p.exists()]
+        for path in files:
+            path.unlink()
+        if files:
+            removed.append(stage)
+    return removed
+
+
+__all__ = ["stage_key", "paths", "status", "save", "load", "invalidate", "STAGES", "CHECKPOINT_DIR"]
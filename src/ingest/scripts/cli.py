@@ -1,20 +1,32 @@
 # File: ingest/scripts/cli.py
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from hashlib import sha256
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import typer
 import yaml
 
-from ingest.scripts.export_artifacts import export_from_profile
-from ingest.scripts.ingest_excel import ingest_excel
+from ingest.scripts import arrow_backend, cache, checkpoints, raw_store
+from ingest.scripts.centroids import compute_centroids
+from ingest.scripts.delta import write_delta
+from ingest.scripts.duplicates import canonical_records, duplicate_clusters, find_duplicates, load_config as load_dedupe_config
+from ingest.scripts.export_artifacts import export_profiles, load_profiles, plain_columns, profile_digests
+from ingest.scripts.finalize import finalize_artifacts
+from ingest.scripts.incremental import run_incremental
+from ingest.scripts.ingest_excel import ingest_excel, projected_columns
 from ingest.scripts.map_programs import map_program_flags
+from ingest.scripts.profiling import Profiler, format_table, stage
 from ingest.scripts.stage_raw import stage_raw
-from ingest.scripts.enrich import enrich_markets, generate_zip_centroids, generate_city_centroids
-from ingest.scripts.validate import basic_validate
+from ingest.scripts.enrich import enrich_markets
+from ingest.scripts.validate import basic_validate, load_rules
+from ingest.scripts.watch import Watcher
+from ingest.scripts.xlsx_stream import UnsupportedOpenpyxl
 
 APP = typer.Typer(help="Fresh Local Harvest data pipeline.")
 
@@ -22,10 +34,20 @@ SCHEMA = "ingest/config/schema.yml"
 DATASETS = "ingest/config/datasets.yml"
 MAPPING = "ingest/config/mapping_programs.yml"
 EXPORTS = "ingest/config/export_profiles.yml"
+VALIDATION = "ingest/config/validation.yml"
+DEDUPE = "ingest/config/dedupe.yml"
+
+# Constant per dataset; low-memory runs store them as categoricals
+DATASET_COLUMNS = ("source_dataset", "source_dataset_label", "listing_type", "listing_type_label")
+# Low-cardinality enrichment outputs, categorical in low-memory runs
+CATEGORICAL_COLUMNS = ("state", "search_state")
 
 RAW_DIR = Path("data/raw")
 PROC_DIR = Path("data/processed")
 STAGE_DIR = Path("data/staging")
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# Modules that turn a workbook into the parsed frame
+INGEST_MODULES = ("ingest_excel", "xlsx_stream", "coerce", "arrow_backend")
 
 
 def _sha256_file(path: Path) -> str:
@@ -47,6 +69,26 @@ def _load_dataset_config() -> Dict[str, dict]:
     return normalized
 
 
+def _resolve_sources(
+    datasets: Dict[str, dict], overrides: Dict[str, Path] | None = None
+) -> Tuple[List[Tuple[str, dict, Path]], List[str]]:
+    """``(key, config, source path)`` per dataset with a source, and the keys without one."""
+    overrides = overrides or {}
+    tasks: List[Tuple[str, dict, Path]] = []
+    missing: List[str] = []
+    for key, cfg in datasets.items():
+        source_path = overrides.get(key)
+        if not source_path:
+            glob_pattern = cfg.get("glob")
+            if glob_pattern:
+                source_path = _latest_for_glob(glob_pattern)
+        if not source_path:
+            missing.append(key)
+            continue
+        tasks.append((key, cfg, Path(source_path)))
+    return tasks, missing
+
+
 def _latest_for_glob(pattern: str) -> Path | None:
     matches = sorted(RAW_DIR.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
     return matches[0] if matches else None
@@ -61,85 +103,400 @@ def _detect_dataset_key(path: Path, datasets: Dict[str, dict]) -> str | None:
     return None
 
 
-def _prepare_datasets(overrides: Dict[str, Path] | None = None) -> Tuple[pd.DataFrame, List[dict]]:
+def _string_storage(backend: str) -> str:
+    return "pyarrow" if backend == "arrow" else "python"
+
+
+def _ingest_cached(
+    source_path: Path,
+    schema: str,
+    source_sha: str,
+    use_cache: bool,
+    engine: str = "pandas",
+    backend: str = "pandas",
+    coercion: Dict[str, dict] | None = None,
+) -> Tuple[pd.DataFrame, str, List[str]]:
+    """Parsed frame, cache state and warnings; ``coercion`` is only filled when the workbook is parsed."""
+    columns = projected_columns(schema, MAPPING, EXPORTS) if engine == "stream" else None
+
+    def ingest() -> pd.DataFrame:
+        return ingest_excel(str(source_path), schema, engine=engine, columns=columns, backend=backend, report=coercion)
+
+    if not use_cache:
+        return ingest(), "disabled", []
+
+    # Parser code is part of the key, so edits to it don't serve stale frames
+    parts = [source_sha, _sha256_file(Path(schema)), engine, ",".join(columns or []), _code_digest(*INGEST_MODULES)]
+    if backend != "pandas":
+        # Keeps existing pandas-backend entries valid
+        parts.append(backend)
+    key = cache.cache_key(*parts)
+    df = cache.load(key, string_storage=_string_storage(backend))
+    if df is not None:
+        return df, "hit", []
+
+    df = ingest()
+    if not cache.store(key, df):
+        return df, "miss", [f"[warn] Could not cache parsed frame for '{source_path}'"]
+    return df, "miss", []
+
+
+def _tag_dataset(df: pd.DataFrame, key: str, label: str, category: str, low_memory: bool = False) -> pd.DataFrame:
+    """Add source/listing-type columns and record_id; drops rows without a listing_id.
+
+    ``low_memory`` tags ``df`` in place and leaves the constant
+    ``DATASET_COLUMNS`` to ``_add_dataset_columns`` after the concat.
+    """
+    if low_memory:
+        source_ids = _listing_ids(df)
+        df['source_listing_id'] = source_ids
+        keep = source_ids.notna() & (source_ids != "")
+        if not keep.all():
+            df.drop(index=df.index[~keep], inplace=True)
+        df['record_id'] = key + ":" + df['source_listing_id']
+        return df
+
+    df = df.copy()
+    df['source_dataset'] = key
+    df['source_dataset_label'] = label
+    df['listing_type'] = category
+    df['listing_type_label'] = label
+    source_ids = _listing_ids(df)
+    df['source_listing_id'] = source_ids
+    df = df[source_ids.notna() & (source_ids != "")]
+    df['record_id'] = df['source_dataset'] + ":" + df['source_listing_id']
+    return df
+
+
+def _listing_ids(df: pd.DataFrame) -> pd.Series:
+    ids = df['listing_id']
+    # Keep string[pyarrow] ids (Arrow backend) instead of converting them to string[python]
+    if not isinstance(ids.dtype, pd.StringDtype):
+        ids = ids.astype('string')
+    return ids.str.strip()
+
+
+def _add_dataset_columns(combined: pd.DataFrame, tags: List[Tuple[str, str, str]], lengths: List[int]) -> None:
+    """Insert ``DATASET_COLUMNS`` as categoricals, one code per source frame (in place)."""
+    per_frame = {
+        "source_dataset": [key for key, _, _ in tags],
+        "source_dataset_label": [label for _, label, _ in tags],
+        "listing_type": [category for _, _, category in tags],
+        "listing_type_label": [label for _, label, _ in tags],
+    }
+    pos = combined.columns.get_loc('source_listing_id')
+    for offset, name in enumerate(DATASET_COLUMNS):
+        values = per_frame[name]
+        categories = list(dict.fromkeys(values))
+        codes = np.repeat([categories.index(v) for v in values], lengths)
+        combined.insert(pos + offset, name, pd.Categorical.from_codes(codes, categories=categories))
+
+
+def _as_categoricals(df: pd.DataFrame, columns=CATEGORICAL_COLUMNS) -> None:
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+
+def _load_dataset(
+    key: str,
+    cfg: dict,
+    source_path: Path,
+    use_cache: bool,
+    low_memory: bool = False,
+    backend: str = "pandas",
+) -> Tuple[pd.DataFrame | None, dict | None, List[str]]:
+    """Ingest + hash one dataset; runs in a worker process when --jobs > 1."""
+    schema = cfg.get("schema", SCHEMA)
+    label = cfg.get("label", key.replace("_", " ").title())
+    category = cfg.get("category", key)
+    engine = cfg.get("engine", "pandas")
+
+    with stage(f"ingest_excel:{key}") as record:
+        source_sha = raw_store.file_sha256(Path(source_path), RAW_DIR)
+        coercion: Dict[str, dict] = {}
+        try:
+            df, cache_state, messages = _ingest_cached(Path(source_path), schema, source_sha, use_cache, engine, backend, coercion)
+        except UnsupportedOpenpyxl as exc:
+            engine = "pandas"
+            df, cache_state, messages = _ingest_cached(Path(source_path), schema, source_sha, use_cache, engine, backend, coercion)
+            messages.insert(0, f"[warn] {exc}; reading '{source_path}' with engine: pandas")
+        record["rows_out"] = len(df)
+    if df.empty:
+        messages.append(f"[warn] Source file '{source_path}' produced no records")
+        return None, None, messages
+
+    df = _tag_dataset(df, key, label, category, low_memory)
+
+    meta = {
+        "dataset": key,
+        "label": label,
+        "path": str(source_path),
+        "sha256": source_sha,
+        "records": int(len(df)),
+        "cache": cache_state,
+        "engine": engine,
+        "backend": backend,
+    }
+    if coercion:
+        # Values per schema column that failed to parse (absent on cache hits)
+        meta["coercion"] = coercion
+    return df, meta, messages
+
+
+def _load_dataset_profiled(
+    key: str,
+    cfg: dict,
+    source_path: Path,
+    use_cache: bool,
+    low_memory: bool,
+    backend: str,
+    pstats_dir: Path | None,
+) -> tuple:
+    """``_load_dataset`` in a worker, returning its stage records for the parent profiler."""
+    profiler = Profiler(pstats_dir)
+    with profiler.activate():
+        result = _load_dataset(key, cfg, source_path, use_cache, low_memory, backend)
+    return result, profiler.records
+
+
+def _collect(key: str, fn: Callable[[], tuple]) -> tuple:
+    try:
+        return fn()
+    except Exception as exc:
+        typer.echo(f"[error] Dataset '{key}' failed: {exc}", err=True)
+        raise
+
+
+def _prepare_datasets(
+    overrides: Dict[str, Path] | None = None,
+    use_cache: bool = True,
+    jobs: int = 1,
+    low_memory: bool = False,
+    backend: str = "pandas",
+) -> Tuple[pd.DataFrame, List[dict]]:
     datasets = _load_dataset_config()
     if not datasets:
         raise typer.Exit(code=2)
 
-    overrides = overrides or {}
     frames: List[pd.DataFrame] = []
     sources_meta: List[dict] = []
 
-    for key, cfg in datasets.items():
-        schema = cfg.get("schema", SCHEMA)
-        label = cfg.get("label", key.replace("_", " ").title())
-        category = cfg.get("category", key)
-        source_path = overrides.get(key)
-        if not source_path:
-            glob_pattern = cfg.get("glob")
-            if glob_pattern:
-                source_path = _latest_for_glob(glob_pattern)
-        if not source_path:
-            typer.echo(f"[warn] No source file found for dataset '{key}'", err=True)
-            continue
-
-        df = ingest_excel(str(source_path), schema)
-        if df.empty:
-            typer.echo(f"[warn] Source file '{source_path}' produced no records", err=True)
+    tasks, missing = _resolve_sources(datasets, overrides)
+    for key in missing:
+        typer.echo(f"[warn] No source file found for dataset '{key}'", err=True)
+
+    if jobs > 1 and len(tasks) > 1:
+        profiler = Profiler.active()
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            if profiler is not None:
+                futures = [
+                    pool.submit(_load_dataset_profiled, key, cfg, path, use_cache, low_memory, backend, profiler.cprofile_dir)
+                    for key, cfg, path in tasks
+                ]
+            else:
+                futures = [
+                    pool.submit(_load_dataset, key, cfg, path, use_cache, low_memory, backend) for key, cfg, path in tasks
+                ]
+            # Collect in config order so the combined frame stays deterministic
+            results = [_collect(key, future.result) for (key, _, _), future in zip(tasks, futures)]
+        if profiler is not None:
+            for _, records in results:
+                profiler.extend(records)
+            results = [result for result, _ in results]
+    else:
+        results = [
+            _collect(key, lambda: _load_dataset(key, cfg, path, use_cache, low_memory, backend))
+            for key, cfg, path in tasks
+        ]
+
+    for df, meta, messages in results:
+        for message in messages:
+            typer.echo(message, err=True)
+        if df is None:
             continue
-
-        df = df.copy()
-        df['source_dataset'] = key
-        df['source_dataset_label'] = label
-        df['listing_type'] = category
-        df['listing_type_label'] = label
-        source_ids = df['listing_id'].astype('string').str.strip()
-        df['source_listing_id'] = source_ids
-        df = df[source_ids.notna() & (source_ids != "")]
-        df['record_id'] = df['source_dataset'] + ":" + df['source_listing_id']
-
         frames.append(df)
-        sources_meta.append({
-            "dataset": key,
-            "label": label,
-            "path": str(source_path),
-            "sha256": _sha256_file(Path(source_path)),
-            "records": int(len(df)),
-        })
+        sources_meta.append(meta)
+
+    if use_cache:
+        cache.evict()
 
     if not frames:
         typer.echo("[error] No datasets available for processing", err=True)
         raise typer.Exit(code=3)
 
     combined = pd.concat(frames, ignore_index=True, sort=False)
+    lengths = [len(f) for f in frames]
+    # Release the per-dataset frames before the rest of the pipeline runs
+    frames.clear()
+    results = None
+    if low_memory:
+        tags = [
+            (m["dataset"], m["label"], datasets[m["dataset"]].get("category", m["dataset"]))
+            for m in sources_meta
+        ]
+        _add_dataset_columns(combined, tags, lengths)
     combined.drop_duplicates(subset=['record_id'], inplace=True)
 
     return combined, sources_meta
 
 
-def _run_pipeline(base_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    mapped = map_program_flags(base_df, MAPPING)
-    enriched = enrich_markets(mapped)
-    valid, rejects = basic_validate(enriched)
+def _map_programs(base_df: pd.DataFrame) -> pd.DataFrame:
+    with stage("map_program_flags", rows_in=len(base_df)) as record:
+        mapped = map_program_flags(base_df, MAPPING)
+        record["rows_out"] = len(mapped)
+    return mapped
+
+
+def _enrich(mapped: pd.DataFrame, low_memory: bool = False, backend: str = "pandas") -> pd.DataFrame:
+    with stage("enrich_markets", rows_in=len(mapped)) as record:
+        enriched = enrich_markets(mapped, copy=not low_memory, backend=backend)
+        if low_memory:
+            _as_categoricals(enriched)
+        record["rows_out"] = len(enriched)
+    return enriched
+
+
+def _validate(
+    enriched: pd.DataFrame,
+    backend: str = "pandas",
+    validation: Dict[str, dict] | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """``basic_validate`` with the rules in VALIDATION; ``validation`` receives the per-rule report."""
+    with stage("basic_validate", rows_in=len(enriched)) as record:
+        valid, rejects = basic_validate(enriched, backend=backend, rules=load_rules(VALIDATION), report=validation)
+        record["rows_out"] = len(valid)
     return valid, rejects
 
 
-def _write_artifacts(valid: pd.DataFrame, rejects: pd.DataFrame, sources_meta: List[dict], exports: dict) -> dict:
+def _run_pipeline(
+    base_df: pd.DataFrame,
+    low_memory: bool = False,
+    backend: str = "pandas",
+    validation: Dict[str, dict] | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Map, enrich and validate; ``low_memory`` works on ``base_df`` in place."""
+    enriched = _enrich(_map_programs(base_df), low_memory, backend)
+    return _validate(enriched, backend, validation)
+
+
+def _code_digest(*modules: str) -> str:
+    """Digest of the named ``ingest/scripts`` modules, so code edits invalidate checkpoints and cache entries."""
+    return cache.cache_key(*(_sha256_file(SCRIPTS_DIR / f"{name}.py") for name in modules))
+
+
+def _checkpoint_keys(overrides: Dict[str, Path] | None, low_memory: bool, backend: str) -> Dict[str, str]:
+    """Expected key of every checkpointed stage for the current sources, config and code."""
+    datasets = _load_dataset_config()
+    tasks, _ = _resolve_sources(datasets, overrides)
+    parts = [pd.__version__, _sha256_file(Path(DATASETS)), _code_digest(*INGEST_MODULES)]
+    parts += [backend, str(low_memory)]
+    for key, cfg, path in tasks:
+        schema = cfg.get("schema", SCHEMA)
+        engine = cfg.get("engine", "pandas")
+        columns = projected_columns(schema, MAPPING, EXPORTS) if engine == "stream" else []
+        parts += [key, str(path), raw_store.file_sha256(path, RAW_DIR), _sha256_file(Path(schema)), engine, ",".join(columns)]
+    keys = {"ingest": checkpoints.stage_key("", *parts)}
+    keys["map"] = checkpoints.stage_key(keys["ingest"], _sha256_file(Path(MAPPING)), _code_digest("map_programs"))
+    keys["enrich"] = checkpoints.stage_key(keys["map"], _code_digest("enrich", "centroids"))
+    keys["validate"] = checkpoints.stage_key(keys["enrich"], _sha256_file(Path(VALIDATION)), _code_digest("validate"))
+    return keys
+
+
+def _resume_point(start: str, keys: Dict[str, str], report: dict, incremental: bool = False) -> str:
+    """First stage to run for ``--from start``: earlier when the checkpoint it needs isn't current."""
+    index = checkpoints.STAGES.index(start)
+    while index > 0:
+        previous = checkpoints.STAGES[index - 1]
+        if incremental and previous in ("map", "enrich"):
+            # The incremental pipeline starts from the ingested frame
+            index -= 1
+            continue
+        state = checkpoints.status(previous, keys[previous], STAGE_DIR)
+        if state == "current":
+            report["loaded"] = previous
+            break
+        if state == "stale":
+            report["invalidated"] += checkpoints.invalidate([previous], STAGE_DIR)
+        typer.echo(f"[warn] The '{previous}' checkpoint is {state}; running '{previous}' again", err=True)
+        index -= 1
+    return checkpoints.STAGES[index]
+
+
+def _save_checkpoint(name: str, frames: List[pd.DataFrame], keys: Dict[str, str], info: dict, report: dict) -> None:
+    with stage(f"checkpoint:{name}", rows_in=len(frames[0])):
+        if checkpoints.save(name, frames, keys[name], info, STAGE_DIR):
+            report["written"].append(name)
+        else:
+            typer.echo(f"[warn] Could not checkpoint the '{name}' stage", err=True)
+
+
+def _check_stages(start: str, stop: str, incremental: bool) -> None:
+    stages = checkpoints.STAGES
+    for option, name in (("--from", start), ("--to", stop)):
+        if name not in stages:
+            raise typer.BadParameter(f"Unknown stage '{name}' for {option}. Available: {', '.join(stages)}")
+    if stages.index(start) > stages.index(stop):
+        raise typer.BadParameter(f"--from {start} comes after --to {stop}")
+    if incremental and (start in ("map", "enrich", "validate") or stop in ("map", "enrich")):
+        raise typer.BadParameter("--incremental runs map, enrich and validate as one stage; use --from/--to ingest, validate or export")
+
+
+def _run_pipeline_incremental(
+    base_df: pd.DataFrame,
+    backend: str = "pandas",
+    validation: Dict[str, dict] | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, dict]:
+    with stage("incremental_pipeline", rows_in=len(base_df)) as record:
+        valid, rejects, stats = run_incremental(base_df, MAPPING, backend=backend, rules_path=VALIDATION, report=validation)
+        record["rows_out"] = len(valid)
+    if not stats["state_stored"]:
+        typer.echo("[warn] Could not store incremental state; the next run will recompute every record", err=True)
+    return valid, rejects, stats
+
+
+def _write_if_changed(path: Path, text: str | bytes) -> bool:
+    """Write ``text`` unless ``path`` already holds it, so unchanged artifacts keep their mtime."""
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def _write_artifacts(
+    valid: pd.DataFrame,
+    rejects: pd.DataFrame,
+    sources_meta: List[dict],
+    exports: dict,
+    export_sizes: dict | None = None,
+    incremental: dict | None = None,
+    delta: dict | None = None,
+    export_report: dict | None = None,
+    validation: dict | None = None,
+    duplicates: dict | None = None,
+) -> dict:
     STAGE_DIR.mkdir(parents=True, exist_ok=True)
     rejects_path = STAGE_DIR / "rejects.csv"
-    rejects.to_csv(rejects_path, index=False)
+    _write_if_changed(rejects_path, rejects.to_csv(index=False))
 
-    zip_centroids = generate_zip_centroids(valid)
+    # ZIP, ZIP3 and city centroids come out of one pass over the validated rows
+    with stage("centroids", rows_in=len(valid)) as record:
+        centroids = compute_centroids(valid)
+        record["rows_out"] = len(centroids.zip) + len(centroids.zip3) + len(centroids.city)
+
+    with stage("zip_centroids", rows_in=len(valid)) as record:
+        zip_centroids = centroids.zip_centroids()
+        record["rows_out"] = len(zip_centroids)
     zc_path = Path("site/static/data/zip.centroids.json")
-    zc_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(zc_path, "w", encoding="utf-8") as f:
-        json.dump(zip_centroids, f, separators=(",", ":"), sort_keys=True)
+    _write_if_changed(zc_path, json.dumps(zip_centroids, separators=(",", ":"), sort_keys=True))
 
-    city_centroids = generate_city_centroids(valid)
+    with stage("city_centroids", rows_in=len(valid)) as record:
+        city_centroids = centroids.city_centroids()
+        record["rows_out"] = len(city_centroids)
     cc_path = Path("site/static/data/city.centroids.json")
-    cc_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(cc_path, "w", encoding="utf-8") as f:
-        json.dump(city_centroids, f, separators=(",", ":"), sort_keys=True)
+    _write_if_changed(cc_path, json.dumps(city_centroids, separators=(",", ":"), sort_keys=True))
 
     manifest = {
         "schema_version": "2.0.0",
@@ -148,7 +505,22 @@ def _write_artifacts(valid: pd.DataFrame, rejects: pd.DataFrame, sources_meta: L
         "records_valid": int(len(valid)),
         "records_rejected": int(len(rejects)),
         "sources": sources_meta,
+        "cache": cache.summarize(sources_meta),
         "exports": {**exports, "zip_centroids": str(zc_path), "city_centroids": str(cc_path)},
+        "export_sizes": export_sizes or {},
+        "export_report": {
+            name: {k: v for k, v in entry.items() if k != "path"} for name, entry in (export_report or {}).items()
+        },
+        "validation": {
+            "rules_path": VALIDATION,
+            "rules": {
+                name: {**entry, "seconds": None if entry.get("seconds") is None else round(entry["seconds"], 4)}
+                for name, entry in (validation or {}).items()
+            },
+        },
+        "incremental": incremental or {"enabled": False},
+        "delta": delta,
+        "duplicates": duplicates or {"enabled": False},
     }
 
     PROC_DIR.mkdir(parents=True, exist_ok=True)
@@ -163,20 +535,139 @@ def _write_artifacts(valid: pd.DataFrame, rejects: pd.DataFrame, sources_meta: L
     return manifest
 
 
+def _write_duplicates(valid: pd.DataFrame) -> dict:
+    """Cluster near-duplicate records across datasets per DEDUPE; returns the manifest entry."""
+    config = load_dedupe_config(DEDUPE)
+    if not config["enabled"]:
+        return {"enabled": False}
+    report: dict = {}
+    with stage("duplicates", rows_in=len(valid)) as record:
+        cluster_ids = find_duplicates(valid, config, report)
+        record["rows_out"] = report["records_in_clusters"]
+    path = PROC_DIR / "duplicates.csv"
+    _write_if_changed(path, duplicate_clusters(valid, cluster_ids).to_csv(index=False))
+    entry = {"enabled": True, "config_path": DEDUPE, "path": str(path), **report}
+    if config["canonical"]:
+        with stage("canonical_records", rows_in=len(valid)) as record:
+            canonical = canonical_records(valid, cluster_ids, config["priority"])
+            record["rows_out"] = len(canonical)
+        canonical_path = PROC_DIR / "markets.canonical.parquet"
+        _write_if_changed(canonical_path, plain_columns(canonical).to_parquet(index=False))
+        entry["canonical_path"] = str(canonical_path)
+    return entry
+
+
+def _previous_manifest_sha() -> str | None:
+    man_path = PROC_DIR / "manifest.json"
+    return _sha256_file(man_path) if man_path.exists() else None
+
+
+def _update_manifest(manifest: dict, **entries) -> dict:
+    """Add top-level ``entries`` to manifest.json and the in-memory manifest."""
+    man_path = PROC_DIR / "manifest.json"
+    with open(man_path, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    stored.update(entries)
+    with open(man_path, "w", encoding="utf-8") as f:
+        json.dump(stored, f, indent=2)
+    manifest.update(entries)
+    return manifest
+
+
+def _finalize_artifacts(manifest: dict) -> dict:
+    """Write hashed, precompressed copies of the site JSON and record them in manifest.json."""
+    with stage("finalize_artifacts") as record:
+        artifacts = finalize_artifacts(manifest["exports"].values())
+        record["rows_out"] = len(artifacts["files"])
+    return _update_manifest(manifest, artifacts=artifacts)
+
+
 @APP.command("stage-raw")
 def cmd_stage_raw(
     src: str = typer.Argument(..., help="Path to downloaded USDA Excel"),
     dataset: str = typer.Option("farmers_market", help="Dataset key to associate with this file"),
+    profile: bool = typer.Option(False, "--profile", help="Print timing and memory to stderr"),
 ):
-    dst = stage_raw(src, dataset_key=dataset)
+    profiler = Profiler()
+    result: dict = {}
+    with profiler.activate(), stage("stage_raw"):
+        dst = stage_raw(src, dataset_key=dataset, report=result)
+    if profile:
+        typer.echo(format_table(profiler.summary()), err=True)
+    if result.get("status") == "exists":
+        typer.echo("[info] Identical content is already staged; nothing written", err=True)
     typer.echo(dst)
 
 
+@APP.command("gc")
+def cmd_gc(
+    keep: int = typer.Option(3, "--keep", min=1, help="Snapshots to keep per dataset (newest first)"),
+    keep_days: float = typer.Option(None, "--keep-days", min=0.0, help="Also keep snapshots younger than this many days"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report what would be removed"),
+):
+    """Prune old raw snapshots and the store objects no snapshot uses any more."""
+    result = raw_store.gc(_load_dataset_config(), keep, keep_days, dry_run, RAW_DIR)
+    verb = "Would remove" if dry_run else "Removed"
+    for path in result["snapshots_removed"] + result["objects_removed"]:
+        typer.echo(f"{verb} {path}")
+    typer.echo(
+        f"{verb} {len(result['snapshots_removed'])} snapshot(s) and {len(result['objects_removed'])} object(s); "
+        f"kept {result['snapshots_kept']} snapshot(s); {result['bytes_freed'] / 1e6:.1f} MB {'to free' if dry_run else 'freed'}"
+    )
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in arrow_backend.BACKENDS:
+        raise typer.BadParameter(f"Unknown backend '{backend}'. Available: {', '.join(arrow_backend.BACKENDS)}")
+
+
 @APP.command("run")
 def cmd_run(
     raw: str = typer.Option(None, help="Optional raw file path to override a dataset"),
     dataset: str = typer.Option(None, help="Dataset key when using --raw (e.g. farmers_market, csa)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-parse every Excel source instead of using data/cache"),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Ingest datasets in N worker processes"),
+    incremental: bool = typer.Option(False, "--incremental", help="Only re-process records that changed since the last incremental run"),
+    profile: bool = typer.Option(False, "--profile", help="Print per-stage timings and memory to stderr"),
+    pstats_dir: Path = typer.Option(None, "--pstats-dir", help="Also dump a cProfile .pstats file per top-level stage here"),
+    low_memory: bool = typer.Option(False, "--low-memory", help="Work in place and use categorical columns to lower peak memory"),
+    export_jobs: int = typer.Option(None, "--export-jobs", min=1, help="Write export profiles on N threads (default: one per CPU)"),
+    backend: str = typer.Option("pandas", "--backend", help="Column engine: pandas, or arrow (string[pyarrow] + pyarrow.compute)"),
+    start: str = typer.Option("ingest", "--from", help="First stage to run (ingest, map, enrich, validate, export); earlier stages load their checkpoints"),
+    stop: str = typer.Option("export", "--to", help="Last stage to run; stopping before export only writes checkpoints"),
 ):
+    _check_backend(backend)
+    _check_stages(start, stop, incremental)
+    profiler = Profiler(pstats_dir)
+    with profiler.activate():
+        manifest = _run(raw, dataset, no_cache, jobs, incremental, low_memory, export_jobs, backend, start, stop)
+    if stop == "export":
+        manifest = _update_manifest(manifest, backend=backend, profile=profiler.summary())
+    else:
+        manifest["profile"] = profiler.summary()
+    if profile:
+        typer.echo(format_table(manifest["profile"]), err=True)
+
+    typer.echo(json.dumps(manifest, indent=2))
+
+
+def _run(
+    raw: str | None,
+    dataset: str | None,
+    no_cache: bool,
+    jobs: int,
+    incremental: bool,
+    low_memory: bool = False,
+    export_jobs: int | None = None,
+    backend: str = "pandas",
+    start: str = "ingest",
+    stop: str = "export",
+) -> dict:
+    """Run stages ``start`` through ``stop``, resuming from (and writing) stage checkpoints.
+
+    Returns the manifest, or just the checkpoint report when ``stop`` is
+    before export.
+    """
     overrides: Dict[str, Path] = {}
     if raw:
         path = Path(raw).expanduser().resolve()
@@ -188,29 +679,213 @@ def cmd_run(
             raise typer.BadParameter("Unable to determine dataset key; supply --dataset explicitly")
         overrides[dataset_key] = path
 
-    base_df, sources_meta = _prepare_datasets(overrides)
-    valid, rejects = _run_pipeline(base_df)
-    exports = export_from_profile(valid, EXPORTS)
-    manifest = _write_artifacts(valid, rejects, sources_meta, exports)
-
-    typer.echo(json.dumps(manifest, indent=2))
+    keys = _checkpoint_keys(overrides, low_memory, backend)
+    report = {"start": start, "stop": stop, "loaded": None, "written": [], "invalidated": []}
+    start = report["start"] = _resume_point(start, keys, report, incremental)
+    todo = checkpoints.STAGES[checkpoints.STAGES.index(start):checkpoints.STAGES.index(stop) + 1]
+    frames: List[pd.DataFrame] = []
+    sources_meta: List[dict] = []
+    validation: Dict[str, dict] = {}
+    if report["loaded"]:
+        with stage(f"load_checkpoint:{report['loaded']}") as record:
+            frames, info = checkpoints.load(report["loaded"], STAGE_DIR, _string_storage(backend))
+            sources_meta = info.get("sources", [])
+            validation = info.get("validation", {})
+            record["rows_out"] = len(frames[0])
+
+    previous_manifest = _previous_manifest_sha()
+    if "ingest" in todo:
+        with stage("prepare_datasets") as record:
+            base_df, sources_meta = _prepare_datasets(
+                overrides, use_cache=not no_cache, jobs=jobs, low_memory=low_memory, backend=backend
+            )
+            record["rows_out"] = len(base_df)
+        frames = [base_df]
+        del base_df
+        _save_checkpoint("ingest", frames, keys, {"sources": sources_meta}, report)
+    info = {"sources": sources_meta}
+    incremental_stats = None
+    if incremental and "validate" in todo:
+        valid, rejects, incremental_stats = _run_pipeline_incremental(frames.pop(), backend, validation)
+        frames = [valid, rejects]
+        _save_checkpoint("validate", frames, keys, {**info, "validation": validation}, report)
+    else:
+        # low_memory stages work in place, so each checkpoint is written before the next stage runs
+        if "map" in todo:
+            frames = [_map_programs(frames.pop())]
+            _save_checkpoint("map", frames, keys, info, report)
+        if "enrich" in todo:
+            frames = [_enrich(frames.pop(), low_memory, backend)]
+            _save_checkpoint("enrich", frames, keys, info, report)
+        if "validate" in todo:
+            frames = list(_validate(frames.pop(), backend, validation))
+            _save_checkpoint("validate", frames, keys, {**info, "validation": validation}, report)
+    if stop != "export":
+        return {"checkpoints": report}
+
+    valid, rejects = frames
+    del frames
+    manifest = _publish(valid, rejects, sources_meta, previous_manifest, export_jobs, incremental_stats, validation=validation)
+    return _update_manifest(manifest, checkpoints=report)
+
+
+def _publish(
+    valid: pd.DataFrame,
+    rejects: pd.DataFrame,
+    sources_meta: List[dict],
+    previous_manifest: str | None,
+    export_jobs: int | None = None,
+    incremental_stats: dict | None = None,
+    only: List[str] | None = None,
+    export_report: dict | None = None,
+    export_sizes: dict | None = None,
+    validation: dict | None = None,
+) -> dict:
+    """Export, delta, centroids, manifest and finalized copies for the validated rows.
+
+    ``only`` limits the export to those profiles; ``export_report`` and
+    ``export_sizes`` then carry the entries of the others and are updated in place.
+    ``validation`` is the per-rule report for the manifest.
+    """
+    export_report = {} if export_report is None else export_report
+    export_sizes = {} if export_sizes is None else export_sizes
+    export_report.update(export_profiles(valid, EXPORTS, export_sizes, export_jobs, only))
+    exports = {name: entry["path"] for name, entry in export_report.items()}
+    with stage("delta", rows_in=len(valid)) as record:
+        delta = write_delta(valid, previous_manifest)
+        record["rows_out"] = delta.get("added", 0) + delta.get("removed", 0) + delta.get("changed", 0)
+    duplicates = _write_duplicates(valid)
+    manifest = _write_artifacts(
+        valid, rejects, sources_meta, exports, export_sizes, incremental_stats, delta, export_report, validation,
+        duplicates,
+    )
+    return _finalize_artifacts(manifest)
+
+
+def _watch_cycle(state: dict, changed: List[str], backend: str = "pandas", export_jobs: int | None = None) -> dict | None:
+    """Re-ingest the ``changed`` datasets, reuse the others' frames and republish.
+
+    ``state`` lives across cycles: the per-dataset frames and source metadata,
+    and the digests, report and sizes of the last export. Only profiles whose
+    digest changed are exported again. Returns the manifest, or None when no
+    dataset has any rows.
+    """
+    datasets = _load_dataset_config()
+    sources = state.setdefault("sources", {})
+    paths = {key: path for key, _, path in _resolve_sources(datasets)[0]}
+    for key in changed:
+        dropped = sources.pop(key, None)
+        if key not in paths:
+            if dropped is not None:
+                typer.echo(f"[watch] No source file left for dataset '{key}'", err=True)
+            continue
+        df, meta, messages = _load_dataset(key, datasets[key], paths[key], use_cache=True, backend=backend)
+        for message in messages:
+            typer.echo(message, err=True)
+        if df is not None:
+            sources[key] = (df, meta)
+    cache.evict()
+    loaded = [sources[key] for key in datasets if key in sources]
+    if not loaded:
+        typer.echo("[error] No datasets available for processing", err=True)
+        return None
+
+    previous_manifest = _previous_manifest_sha()
+    with stage("prepare_datasets") as record:
+        base_df = pd.concat([df for df, _ in loaded], ignore_index=True, sort=False)
+        base_df.drop_duplicates(subset=["record_id"], inplace=True)
+        record["rows_out"] = len(base_df)
+    validation: Dict[str, dict] = {}
+    valid, rejects = _run_pipeline(base_df, backend=backend, validation=validation)
+    del base_df
+
+    digests = profile_digests(valid, EXPORTS)
+    profiles = load_profiles(EXPORTS)
+    previous = state.get("digests", {})
+    only = [
+        name for name, digest in digests.items()
+        if previous.get(name) != digest or not Path(profiles[name]["path"]).exists()
+    ]
+    manifest = _publish(
+        valid, rejects, [meta for _, meta in loaded], previous_manifest, export_jobs,
+        only=only, export_report=state.setdefault("export_report", {}), export_sizes=state.setdefault("export_sizes", {}),
+        validation=validation,
+    )
+    state["digests"] = digests
+    return _update_manifest(manifest, exported=only)
 
 
 @APP.command("validate")
-def cmd_validate():
-    base_df, _ = _prepare_datasets()
-    valid, rejects = _run_pipeline(base_df)
+def cmd_validate(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-parse every Excel source instead of using data/cache"),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Ingest datasets in N worker processes"),
+    low_memory: bool = typer.Option(False, "--low-memory", help="Work in place and use categorical columns to lower peak memory"),
+    backend: str = typer.Option("pandas", "--backend", help="Column engine: pandas, or arrow (string[pyarrow] + pyarrow.compute)"),
+):
+    _check_backend(backend)
+    base_df, _ = _prepare_datasets(use_cache=not no_cache, jobs=jobs, low_memory=low_memory, backend=backend)
+    valid, rejects = _run_pipeline(base_df, low_memory, backend)
     typer.echo(f"valid={len(valid)} rejects={len(rejects)}")
 
 
+@APP.command("watch")
+def cmd_watch(
+    interval: float = typer.Option(2.0, "--interval", min=0.05, help="Seconds between polls of data/raw"),
+    debounce: float = typer.Option(5.0, "--debounce", min=0.0, help="Wait until changes have been quiet this long"),
+    export_jobs: int = typer.Option(None, "--export-jobs", min=1, help="Write export profiles on N threads (default: one per CPU)"),
+    backend: str = typer.Option("pandas", "--backend", help="Column engine: pandas, or arrow (string[pyarrow] + pyarrow.compute)"),
+    max_runs: int = typer.Option(None, "--max-runs", min=1, help="Exit after N pipeline runs, counting the initial one"),
+):
+    """Run once, then re-run whenever a dataset in data/raw changes (polling, no extra services)."""
+    _check_backend(backend)
+    datasets = _load_dataset_config()
+    watcher = Watcher(RAW_DIR, datasets, debounce)
+    state: dict = {}
+    changed = list(datasets)
+    failed: List[str] = []
+    runs = 0
+    while True:
+        if changed:
+            profiler = Profiler()
+            label = "initial run" if runs == 0 else ", ".join(changed)
+            runs += 1
+            # A failed cycle (e.g. a half-copied workbook) must not lose the last good state
+            trial = {key: dict(value) for key, value in state.items()}
+            try:
+                with profiler.activate():
+                    manifest = _watch_cycle(trial, changed, backend, export_jobs)
+                if manifest is not None:
+                    manifest = _update_manifest(manifest, backend=backend, profile=profiler.summary())
+            except Exception as exc:
+                typer.echo(f"[error] {label} failed: {exc!r}; keeping the previous output", err=True)
+                failed = changed
+            else:
+                state, failed = trial, []
+                if manifest is not None:
+                    exported = ", ".join(manifest["exported"]) or "nothing"
+                    typer.echo(f"[watch] {label}: {manifest['records_valid']} valid records; re-exported {exported}")
+            if max_runs is not None and runs >= max_runs:
+                return
+        time.sleep(interval)
+        polled = watcher.poll()
+        # Datasets of a failed cycle are retried with the next change
+        changed = [key for key in datasets if key in polled or (polled and key in failed)]
+
+
 @APP.command("export")
-def cmd_export():
-    staged = STAGE_DIR / "prepared.parquet"
-    if not staged.exists():
-        raise typer.Exit(code=2)
-    df = pd.read_parquet(staged)
-    export_from_profile(df, EXPORTS)
-    typer.echo("Exported from staged parquet.")
+def cmd_export(
+    low_memory: bool = typer.Option(False, "--low-memory", help="Use the checkpoints of a --low-memory run"),
+    export_jobs: int = typer.Option(None, "--export-jobs", min=1, help="Write export profiles on N threads (default: one per CPU)"),
+    backend: str = typer.Option("pandas", "--backend", help="Use the checkpoints of a run with this backend"),
+):
+    """Re-export from the validated checkpoint (``run --from export``)."""
+    _check_backend(backend)
+    profiler = Profiler()
+    with profiler.activate():
+        manifest = _run(None, None, False, 1, False, low_memory, export_jobs, backend, start="export")
+    _update_manifest(manifest, backend=backend, profile=profiler.summary())
+    loaded = manifest["checkpoints"]["loaded"]
+    typer.echo(f"Exported from the '{loaded}' checkpoint." if loaded else "No current checkpoint; ran the whole pipeline.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""Vectorized dtype coercion for the ``dtypes`` section of ``schema.yml``.
+
+One coercer per schema type, each returning the coerced column and the number
+of values that failed to parse:
+
+- ``str`` / ``category``: ``astype("string").str.strip()`` (``string[pyarrow]``
+  with ``--backend arrow``), as a categorical for ``category``; never fails.
+- ``float`` / ``int``: ``pd.to_numeric``; ``int`` gives nullable ``Int64`` and
+  also rejects fractional (or out-of-range) values. Failures are non-blank
+  values that end up missing.
+- ``datetime``: ``pd.to_datetime(utc=True)``; failures as for numbers.
+- ``bool``: digit strings and numbers are true when non-zero, any other
+  non-empty value is true (Python truthiness), missing values are false.
+  Failures count the non-missing values that weren't numbers, digit strings
+  or empty strings, i.e. the ones decided by truthiness alone ("yes", "x").
+
+The pandas backend used to strip every ``string`` column a second time after
+coercion; now only ``string`` columns the schema didn't coerce are stripped.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_integer_dtype, is_numeric_dtype
+
+from ingest.scripts import arrow_backend
+
+Coerced = Tuple[pd.Series, int]
+
+_NUMBER_TYPES = (bool, int, float, np.bool_, np.integer, np.floating)
+
+
+def _failed(series: pd.Series, result: pd.Series) -> int:
+    """Values present in ``series`` (not missing, not blank strings) that ``result`` lost."""
+    lost = series.iloc[np.flatnonzero(result.isna().to_numpy())]
+    values = lost.to_numpy(dtype=object)[lost.notna().to_numpy()]
+    return sum(1 for v in values if not (isinstance(v, str) and not v.strip()))
+
+
+def coerce_str(series: pd.Series, backend: str = "pandas") -> Coerced:
+    if backend == "arrow":
+        return arrow_backend.coerce_str(series), 0
+    return series.astype("string").str.strip(), 0
+
+
+def coerce_category(series: pd.Series, backend: str = "pandas") -> Coerced:
+    values, _ = coerce_str(series, backend)
+    return values.astype("category"), 0
+
+
+def coerce_float(series: pd.Series, backend: str = "pandas") -> Coerced:
+    result = pd.to_numeric(series, errors="coerce")
+    return result, _failed(series, result)
+
+
+def coerce_int(series: pd.Series, backend: str = "pandas") -> Coerced:
+    numbers = pd.to_numeric(series, errors="coerce")
+    if is_integer_dtype(numbers.dtype) or numbers.dtype == bool:
+        return numbers.astype("Int64"), _failed(series, numbers)
+    values = numbers.to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        fractional = ~np.isnan(values) & ~((np.abs(values) < 2.0 ** 63) & (values == np.floor(values)))
+    missing = np.isnan(values) | fractional
+    ints = pd.arrays.IntegerArray(np.where(missing, 0, values).astype(np.int64), missing)
+    result = pd.Series(ints, index=series.index)
+    return result, _failed(series, result)
+
+
+def coerce_datetime(series: pd.Series, backend: str = "pandas") -> Coerced:
+    result = pd.to_datetime(series, errors="coerce", utc=True)
+    return result, _failed(series, result)
+
+
+def _truth(value) -> bool:
+    return bool(int(value)) if str(value).strip().isdigit() else bool(value)
+
+
+def _parsed(value) -> bool:
+    if isinstance(value, str):
+        return value == "" or value.strip().isdigit()
+    return isinstance(value, _NUMBER_TYPES)
+
+
+def coerce_bool(series: pd.Series, backend: str = "pandas") -> Coerced:
+    if series.dtype == bool or (is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype)):
+        return arrow_backend.coerce_bool(series), 0
+    if infer_dtype(series, skipna=True) in ("string", "empty"):
+        flags, parsed = arrow_backend.string_flags(series)
+        return pd.Series(flags, index=series.index), int(np.count_nonzero(~parsed))
+
+    # Mixed object column: the per-value rule once per distinct value. Values
+    # that hash together (1, 1.0, True) always share a truth value
+    codes, uniques = pd.factorize(series)
+    truth = np.array([_truth(v) for v in uniques], dtype=bool)
+    parsed = np.array([_parsed(v) for v in uniques], dtype=bool)
+    found = codes >= 0
+    result = np.zeros(len(codes), dtype=bool)
+    result[found] = truth[codes[found]]
+    counts = np.bincount(codes[found], minlength=len(uniques))
+    return pd.Series(result, index=series.index), int(counts[~parsed].sum())
+
+
+COERCERS: Dict[str, Callable[[pd.Series, str], Coerced]] = {
+    "str": coerce_str,
+    "category": coerce_category,
+    "float": coerce_float,
+    "int": coerce_int,
+    "datetime": coerce_datetime,
+    "bool": coerce_bool,
+}
+
+
+def coerce_column(series: pd.Series, typ: str, backend: str = "pandas") -> Coerced:
+    """Coerce ``series`` to schema type ``typ``; returns (column, failed values)."""
+    if typ not in COERCERS:
+        raise ValueError(f"Unknown schema dtype '{typ}'. Available: {', '.join(COERCERS)}")
+    return COERCERS[typ](series, backend)
+
+
+def apply_dtypes(
+    df: pd.DataFrame,
+    dtypes: Dict[str, str],
+    backend: str = "pandas",
+    report: Dict[str, dict] | None = None,
+) -> pd.DataFrame:
+    """Coerce the ``dtypes`` columns present in ``df`` (in place) and return it.
+
+    Other ``string`` columns are stripped like ``str`` ones (pandas backend);
+    object columns are left alone. ``report`` receives ``{column: {dtype,
+    failed}}``.
+    """
+    arrow_backend.check_backend(backend)
+    for col, typ in dtypes.items():
+        if col not in df.columns:
+            continue
+        df[col], failed = coerce_column(df[col], typ, backend)
+        if report is not None:
+            report[col] = {"dtype": typ, "failed": failed}
+    if backend == "pandas":
+        for col in df.columns:
+            if dtypes.get(col) not in ("str", "category") and df[col].dtype == "string":
+                df[col] = df[col].str.strip()
+    return df
+
+
+__all__ = ["apply_dtypes", "coerce_column", "COERCERS"]
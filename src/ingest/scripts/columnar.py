@@ -0,0 +1,130 @@
+"""Dictionary-encoded columnar JSON for the web payloads.
+
+The row format repeats every key and every repetitive value per record. Here
+each field becomes one array:
+
+- ``{"values": [...]}`` for plain columns,
+- ``{"dictionary": [...], "codes": [...]}`` for low-cardinality string columns
+  (null is an ordinary dictionary entry),
+- boolean columns without nulls are packed into ``bitmasks``: each mask lists
+  its ``fields`` and one integer per record, bit ``i`` holding ``fields[i]``.
+  Masks carry at most 31 flags so the map can use JavaScript bitwise operators.
+
+Values come from the row writer's per-chunk column conversion
+(``json_writer.iter_column_chunks``), so ``decode_columnar`` reproduces the
+row records exactly; ``row_bytes`` sizes the row format by streaming it
+through that writer instead of building the records.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from ingest.scripts.json_writer import CHUNK_ROWS, iter_column_chunks, write_json_records
+
+COLUMNAR_VERSION = 1
+MAX_DICTIONARY = 1024
+BITS_PER_MASK = 31
+
+
+def row_records(data: pd.DataFrame) -> List[dict]:
+    """Records exactly as the row JSON format writes them."""
+    return json.loads(data.to_json(orient="records"))
+
+
+class _ByteCounter:
+    """Text sink that only counts the UTF-8 bytes written to it."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode("utf-8"))
+        return len(text)
+
+
+def row_bytes(data: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Size of ``data`` in the minified row JSON format, without holding the payload."""
+    counter = _ByteCounter()
+    write_json_records(data, counter, chunk_rows)
+    return counter.bytes
+
+
+def _is_flag(values: List[Any]) -> bool:
+    return bool(values) and all(v is True or v is False for v in values)
+
+
+def _dictionary_worthy(values: List[Any], max_dictionary: int) -> bool:
+    if not values or not all(v is None or isinstance(v, str) for v in values):
+        return False
+    distinct = len(set(values))
+    return distinct <= max_dictionary and distinct * 2 <= len(values)
+
+
+def encode_columnar(data: pd.DataFrame, max_dictionary: int = MAX_DICTIONARY, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """Encode ``data`` into the columnar payload."""
+    fields: List[str] = [str(c) for c in data.columns]
+    by_field: Dict[str, List[Any]] = {f: [] for f in fields}
+    for chunk in iter_column_chunks(data, chunk_rows):
+        for field in fields:
+            by_field[field].extend(chunk[field])
+    length = len(data)
+
+    columns: Dict[str, dict] = {}
+    flags: List[str] = []
+    for field in fields:
+        values = by_field[field]
+        if _is_flag(values):
+            flags.append(field)
+        elif _dictionary_worthy(values, max_dictionary):
+            dictionary: Dict[Any, int] = {}
+            codes = [dictionary.setdefault(v, len(dictionary)) for v in values]
+            columns[field] = {"dictionary": list(dictionary), "codes": codes}
+        else:
+            columns[field] = {"values": values}
+
+    bitmasks = []
+    for start in range(0, len(flags), BITS_PER_MASK):
+        group = flags[start:start + BITS_PER_MASK]
+        packed = [0] * length
+        for bit, field in enumerate(group):
+            for i, value in enumerate(by_field[field]):
+                if value:
+                    packed[i] |= 1 << bit
+        bitmasks.append({"fields": group, "values": packed})
+
+    return {
+        "format": "columnar",
+        "version": COLUMNAR_VERSION,
+        "length": length,
+        "fields": fields,
+        "columns": columns,
+        "bitmasks": bitmasks,
+    }
+
+
+def decode_columnar(payload: dict) -> List[dict]:
+    """Rebuild the row records from a columnar payload."""
+    length = payload["length"]
+    by_field: Dict[str, List[Any]] = {}
+    for field, column in payload["columns"].items():
+        if "dictionary" in column:
+            dictionary = column["dictionary"]
+            by_field[field] = [dictionary[code] for code in column["codes"]]
+        else:
+            by_field[field] = column["values"]
+    for mask in payload["bitmasks"]:
+        for bit, field in enumerate(mask["fields"]):
+            by_field[field] = [bool(value >> bit & 1) for value in mask["values"]]
+    fields = payload["fields"]
+    return [{f: by_field[f][i] for f in fields} for i in range(length)]
+
+
+def dumps(obj: Any) -> str:
+    """Minified JSON, as written for the web."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+__all__ = ["decode_columnar", "dumps", "encode_columnar", "row_bytes", "row_records"]
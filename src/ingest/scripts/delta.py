@@ -0,0 +1,194 @@
+"""Record-level deltas between pipeline runs.
+
+Every run leaves a snapshot of its valid set (``data/processed/snapshot.json.gz``:
+the records as their JSON values plus a SHA-256 per record). The next run
+compares against it by ``record_id`` and content hash and writes
+``data/processed/deltas/<to>.json``:
+
+- ``added``: full new records,
+- ``removed``: record ids,
+- ``changed``: ``{"record_id", "changes": {field: [old, new]}}`` for changed fields only.
+
+``from_sha256`` / ``to_sha256`` identify the record sets the delta connects, so a
+consumer holding the ``from`` state can apply it (``apply_delta``) in O(changes).
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+DELTA_VERSION = 1
+KEY = "record_id"
+SNAPSHOT_PATH = Path("data/processed/snapshot.json.gz")
+DELTA_DIR = Path("data/processed/deltas")
+MAX_DELTAS = 20
+_MISSING = object()
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def snapshot_records(valid: pd.DataFrame) -> Tuple[List[str], Dict[str, list]]:
+    """``(fields, {record_id: values})`` using the same JSON values as the exports."""
+    split = json.loads(valid.to_json(orient="split", index=False))
+    fields = split["columns"]
+    key = fields.index(KEY)
+    return fields, {str(row[key]): row for row in split["data"]}
+
+
+def _record_hashes(fields: List[str], records: Dict[str, list]) -> Dict[str, str]:
+    prefix = _dumps(fields)
+    return {rid: sha256((prefix + _dumps(values)).encode("utf-8")).hexdigest() for rid, values in records.items()}
+
+
+def set_hash(hashes: Dict[str, str]) -> str:
+    """Digest of a whole record set, independent of row order."""
+    h = sha256()
+    for rid in sorted(hashes):
+        h.update(f"{rid}\0{hashes[rid]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_json(path: Path, payload: dict, compress: bool = False) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    data = _dumps(payload).encode("utf-8")
+    tmp.write_bytes(gzip.compress(data, mtime=0) if compress else data)
+    os.replace(tmp, path)
+
+
+def diff_records(
+    old_fields: List[str],
+    old_records: Dict[str, list],
+    old_hashes: Dict[str, str],
+    new_fields: List[str],
+    new_records: Dict[str, list],
+    new_hashes: Dict[str, str],
+) -> dict:
+    """Added/removed/changed records; changed ones carry only the differing fields.
+
+    A field new to the schema counts as changed (from null) on every record;
+    fields missing from ``new_fields`` are reported once as ``dropped_fields``
+    by the caller, not per record.
+    """
+    old_pos = {f: i for i, f in enumerate(old_fields)}
+    added, changed = [], []
+    for rid, values in new_records.items():
+        if rid not in old_records:
+            added.append(dict(zip(new_fields, values)))
+        elif old_hashes.get(rid) != new_hashes[rid]:
+            before = old_records[rid]
+            changes = {}
+            for field, b in zip(new_fields, values):
+                i = old_pos.get(field)
+                a = _MISSING if i is None else before[i]
+                if a is _MISSING or a != b:
+                    changes[field] = [None if a is _MISSING else a, b]
+            if changes:
+                changed.append({KEY: rid, "changes": changes})
+    removed = sorted(rid for rid in old_records if rid not in new_records)
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def write_delta(
+    valid: pd.DataFrame,
+    previous_manifest_sha256: str | None,
+    snapshot_path: Path = SNAPSHOT_PATH,
+    delta_dir: Path = DELTA_DIR,
+) -> dict:
+    """Diff ``valid`` against the last snapshot, write the delta, refresh the snapshot.
+
+    Returns the manifest entry. The first run (no snapshot) only writes the
+    baseline snapshot.
+    """
+    fields, records = snapshot_records(valid)
+    hashes = _record_hashes(fields, records)
+    to_sha = set_hash(hashes)
+    entry = {
+        "previous_manifest_sha256": previous_manifest_sha256,
+        "to_sha256": to_sha,
+        "records": len(records),
+    }
+
+    previous = load_snapshot(snapshot_path)
+    if previous is None:
+        entry.update({"baseline": True, "path": None})
+    else:
+        old_fields = previous["fields"]
+        old_records = previous["records"]
+        old_hashes = previous["hashes"]
+        diff = diff_records(old_fields, old_records, old_hashes, fields, records, hashes)
+        delta = {
+            "version": DELTA_VERSION,
+            "key": KEY,
+            "previous_manifest_sha256": previous_manifest_sha256,
+            "from_sha256": previous["sha256"],
+            "to_sha256": to_sha,
+            "fields": fields,
+            "dropped_fields": [f for f in old_fields if f not in set(fields)],
+            **diff,
+        }
+        path = None
+        if previous["sha256"] != to_sha:
+            path = delta_dir / f"{to_sha[:16]}.json"
+            _write_json(path, delta)
+            _prune(delta_dir, keep=path)
+        entry.update({
+            "baseline": False,
+            "path": str(path) if path else None,
+            "from_sha256": previous["sha256"],
+            "added": len(diff["added"]),
+            "removed": len(diff["removed"]),
+            "changed": len(diff["changed"]),
+        })
+
+    _write_json(
+        snapshot_path,
+        {"version": DELTA_VERSION, "sha256": to_sha, "fields": fields, "records": records, "hashes": hashes},
+        compress=True,
+    )
+    return entry
+
+
+def _prune(delta_dir: Path, keep: Path, max_deltas: int = MAX_DELTAS) -> None:
+    deltas = sorted(delta_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in deltas[max_deltas:]:
+        if path != keep:
+            path.unlink(missing_ok=True)
+
+
+def apply_delta(records: Dict[str, dict], delta: dict) -> Dict[str, dict]:
+    """Apply ``delta`` to ``{record_id: record}`` in place and return it."""
+    for rid in delta["removed"]:
+        records.pop(rid, None)
+    for record in delta["added"]:
+        records[str(record[delta["key"]])] = dict(record)
+    for entry in delta["changed"]:
+        record = records[entry[delta["key"]]]
+        for field, (_, new) in entry["changes"].items():
+            record[field] = new
+    # Only a schema change touches every record
+    for field in delta.get("dropped_fields", []):
+        for record in records.values():
+            record.pop(field, None)
+    return records
+
+
+__all__ = ["apply_delta", "diff_records", "load_snapshot", "set_hash", "snapshot_records", "write_delta", "DELTA_DIR", "SNAPSHOT_PATH"]
@@ -0,0 +1,333 @@
+"""Near-duplicate markets across datasets, driven by ``ingest/config/dedupe.yml``.
+
+The same market is often listed by several USDA directories (farmers market,
+on-farm market, CSA) under different ``listing_id``s. ``find_duplicates``
+clusters such records without comparing every pair:
+
+1. Blocking: records are candidates only when they share a spatial grid cell
+   (four grids offset by half a cell, so close neighbours on either side of a
+   cell edge still share one) or a five-digit ZIP. Blocks larger than
+   ``max_block`` are compared in a window of ``window`` records in name order,
+   which bounds the pairs per record and keeps the stage near-linear.
+2. Scoring: Jaccard indexes of the normalized ``listing_name`` and
+   ``full_address`` tokens, computed for all candidate pairs at once by
+   probing a sorted (record, token) table, plus the great-circle distance.
+3. Clustering: the matching pairs are joined into connected components.
+   A cluster's id is its smallest ``record_id``, so ids stay put as long as
+   that record is in it.
+
+``canonical_records`` merges each cluster into one record.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import yaml
+
+from ingest.scripts import arrow_backend
+from ingest.scripts.spatial_index import EARTH_RADIUS_MILES
+from ingest.scripts.tiles import grid_cells, grid_shape
+
+CONFIG = "ingest/config/dedupe.yml"
+DEFAULTS = {
+    "enabled": True,
+    "cross_dataset": True,
+    "cell_degrees": 0.02,
+    "max_block": 200,
+    "window": 25,
+    "near_miles": 0.25,
+    "name_min": 0.6,
+    "address_min": 0.7,
+    "canonical": True,
+    "priority": [],
+    "stopwords": [],
+    "abbreviations": {},
+}
+# Token sets of at most this many tokens are compared as padded rows
+PADDED_TOKENS = 8
+PAIR_CHUNK = 1_000_000
+
+
+class Tokens:
+    """Distinct token ids per record: a sorted ``record * size + id`` table and a padded matrix."""
+
+    def __init__(self, keys: np.ndarray, size: int, n: int):
+        self.keys = keys
+        self.size = size
+        records = keys // size
+        self.starts = np.searchsorted(records, np.arange(n))
+        self.lengths = np.bincount(records, minlength=n)
+        width = int(min(self.lengths.max(initial=0), PADDED_TOKENS))
+        self.padded = np.full((n, width), -1, dtype=np.int64)
+        slot = np.arange(len(keys)) - self.starts[records]
+        fits = slot < width
+        self.padded[records[fits], slot[fits]] = keys[fits] % size
+
+
+def load_config(path: str = CONFIG) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        conf = yaml.safe_load(f) or {}
+    unknown = set(conf) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown dedupe settings: {', '.join(sorted(unknown))}")
+    config = {**DEFAULTS, **conf}
+    if config["cell_degrees"] <= 0:
+        raise ValueError("cell_degrees must be positive")
+    return config
+
+
+def _tokens(values: pd.Series, stopwords: set, abbreviations: Dict[str, str]) -> Tokens:
+    """Distinct normalized tokens of each value (lowercase ASCII letters and digits)."""
+    text = pc.fill_null(arrow_backend.to_arrow(values).cast(pa.string()), "")
+    words = pc.ascii_split_whitespace(pc.replace_substring_regex(pc.utf8_lower(text), "[^a-z0-9]+", " "))
+    parents = pc.list_parent_indices(words).to_numpy()
+    flat = pc.list_flatten(words).to_numpy(zero_copy_only=False)
+    codes, vocab = pd.factorize(flat)
+    # Abbreviate and drop stopwords once per distinct word
+    vocab = pd.Index([abbreviations.get(word, word) for word in vocab])
+    kept = ~vocab.isin(stopwords)
+    ids, _ = pd.factorize(vocab)
+    size = max(len(vocab), 1)
+    keep = kept[codes] if len(codes) else np.zeros(0, dtype=bool)
+    return Tokens(np.unique(parents[keep].astype(np.int64) * size + ids[codes[keep]]), size, len(values))
+
+
+def _padded_overlap(tokens: Tokens, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Shared tokens of pairs whose sets both fit the padded matrix."""
+    overlap = np.zeros(len(a))
+    for lo in range(0, len(a), PAIR_CHUNK):
+        left = tokens.padded[a[lo:lo + PAIR_CHUNK]]
+        right = tokens.padded[b[lo:lo + PAIR_CHUNK]]
+        # Tokens are distinct within a record, so every equal cell is one shared token
+        equal = (left[:, :, None] == right[:, None, :]) & (left[:, :, None] >= 0)
+        overlap[lo:lo + PAIR_CHUNK] = equal.sum(axis=(1, 2))
+    return overlap
+
+
+def _probed_overlap(tokens: Tokens, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Shared tokens of any pairs: each token of the smaller set is looked up in the sorted table."""
+    keys, size = tokens.keys, tokens.size
+    swap = tokens.lengths[a] > tokens.lengths[b]
+    small, big = np.where(swap, b, a), np.where(swap, a, b)
+    counts = tokens.lengths[small]
+    pair = np.repeat(np.arange(len(a)), counts)
+    offset = np.arange(len(pair)) - np.repeat(np.cumsum(counts) - counts, counts)
+    probe = big[pair] * size + keys[np.repeat(tokens.starts[small], counts) + offset] % size
+    pos = np.minimum(np.searchsorted(keys, probe), max(len(keys) - 1, 0))
+    hits = keys[pos] == probe if len(keys) else np.zeros(0, dtype=bool)
+    return np.bincount(pair, weights=hits, minlength=len(a))
+
+
+def jaccard(tokens: Tokens, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Jaccard index of the token sets of records ``a[i]`` and ``b[i]`` (0 when both are empty)."""
+    lengths = tokens.lengths
+    short = (lengths[a] <= PADDED_TOKENS) & (lengths[b] <= PADDED_TOKENS)
+    inter = np.zeros(len(a))
+    inter[short] = _padded_overlap(tokens, a[short], b[short])
+    inter[~short] = _probed_overlap(tokens, a[~short], b[~short])
+    union = lengths[a] + lengths[b] - inter
+    return np.divide(inter, union, out=np.zeros(len(a)), where=union > 0)
+
+
+def _house_numbers(values: pd.Series) -> np.ndarray:
+    """Code of each address's leading number, -1 without one."""
+    text = pc.fill_null(arrow_backend.to_arrow(values).cast(pa.string()), "")
+    numbers = pc.struct_field(pc.extract_regex(pc.utf8_trim_whitespace(text), r"^(?P<n>[0-9]+)"), "n")
+    codes, _ = pd.factorize(numbers.to_numpy(zero_copy_only=False))
+    return codes
+
+
+def _pair_miles(lat: np.ndarray, lon: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    lat1, lat2 = np.radians(lat[a]), np.radians(lat[b])
+    dlon = np.radians(lon[b] - lon[a])
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def block_pairs(keys: np.ndarray, rank: np.ndarray, max_block: int, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row pairs sharing a block key; rows with a negative key are in no block.
+
+    Blocks of at most ``max_block`` rows give all their pairs, larger ones
+    pair each row with the next ``window`` rows in ``rank`` order.
+    """
+    rows = np.flatnonzero(keys >= 0)
+    order = rows[np.lexsort((rank[rows], keys[rows]))]
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(order) else np.zeros(0, dtype=np.int64)
+    sizes = np.diff(np.r_[starts, len(order)])
+    pos = np.arange(len(order))
+    rest = np.repeat(starts + sizes, sizes) - pos - 1
+    reach = np.where(np.repeat(sizes, sizes) > max_block, np.minimum(rest, window), rest)
+    first = np.repeat(pos, reach)
+    step = np.arange(len(first)) - np.repeat(np.cumsum(reach) - reach, reach) + 1
+    return order[first], order[first + step]
+
+
+def _blocks(df: pd.DataFrame, lat: np.ndarray, lon: np.ndarray, cell: float) -> List[np.ndarray]:
+    """Block key per row for each blocking pass: four shifted grids, then ZIP."""
+    located = ~np.isnan(lat) & ~np.isnan(lon)
+    _, cols = grid_shape(cell)
+    passes = []
+    for shift_lat in (0.0, cell / 2):
+        for shift_lon in (0.0, cell / 2):
+            row, col = grid_cells(np.nan_to_num(lat) + shift_lat, np.nan_to_num(lon) + shift_lon, cell)
+            passes.append(np.where(located, row * (cols + 1) + col, -1))
+    zips = df["zip"].astype(object).where(df["zip"].notna(), "").astype(str).str.strip()
+    codes, _ = pd.factorize(zips.where(zips.str.fullmatch(r"\d{5}"), None))
+    passes.append(codes.astype(np.int64))
+    return passes
+
+
+def candidate_pairs(df: pd.DataFrame, config: dict, name_rank: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Distinct candidate pairs ``(a, b)`` with ``a < b``, and the pair count before de-duplication."""
+    lat = pd.to_numeric(df["latitude"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    lon = pd.to_numeric(df["longitude"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    found = [block_pairs(keys, name_rank, config["max_block"], config["window"]) for keys in _blocks(df, lat, lon, config["cell_degrees"])]
+    a = np.concatenate([p[0] for p in found]).astype(np.int64)
+    b = np.concatenate([p[1] for p in found]).astype(np.int64)
+    if config["cross_dataset"] and "source_dataset" in df.columns:
+        datasets, _ = pd.factorize(df["source_dataset"])
+        keep = datasets[a] != datasets[b]
+        a, b = a[keep], b[keep]
+    blocked = len(a)
+    codes = np.unique(np.minimum(a, b) * len(df) + np.maximum(a, b))
+    return codes // max(len(df), 1), codes % max(len(df), 1), blocked
+
+
+def components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Connected-component label (the smallest member row) of each of ``n`` rows."""
+    labels = np.arange(n)
+    while len(a):
+        low = np.minimum(labels[a], labels[b])
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        # Pointer jumping: every label is a row of the same component with a smaller label
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels[a], labels[b]):
+            break
+    return labels
+
+
+def find_duplicates(df: pd.DataFrame, config: dict | None = None, report: dict | None = None) -> pd.Series:
+    """``cluster_id`` of every row: the smallest ``record_id`` of its duplicate cluster.
+
+    Rows without duplicates are their own cluster. ``report`` receives the
+    pair and cluster counts.
+    """
+    config = {**DEFAULTS, **(config or {})}
+    stopwords = set(config["stopwords"])
+    abbreviations = dict(config["abbreviations"])
+    names = _tokens(df["listing_name"], stopwords, abbreviations)
+    addresses = _tokens(df["full_address"], stopwords, abbreviations)
+    name_rank, _ = pd.factorize(df["listing_name"].astype(object).fillna("").astype(str).str.lower(), sort=True)
+
+    a, b, blocked = candidate_pairs(df, config, name_rank)
+    lat = pd.to_numeric(df["latitude"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    lon = pd.to_numeric(df["longitude"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    name_score = jaccard(names, a, b)
+    near = name_score >= config["name_min"]
+    a, b = a[near], b[near]
+    close = _pair_miles(lat, lon, a, b) <= config["near_miles"]
+    # Most address tokens are the city, state and ZIP the block already shares:
+    # only addresses with the same house number are compared
+    numbers = _house_numbers(df["full_address"])
+    same_number = (numbers[a] == numbers[b]) & (numbers[a] >= 0)
+    match = close | (same_number & (jaccard(addresses, a, b) >= config["address_min"]))
+    a, b = a[match], b[match]
+
+    labels = components(len(df), a, b)
+    record_ids = df["record_id"].astype(object).to_numpy()
+    # Rows sorted by label then record_id: the first row of each label names the cluster
+    order = np.lexsort((record_ids.astype(str), labels))
+    first = np.r_[True, labels[order][1:] != labels[order][:-1]] if len(order) else np.zeros(0, dtype=bool)
+    named = np.empty(len(df), dtype=object)
+    named[labels[order][first]] = record_ids[order][first]
+    cluster_ids = pd.Series(named[labels], index=df.index, name="cluster_id", dtype=object)
+
+    if report is not None:
+        sizes = np.bincount(labels, minlength=len(df))
+        report.update(
+            candidate_pairs=int(blocked),
+            compared_pairs=int(len(near)),
+            duplicate_pairs=int(len(a)),
+            clusters=int((sizes > 1).sum()),
+            records_in_clusters=int(sizes[sizes > 1].sum()),
+        )
+    return cluster_ids
+
+
+def duplicate_clusters(df: pd.DataFrame, cluster_ids: pd.Series) -> pd.DataFrame:
+    """The rows in clusters of two or more, grouped by cluster (``duplicates.csv``)."""
+    sizes = cluster_ids.map(cluster_ids.value_counts())
+    keep = (sizes > 1).to_numpy()
+    columns = [c for c in ("record_id", "source_dataset", "listing_name", "full_address", "latitude", "longitude") if c in df.columns]
+    out = df.loc[keep, columns].copy()
+    out.insert(0, "cluster_size", sizes[keep].astype(int))
+    out.insert(0, "cluster_id", cluster_ids[keep])
+    out["record_id"] = out["record_id"].astype(object)
+    return out.sort_values(["cluster_id", "record_id"], kind="stable").reset_index(drop=True)
+
+
+def _joined(codes: np.ndarray, values: np.ndarray, groups: int, distinct: bool = False) -> np.ndarray:
+    """Sorted ``values`` of each group code (0..groups-1) joined with ``;``."""
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    if distinct and len(values):
+        keep = np.r_[True, (codes[1:] != codes[:-1]) | (values[1:] != values[:-1])]
+        codes, values = codes[keep], values[keep]
+    offsets = np.searchsorted(codes, np.arange(groups + 1)).astype(np.int32)
+    lists = pa.ListArray.from_arrays(offsets, pa.array(values, type=pa.string()))
+    return pc.binary_join(lists, ";").to_numpy(zero_copy_only=False)
+
+
+def canonical_records(df: pd.DataFrame, cluster_ids: pd.Series, priority: List[str] | None = None) -> pd.DataFrame:
+    """One record per cluster, in order of each cluster's first row.
+
+    Members are ranked by dataset ``priority`` (unlisted datasets last), then
+    by how many fields they fill, then by ``record_id``; each field comes from
+    the best-ranked member that has it, and boolean columns are true when any
+    member's is. ``cluster_size``, ``cluster_records`` and ``cluster_datasets``
+    describe the merge.
+    """
+    priority = list(priority or [])
+    datasets = df["source_dataset"].astype(str).to_numpy(dtype=object) if "source_dataset" in df.columns else np.full(len(df), "", dtype=object)
+    rank = pd.Series(datasets).map({key: i for i, key in enumerate(priority)}).fillna(len(priority)).to_numpy()
+    filled = df.notna().sum(axis=1).to_numpy()
+    record_ids = df["record_id"].astype(str).to_numpy(dtype=object)
+    # Cluster codes in order of first appearance
+    codes, keys = pd.factorize(cluster_ids.to_numpy(dtype=object))
+    sizes = np.bincount(codes, minlength=len(keys))
+    order = np.lexsort((record_ids, -filled, rank, codes))
+
+    ranked = df.iloc[order].set_axis(codes[order])
+    first = np.r_[True, codes[order][1:] != codes[order][:-1]] if len(order) else np.zeros(0, dtype=bool)
+    out = ranked[first]
+    multi = ranked[sizes[codes[order]] > 1]
+    if len(multi):
+        merged = multi.groupby(level=0, sort=False).first()
+        out = out.fillna(merged.reindex(columns=out.columns))
+        flags = [c for c in df.columns if pd.api.types.is_bool_dtype(df[c])]
+        if flags:
+            out.loc[merged.index, flags] = multi[flags].groupby(level=0, sort=False).any()
+
+    # Single-record clusters just describe their one record
+    records, names = record_ids[order][first].copy(), datasets[order][first].copy()
+    in_multi = np.flatnonzero(sizes > 1)
+    members = sizes[codes] > 1
+    records[in_multi] = _joined(codes[members], record_ids[members], len(keys))[in_multi]
+    names[in_multi] = _joined(codes[members], datasets[members], len(keys), distinct=True)[in_multi]
+    out.insert(0, "cluster_datasets", names)
+    out.insert(0, "cluster_records", records)
+    out.insert(0, "cluster_size", sizes)
+    out.insert(0, "cluster_id", keys)
+    return out.reset_index(drop=True)
+
+__all__ = ["block_pairs", "canonical_records", "duplicate_clusters", "find_duplicates", "jaccard", "load_config"]
@@ -9,7 +9,14 @@ from __future__ import annotations
 import re
 from typing import Iterable, Tuple, Dict
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ingest.scripts import arrow_backend
+from ingest.scripts.centroids import compute_centroids, zip_means
+from ingest.scripts.profiling import stage
 
 STATE_MAP = {
     'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
@@ -30,6 +37,46 @@ STATE_MAP = {
 }
 
 ZIP_RE = re.compile(r"(\d{5})(?:-\d{4})?$")
+ZIP_ANY_RE = re.compile(r"(\d{5})(?:-\d{4})?")
+COUNTRY_RE = re.compile(r",?\s*(?:usa|u\.?s\.?a?|u\.?s\.?|united states(?: of america)?)\s*$", re.IGNORECASE)
+
+# Full names and abbreviations, longest first so "west virginia" wins over "virginia"
+STATE_TOKENS = sorted(
+    {**STATE_MAP, **{abbr.lower(): abbr for abbr in STATE_MAP.values()}}.items(),
+    key=lambda kv: -len(kv[0]),
+)
+
+# RE2 patterns for parse_addresses(). They mirror the scalar parser on ASCII text;
+# \s and \d are spelled out because RE2 classes differ from Python's.
+_WS = " \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f"
+_ZIP_TAIL_PATTERN = r"(?P<zip>[0-9]{5})(?P<plus4>-[0-9]{4})?$"
+# Last non-overlapping ZIP match, i.e. the final hit of ZIP_ANY_RE.finditer()
+_ZIP_LAST_PATTERN = (
+    r"(?s)^(?P<head>(?:[0-9]{5}(?:-[0-9]{4})?|.)*?)(?P<zip>[0-9]{5})(?:-[0-9]{4})?"
+    r"[^0-9]*(?:[0-9]{1,4}[^0-9]+)*[0-9]{0,4}$"
+)
+_COUNTRY_PATTERN = "(?i)" + COUNTRY_RE.pattern.replace(r"\s", f"[{_WS}]")
+# State tokens grouped by length, longest first, for suffix lookups
+_STATE_BY_LENGTH = [
+    (length, pa.array([t for t, _ in STATE_TOKENS if len(t) == length]),
+     np.array([a for t, a in STATE_TOKENS if len(t) == length], dtype=object))
+    for length in sorted({len(t) for t, _ in STATE_TOKENS}, reverse=True)
+]
+# Two-letter endings of the longer tokens; other rows can only match an abbreviation
+_LONG_STATE_ENDINGS = pa.array(sorted({t[-2:] for t, _ in STATE_TOKENS if len(t) > 2}))
+_THREE_WORDS = f"[^{_WS}][{_WS}]+[^{_WS}]+[{_WS}]+[^{_WS}]"
+
+HAYSTACK_COLUMNS = [
+    'listing_name',
+    'organization',
+    'street',
+    'city',
+    'state',
+    'zip',
+    'location_desc',
+    'listing_desc',
+    'listing_type_label',
+]
 
 
 def _normalize_text(value: str | None) -> str:
@@ -69,20 +116,19 @@ def _parse_address(raw: str | None) -> Tuple[str | None, str | None, str | None,
     zipcode = None
     zip_match = ZIP_RE.search(cleaned)
     if not zip_match:
-        matches = list(re.finditer(r"(\d{5})(?:-\d{4})?", cleaned))
+        matches = list(ZIP_ANY_RE.finditer(cleaned))
         zip_match = matches[-1] if matches else None
     if zip_match:
         zipcode = zip_match.group(1)
         cleaned = cleaned[:zip_match.start()].rstrip(', ')
 
-    cleaned = re.sub(r",?\s*(?:usa|u\.?s\.?a?|u\.?s\.?|united states(?: of america)?)\s*$", "", cleaned, flags=re.IGNORECASE)
+    cleaned = COUNTRY_RE.sub("", cleaned)
     cleaned = cleaned.rstrip(', ')
 
     state = None
     if cleaned:
         lowered = cleaned.lower()
-        tokens = sorted({**STATE_MAP, **{abbr.lower(): abbr for abbr in STATE_MAP.values()}}.items(), key=lambda kv: -len(kv[0]))
-        for token, normalized in tokens:
+        for token, normalized in STATE_TOKENS:
             if lowered.endswith(token):
                 state = normalized if len(normalized) == 2 else STATE_MAP.get(normalized, normalized)
                 cleaned = cleaned[: -len(token)].rstrip(', ')
@@ -114,146 +160,347 @@ def _parse_address(raw: str | None) -> Tuple[str | None, str | None, str | None,
     return street, city, state, zipcode
 
 
+def _none_if_empty(values: np.ndarray) -> np.ndarray:
+    values[values == ''] = None
+    return values
+
+
+def _to_numpy(arr: pa.Array) -> np.ndarray:
+    return arr.to_numpy(zero_copy_only=False)
+
+
+# The kernels below assume plain-ASCII input, where bytes and characters coincide
+def _rstrip(arr: pa.Array) -> pa.Array:
+    return pc.ascii_rtrim(arr, characters=', ')
+
+
+def _strip(arr: pa.Array) -> pa.Array:
+    return pc.ascii_trim(arr, characters=_WS)
+
+
+def _ascii_tail(arr: pa.Array, length: int) -> pa.Array:
+    return pc.binary_slice(arr.cast(pa.binary()), -length).cast(pa.string())
+
+
+def _ascii_drop_suffix(arr: pa.Array, lengths: np.ndarray) -> pa.Array:
+    """Drop ``lengths[i]`` trailing characters from each value of a null-free ASCII array."""
+    n = len(arr)
+    offsets = np.frombuffer(arr.buffers()[1], dtype=np.int32)[arr.offset: arr.offset + n + 1]
+    data = np.frombuffer(arr.buffers()[2], dtype=np.uint8) if offsets[-1] else np.empty(0, np.uint8)
+    sizes = np.diff(offsets) - lengths
+    new_offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(sizes, out=new_offsets[1:])
+    # Gather the kept bytes of every value into one contiguous buffer
+    index = np.arange(new_offsets[-1], dtype=np.int32) + np.repeat(offsets[:-1] - new_offsets[:-1], sizes)
+    return pa.StringArray.from_buffers(n, pa.py_buffer(new_offsets), pa.py_buffer(data[index]))
+
+
+def _rsplit_once(arr: pa.Array, sep: str) -> Tuple[pa.Array, pa.Array]:
+    parts = pc.split_pattern(arr, sep, max_splits=1, reverse=True)
+    return pc.list_element(parts, 0), pc.list_element(parts, 1)
+
+
+def parse_addresses(values: pd.Series) -> pd.DataFrame:
+    """Vectorized ``_parse_address`` over a Series.
+
+    Plain-ASCII addresses go through Arrow compute kernels; anything else falls
+    back to the scalar parser. Returns an object-dtype frame of street/city/
+    state/zip (None for missing parts) identical to applying ``_parse_address``.
+    """
+    n = len(values)
+    raw = values.to_numpy(dtype=object)
+
+    # _maybe(): None/NaN become "", anything else (including pd.NA) goes through str()
+    filled = raw.copy()
+    missing = np.flatnonzero(pd.isna(raw))
+    blank = [i for i in missing if raw[i] is None or isinstance(raw[i], float)]
+    filled[blank] = ''
+    text_arr = pa.array(filled.astype(str), type=pa.string())
+    # Stripping before or after the NBSP swap is equivalent since both are whitespace
+    text_arr = pc.utf8_trim(pc.replace_substring(text_arr, '\xa0', ' '), characters=_WS)
+
+    fast = _to_numpy(pc.string_is_ascii(text_arr))
+    rows = np.flatnonzero(fast & (_to_numpy(pc.binary_length(text_arr)) > 0))
+
+    street = np.full(n, None, dtype=object)
+    city = np.full(n, None, dtype=object)
+    state = np.full(n, None, dtype=object)
+    zipcode = np.full(n, None, dtype=object)
+
+    if len(rows):
+        text = text_arr.take(pa.array(rows)) if len(rows) < n else text_arr
+        cleaned = _strip(pc.replace_substring(text, ';', ','))
+        size = _to_numpy(pc.binary_length(cleaned))
+
+        # ZIP: a trailing match wins, otherwise the last match anywhere in the string.
+        # A trailing ZIP fits in the last 10 characters; search's leftmost start
+        # prefers the ZIP+4 form just like ZIP_RE.
+        tail = pc.extract_regex(_ascii_tail(cleaned, 10), _ZIP_TAIL_PATTERN)
+        sub_zip = _to_numpy(pc.struct_field(tail, 'zip'))
+        has_zip = _to_numpy(pc.is_valid(pc.struct_field(tail, 'zip')))
+        # Arrow reports a non-participating group as "" rather than null
+        plus4 = _to_numpy(pc.binary_length(pc.struct_field(tail, 'plus4')))
+        cut = np.where(has_zip, np.where(plus4 == 5, 10, 5), 0)
+        no_tail = np.flatnonzero(~has_zip)
+        if len(no_tail):
+            # Only strings with a five-digit run can match anywhere
+            no_tail = no_tail[_to_numpy(pc.match_substring_regex(cleaned.take(pa.array(no_tail)), '[0-9]{5}'))]
+        if len(no_tail):
+            last = pc.extract_regex(cleaned.take(pa.array(no_tail)), _ZIP_LAST_PATTERN)
+            found = _to_numpy(pc.is_valid(last))
+            hits = no_tail[found]
+            sub_zip[hits] = _to_numpy(pc.struct_field(last, 'zip'))[found]
+            head_size = _to_numpy(pc.binary_length(pc.struct_field(last, 'head')))[found]
+            cut[hits] = size[hits] - head_size
+            has_zip[hits] = True
+        cleaned = pc.if_else(pa.array(has_zip), _rstrip(_ascii_drop_suffix(cleaned, cut)), cleaned)
+
+        cleaned = _rstrip(pc.replace_substring_regex(cleaned, _COUNTRY_PATTERN, ''))
+
+        # State: longest full name or abbreviation the string ends with
+        ending = pc.ascii_lower(_ascii_tail(cleaned, _STATE_BY_LENGTH[0][0]))
+        sub_state = np.full(len(rows), None, dtype=object)
+        token_len = np.zeros(len(rows), dtype=np.int32)
+        candidates = np.flatnonzero(_to_numpy(pc.is_in(_ascii_tail(ending, 2), value_set=_LONG_STATE_ENDINGS)))
+        long_ending = ending.take(pa.array(candidates))
+        for length, tokens, abbrs in _STATE_BY_LENGTH:
+            subset = long_ending if length > 2 else ending
+            positions = candidates if length > 2 else np.arange(len(rows))
+            found = pc.index_in(_ascii_tail(subset, length), value_set=tokens)
+            hit = _to_numpy(pc.is_valid(found))
+            hit &= token_len[positions] == 0
+            if hit.any():
+                sub_state[positions[hit]] = abbrs[_to_numpy(found)[hit].astype(np.int64)]
+                token_len[positions[hit]] = length
+        has_state = token_len > 0
+        if has_state.any():
+            cleaned = pc.if_else(pa.array(has_state), _rstrip(_ascii_drop_suffix(cleaned, token_len)), cleaned)
+
+        located = has_state | has_zip
+        has_cleaned = _to_numpy(pc.binary_length(cleaned)) > 0
+        split = located & has_cleaned & _to_numpy(pc.match_substring_regex(cleaned, _THREE_WORDS))
+        has_comma = _to_numpy(pc.match_substring(cleaned, ','))
+        has_space = _to_numpy(pc.match_substring(cleaned, ' '))
+        comma = split & has_comma
+        space = split & ~has_comma & has_space
+        bare = split & ~has_comma & ~has_space
+
+        # Nothing recognisable, or too short to split: keep the original text as street
+        sub_street = np.where(split, None, _to_numpy(text)).astype(object)
+        sub_city = np.full(len(rows), None, dtype=object)
+        if comma.any():
+            left, right = _rsplit_once(cleaned.filter(pa.array(comma)), ',')
+            sub_street[comma] = _none_if_empty(_to_numpy(_strip(left)))
+            sub_city[comma] = _none_if_empty(_to_numpy(_strip(right)))
+        if space.any():
+            left, right = _rsplit_once(cleaned.filter(pa.array(space)), ' ')
+            sub_street[space] = _none_if_empty(_to_numpy(_strip(left)))
+            sub_city[space] = _to_numpy(right)
+        if bare.any():
+            sub_city[bare] = _to_numpy(cleaned.filter(pa.array(bare)))
+        unsplit = split & np.equal(sub_street, None) & np.equal(sub_city, None)
+        if unsplit.any():
+            sub_street[unsplit] = _to_numpy(cleaned.filter(pa.array(unsplit)))
+
+        sub_state[~located] = None
+        sub_zip[~located] = None
+
+        street[rows] = sub_street
+        city[rows] = sub_city
+        state[rows] = sub_state
+        zipcode[rows] = sub_zip
+
+    # Non-ASCII text keeps Python's Unicode-aware semantics via the scalar parser
+    for i in np.flatnonzero(~fast):
+        street[i], city[i], state[i], zipcode[i] = _parse_address(raw[i])
+
+    return pd.DataFrame({'street': street, 'city': city, 'state': state, 'zip': zipcode}, index=values.index)
+
+
 def _join_address(street: str | None, city: str | None, state: str | None, zipcode: str | None) -> str:
     pieces: Iterable[str] = [p for p in (street, city, state, zipcode) if p]
     return ', '.join(pieces)
 
 
-def _zip_means(df: pd.DataFrame) -> pd.DataFrame:
-    coords = df[['zip', 'latitude', 'longitude']].copy()
-    coords['latitude'] = pd.to_numeric(coords['latitude'], errors='coerce')
-    coords['longitude'] = pd.to_numeric(coords['longitude'], errors='coerce')
-    coords = coords.dropna(subset=['zip', 'latitude', 'longitude'])
-    if coords.empty:
-        return pd.DataFrame(columns=['zip_lat', 'zip_lon'])
-    means = coords.groupby('zip')[['latitude', 'longitude']].mean()
-    means.columns = ['zip_lat', 'zip_lon']
-    return means
-
+def _full_addresses(df: pd.DataFrame) -> np.ndarray:
+    """Columnar ``_join_address``, falling back to the stripped raw location_address."""
+    joined = np.full(len(df), '', dtype=object)
+    for col in ('street', 'city', 'state', 'zip'):
+        values = df[col].to_numpy(dtype=object)
+        values = np.where(pd.notna(values), values, '')
+        both = (joined != '') & (values != '')
+        joined = np.where(both, joined + ', ' + values, joined + values)
+    empty = np.flatnonzero(joined == '')
+    if len(empty):
+        raw = df['location_address'].to_numpy(dtype=object)
+        joined[empty] = [_maybe(raw[i]) for i in empty]
+    return joined
+
+
+def _text_values(series: pd.Series) -> np.ndarray:
+    # Categorical columns (low-memory runs) can't be filled with a category they lack
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    return series.fillna('').astype(str).to_numpy(dtype=object)
+
+
+def _search_haystack(df: pd.DataFrame, columns: Iterable[str] = HAYSTACK_COLUMNS) -> np.ndarray:
+    """Space-joined, lowercased, whitespace-collapsed text of ``columns``.
+
+    Empty parts only add whitespace, which the collapse removes, so joining every
+    column unconditionally matches joining the non-empty ones.
+    """
+    parts = [
+        pa.array(_text_values(df[col]), type=pa.string())
+        if col in df.columns else pa.array([''] * len(df), type=pa.string())
+        for col in columns
+    ]
+    joined = pc.binary_join_element_wise(*parts, ' ')
+    # Arrow's ASCII whitespace lacks the \x1c-\x1f separators Python treats as
+    # whitespace, so those rows join the non-ASCII ones on the Python path
+    fallback = ~_to_numpy(pc.string_is_ascii(joined)) | _to_numpy(pc.match_substring_regex(joined, '[\x1c-\x1f]'))
+    words = pc.ascii_split_whitespace(pc.ascii_lower(joined))
+    haystack = _to_numpy(pc.ascii_trim(pc.binary_join(words, ' '), characters=' '))
+    if fallback.any():
+        haystack[fallback] = [' '.join(text.lower().split()) for text in joined.filter(pa.array(fallback)).to_pylist()]
+    return haystack
+
+
+def search_tokens(haystack: pd.Series) -> pd.Series:
+    """Normalized, de-duplicated tokens per record, in first-seen order.
+
+    Tokens follow the map's own normalization (lowercase, punctuation to spaces),
+    so matching a search term against the joined tokens behaves like matching
+    against the full haystack.
+    """
+    return pd.Series(
+        [list(dict.fromkeys(_normalize_text(text).split())) for text in haystack.fillna('')],
+        index=haystack.index,
+        dtype=object,
+    )
 
-def enrich_markets(df: pd.DataFrame) -> pd.DataFrame:
-    """Add normalized address, search helpers, and per-ZIP centroids."""
-    df = df.copy()
 
-    parsed = df['location_address'].apply(_parse_address)
-    df[['street', 'city', 'state', 'zip']] = pd.DataFrame(parsed.tolist(), index=df.index)
+def _extract_zip(value: str) -> str:
+    match = re.search(r'\d{5}', value)
+    return match.group(0) if match else ''
 
-    zip_series = df['zip'].fillna('').astype(str)
-    zip_series = zip_series.str.extract(r'(\d{5})')[0].fillna('')
-    df['zip'] = zip_series
 
-    df['full_address'] = df.apply(
-        lambda r: _join_address(r.get('street'), r.get('city'), r.get('state'), r.get('zip'))
-        or _maybe(r.get('location_address')),
-        axis=1,
+def _zip_codes_arrow(values: pd.Series) -> pd.Series:
+    """First five-digit run of each value, or ''; Python's ``\\d`` also matches non-ASCII digits."""
+    arr = pc.fill_null(arrow_backend.to_arrow(values).cast(pa.string()), '')
+    zips = arrow_backend.with_fallback(
+        arr,
+        lambda a: pc.fill_null(pc.struct_field(pc.extract_regex(a, '(?P<zip>[0-9]{5})'), [0]), ''),
+        _extract_zip,
+        whitespace=False,
     )
+    return arrow_backend.string_series(zips, values.index)
+
+
+def _normalize_ascii(arr: pa.Array) -> pa.Array:
+    """``_normalize_text`` for ASCII values."""
+    arr = pc.replace_substring_regex(pc.ascii_lower(arr), f'[^a-z0-9{_WS}]', ' ')
+    arr = pc.replace_substring_regex(arr, f'[{_WS}]+', ' ')
+    return pc.ascii_trim(arr, characters=' ')
+
+
+def _search_columns_arrow(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """The ``search_*`` columns of ``enrich_rows`` computed with ``pyarrow.compute``."""
+    with_fallback = arrow_backend.with_fallback
+    city = pc.fill_null(arrow_backend.to_arrow(df['city']).cast(pa.string()), '')
+    state = pc.fill_null(arrow_backend.to_arrow(df['state']).cast(pa.string()), '')
+    search_city = with_fallback(city, pc.ascii_lower, str.lower, whitespace=False)
+    search_state = with_fallback(state, pc.ascii_upper, str.upper, whitespace=False)
+    columns = {
+        'search_city': search_city,
+        'search_state': search_state,
+        # zip is five digits or '', which strip() leaves unchanged
+        'search_zip': arrow_backend.to_arrow(df['zip']).cast(pa.string()),
+        'search_city_norm': with_fallback(search_city, _normalize_ascii, _normalize_text),
+        'search_state_norm': with_fallback(
+            search_state,
+            lambda a: pc.ascii_upper(pc.ascii_trim(a, characters=_WS)),
+            lambda s: s.strip().upper(),
+        ),
+    }
+    return {name: arrow_backend.string_series(arr, df.index) for name, arr in columns.items()}
+
+
+def enrich_rows(df: pd.DataFrame, copy: bool = True, backend: str = 'pandas') -> pd.DataFrame:
+    """Row-local part of ``enrich_markets``: address parsing and search helpers.
+
+    ``backend='arrow'`` derives ZIP codes and the search columns with
+    ``pyarrow.compute`` (as ``string[pyarrow]``); the values are the same.
+    """
+    arrow = arrow_backend.check_backend(backend) == 'arrow'
+    if copy:
+        df = df.copy()
+
+    with stage('enrich:parse_addresses', rows_in=len(df)):
+        df[['street', 'city', 'state', 'zip']] = parse_addresses(df['location_address'])
+
+    if arrow:
+        df['zip'] = _zip_codes_arrow(df['zip'])
+    else:
+        zip_series = df['zip'].fillna('').astype(str)
+        zip_series = zip_series.str.extract(r'(\d{5})')[0].fillna('')
+        df['zip'] = zip_series
+
+    df['full_address'] = _full_addresses(df)
+
+    if arrow:
+        for name, values in _search_columns_arrow(df).items():
+            df[name] = values
+    else:
+        df['search_city'] = df['city'].fillna('').str.lower()
+        df['search_state'] = df['state'].fillna('').str.upper()
+        df['search_zip'] = df['zip'].fillna('').str.strip()
+        df['search_city_norm'] = df['search_city'].apply(_normalize_text)
+        df['search_state_norm'] = df['search_state'].apply(lambda s: s.strip().upper())
+
+    with stage('enrich:search_haystack', rows_in=len(df)):
+        df['search_haystack'] = _search_haystack(df)
 
-    df['search_city'] = df['city'].fillna('').str.lower()
-    df['search_state'] = df['state'].fillna('').str.upper()
-    df['search_zip'] = df['zip'].fillna('').str.strip()
-    df['search_city_norm'] = df['search_city'].apply(_normalize_text)
-    df['search_state_norm'] = df['search_state'].apply(lambda s: s.strip().upper())
-
-    means = _zip_means(df)
-    df = df.join(means, on='zip')
-
-    haystack_columns = [
-        'listing_name',
-        'organization',
-        'street',
-        'city',
-        'state',
-        'zip',
-        'location_desc',
-        'listing_desc',
-        'listing_type_label',
-    ]
-    haystack_sources = pd.concat(
-        [df.get(col, pd.Series('', index=df.index)) for col in haystack_columns],
-        axis=1,
-    ).fillna('').astype(str)
+    return df
 
-    df['search_haystack'] = haystack_sources.apply(lambda parts: ' '.join(p for p in parts if p), axis=1)
-    df['search_haystack'] = df['search_haystack'].str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
 
+def with_zip_means(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """(Re)attach per-ZIP mean coordinates; they depend on every row sharing the ZIP."""
+    with stage('enrich:zip_means', rows_in=len(df)) as record:
+        means = zip_means(df)
+        record['rows_out'] = len(means)
+    means = means.reindex(df['zip'])
+    stale = [c for c in ('zip_lat', 'zip_lon') if c in df.columns]
+    if copy:
+        df = df.drop(columns=stale)
+    elif stale:
+        df.drop(columns=stale, inplace=True)
+    # Keep the historical column order: ZIP means come before the haystack
+    pos = df.columns.get_loc('search_haystack') if 'search_haystack' in df.columns else len(df.columns)
+    df.insert(pos, 'zip_lat', means['zip_lat'].to_numpy())
+    df.insert(pos + 1, 'zip_lon', means['zip_lon'].to_numpy())
     return df
 
 
+def enrich_markets(df: pd.DataFrame, copy: bool = True, backend: str = 'pandas') -> pd.DataFrame:
+    """Add normalized address, search helpers, and per-ZIP centroids.
+
+    ``copy=False`` adds the columns to ``df`` itself (low-memory runs).
+    """
+    return with_zip_means(enrich_rows(df, copy=copy, backend=backend), copy=False)
+
+
 def generate_zip_centroids(df: pd.DataFrame) -> dict[str, list[float]]:
-    """Generate zip and zip-prefix centroids from a validated markets DataFrame."""
-    centroids: dict[str, list[float]] = {}
-    coords = df[['zip', 'zip_lat', 'zip_lon']].dropna(subset=['zip_lat', 'zip_lon'])
-    for zip_code, group in coords.groupby('zip'):
-        try:
-            lat = float(group['zip_lat'].mean())
-            lon = float(group['zip_lon'].mean())
-        except Exception:
-            continue
-        if not zip_code:
-            continue
-        zip_str = str(zip_code).strip()
-        if zip_str:
-            centroids[zip_str] = [lat, lon]
-
-    if not centroids:
-        return centroids
-
-    # Prefix centroids (3-digit) provide fallbacks for ZIPs not present in the dataset
-    prefix_frame = coords.copy()
-    prefix_frame['prefix'] = prefix_frame['zip'].astype(str).str[:3]
-    prefix_means = prefix_frame.groupby('prefix')[['zip_lat', 'zip_lon']].mean()
-    for prefix, row in prefix_means.iterrows():
-        if not prefix:
-            continue
-        if prefix not in centroids:
-            centroids[prefix] = [float(row['zip_lat']), float(row['zip_lon'])]
-
-    return centroids
+    """Generate zip and zip-prefix centroids from a validated markets DataFrame.
+
+    Use ``compute_centroids`` directly when the city centroids are needed too.
+    """
+    return compute_centroids(df).zip_centroids()
 
 
 def generate_city_centroids(df: pd.DataFrame) -> Dict[str, list[float]]:
     """Average market coordinates per normalized city/state grouping."""
-    city_data = df[['search_city_norm', 'search_state_norm', 'latitude', 'longitude']].copy()
-    city_data['latitude'] = pd.to_numeric(city_data['latitude'], errors='coerce')
-    city_data['longitude'] = pd.to_numeric(city_data['longitude'], errors='coerce')
-    city_data = city_data.dropna(subset=['search_city_norm', 'latitude', 'longitude'])
-    if city_data.empty:
-        return {}
-
-    grouped = city_data.groupby(['search_city_norm', 'search_state_norm'])[['latitude', 'longitude']].mean()
-    counts = city_data.groupby(['search_city_norm', 'search_state_norm']).size()
-
-    centroids: Dict[str, list[float]] = {}
-    city_totals: Dict[str, tuple[float, float, int]] = {}
-    city_states: Dict[str, set[str]] = {}
-
-    for (city_norm, state_norm), row in grouped.iterrows():
-        lat = float(row['latitude'])
-        lon = float(row['longitude'])
-        state_key = state_norm or ''
-        if city_norm:
-            city_states.setdefault(city_norm, set()).add(state_key or '')
-            key = f"{city_norm}|{state_key}" if state_key else city_norm
-            centroids[key] = [lat, lon]
-
-            # Track overall city fallback keyed without state
-            total_lat, total_lon, total_count = city_totals.get(city_norm, (0.0, 0.0, 0))
-            count = int(counts.loc[(city_norm, state_norm)])
-            city_totals[city_norm] = (total_lat + lat * count, total_lon + lon * count, total_count + count)
-
-    for city_norm, (lat_sum, lon_sum, total_count) in city_totals.items():
-        if total_count <= 0:
-            continue
-        avg_lat = lat_sum / total_count
-        avg_lon = lon_sum / total_count
-        state_variants = city_states.get(city_norm, set()) or {''}
-        # Only provide a fallback centroid when the city appears in a single state
-        non_empty_states = {s for s in state_variants if s}
-        allow_fallback = len(non_empty_states) <= 1
-        if allow_fallback:
-            centroids.setdefault(city_norm, [avg_lat, avg_lon])
-
-    return centroids
-
-
-__all__ = ['enrich_markets', 'generate_zip_centroids', 'generate_city_centroids']
+    return compute_centroids(df).city_centroids()
+
+
+__all__ = ['enrich_markets', 'enrich_rows', 'with_zip_means', 'parse_addresses', 'search_tokens', 'generate_zip_centroids', 'generate_city_centroids']
@@ -1,41 +1,256 @@
 # File: ingest/scripts/export_artifacts.py
 from __future__ import annotations
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from hashlib import sha256
+from typing import Collection, Dict, List, Optional, Tuple
 from pathlib import Path
 import json
+import os
+import time
 import yaml
 import pandas as pd
 
+from ingest.scripts import columnar, tiles
+from ingest.scripts.enrich import search_tokens
+from ingest.scripts.json_writer import CHUNK_ROWS, RecordSink, write_ndjson_records, write_json_records, write_record_files
+from ingest.scripts.profiling import Profiler, stage
+from ingest.scripts.search_index import MIN_PREFIX, build_index
+from ingest.scripts.spatial_index import CELL_DEGREES, GridIndex
+
+ROW_FORMATS = ("json", "ndjson")
+
+
 def _ensure_parent(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
 
-def export_from_profile(df: pd.DataFrame, profile_path: str) -> Dict[str, str]:
+def plain_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Categoricals from low-memory runs as plain columns, so written files don't change."""
+    categorical = [c for c in data.columns if isinstance(data[c].dtype, pd.CategoricalDtype)]
+    return data.astype({c: object for c in categorical}) if categorical else data
+
+def _row_format(spec: dict) -> Optional[str]:
+    """``json``/``ndjson`` for record-per-row profiles, None for everything else."""
+    fmt = spec.get("format")
+    suffix = Path(spec["path"]).suffix
+    if fmt in ("tiles", "token_index", "spatial_index", "columnar"):
+        return None
+    if fmt == "ndjson" or suffix == ".ndjson":
+        return "ndjson"
+    return "json" if suffix == ".json" else None
+
+def _uses_tokens(spec: dict) -> bool:
+    return bool(spec.get("search_tokens"))
+
+def _profile_fields(columns: List[str], spec: dict) -> List[str]:
+    fields = spec["fields"]
+    keep = list(columns) if fields == ["*"] else [f for f in fields if f in columns]
+    if _uses_tokens(spec) and "search_haystack" in keep:
+        # Ship de-duplicated tokens in place of the raw haystack string
+        keep[keep.index("search_haystack")] = "search_tokens"
+    return keep
+
+def plan_exports(df: pd.DataFrame, profiles: Dict[str, dict]) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
+    """Materialize the columns every profile needs once; returns ``(frame, fields per profile)``.
+
+    Derived columns (``search_tokens``) are computed once for all profiles
+    that ask for them.
+    """
+    columns = [str(c) for c in df.columns]
+    fields = {name: _profile_fields(columns, spec) for name, spec in profiles.items()}
+    needed = list(dict.fromkeys(f for keep in fields.values() for f in keep if f in df.columns))
+    frame = df if needed == list(df.columns) else _project(df, needed)
+    if any(_uses_tokens(profiles[name]) and "search_tokens" in keep for name, keep in fields.items()):
+        if frame is df:
+            frame = _project(df, needed)
+        frame["search_tokens"] = search_tokens(df["search_haystack"])
+    return frame, fields
+
+def load_profiles(profile_path: str) -> Dict[str, dict]:
     with open(profile_path, "r", encoding="utf-8") as f:
-        profiles = yaml.safe_load(f)
+        return yaml.safe_load(f)
 
-    shas = {}
+def profile_digests(df: pd.DataFrame, profile_path: str) -> Dict[str, str]:
+    """Digest of each profile's spec and input columns: equal digests mean an identical artifact."""
+    profiles = load_profiles(profile_path)
+    digests = {}
     for name, spec in profiles.items():
-        path = Path(spec["path"])
         fields = spec["fields"]
+        keep = list(df.columns) if fields == ["*"] else [f for f in fields if f in df.columns]
+        h = sha256(json.dumps(spec, sort_keys=True, default=str).encode("utf-8"))
+        for field in keep:
+            h.update(f"\0{field}:{df[field].dtype}".encode("utf-8"))
+            h.update(pd.util.hash_pandas_object(df[field], index=False).to_numpy().tobytes())
+        digests[name] = h.hexdigest()
+    return digests
 
-        _ensure_parent(path)
+def _project(frame: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
+    # A new frame over the same column arrays: no copy, and no pandas caches
+    # shared between threads
+    return pd.DataFrame({f: frame[f] for f in fields}, columns=fields, copy=False)
 
-        if fields == ["*"]:
-            data = df
-        else:
-            keep = [f for f in fields if f in df.columns]
-            data = df[keep]
-
-        if path.suffix == ".json":
-            # Write JSON (minified for web)
-            with open(path, "w", encoding="utf-8") as out:
-                json.dump(json.loads(data.to_json(orient="records")), out, ensure_ascii=False, separators=(",", ":"))
-        elif path.suffix == ".parquet":
-            data.to_parquet(path, index=False)
+def _output_bytes(path: Path, spec: dict) -> int:
+    if spec.get("format") == "tiles":
+        # Every tile plus the index
+        return sum(p.stat().st_size for p in path.parent.glob("*.json"))
+    return path.stat().st_size if path.exists() else 0
+
+def _export_profile(data: pd.DataFrame, name: str, spec: dict, sizes: Optional[Dict[str, dict]]) -> Path:
+    """Write one profile from its already projected columns and return the path it wrote."""
+    path = Path(spec["path"])
+    fmt = spec.get("format")
+
+    _ensure_parent(path)
+
+    if fmt == "tiles":
+        # Directory of per-tile JSON files plus index.json
+        tiling = spec.get("tiling") or {}
+        path = tiles.write_tiles(data, path, tiling.get("scheme", "grid"), tiling.get("precision", 1.0))
+    elif fmt == "token_index":
+        # Inverted index over the listed fields, addressed by row ordinal
+        id_field = spec.get("id_field", "record_id")
+        columns = [f for f in data.columns if f != id_field]
+        index = build_index(data, columns, id_field, spec.get("min_prefix", MIN_PREFIX))
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(index, out, ensure_ascii=False, separators=(",", ":"))
+    elif fmt == "spatial_index":
+        # Per-cell market ordinals for radius queries
+        grid = GridIndex(data["latitude"], data["longitude"], spec.get("cell_degrees", CELL_DEGREES))
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(grid.to_artifact(), out, separators=(",", ":"))
+    elif fmt == "columnar":
+        chunk_rows = spec.get("chunk_rows", CHUNK_ROWS)
+        payload = columnar.dumps(columnar.encode_columnar(data, spec.get("max_dictionary", columnar.MAX_DICTIONARY), chunk_rows))
+        with open(path, "w", encoding="utf-8") as out:
+            out.write(payload)
+        if sizes is not None:
+            encoded = len(payload.encode("utf-8"))
+            # Streamed through the row writer rather than materializing every record
+            row_bytes = columnar.row_bytes(data, chunk_rows)
+            sizes[name] = {
+                "format": "columnar",
+                "bytes": encoded,
+                "row_bytes": row_bytes,
+                "ratio": round(encoded / row_bytes, 3) if row_bytes else None,
+            }
+    elif fmt == "ndjson" or path.suffix == ".ndjson":
+        # One record per line for line-oriented consumers
+        with open(path, "w", encoding="utf-8") as out:
+            write_ndjson_records(data, out, spec.get("chunk_rows", CHUNK_ROWS))
+    elif path.suffix == ".json":
+        # Write JSON (minified for web), streamed in chunks of records
+        with open(path, "w", encoding="utf-8") as out:
+            write_json_records(data, out, spec.get("chunk_rows", CHUNK_ROWS))
+    elif path.suffix == ".parquet":
+        plain_columns(data).to_parquet(path, index=False)
+    else:
+        # Default to CSV
+        data.to_csv(path, index=False)
+
+    return path
+
+def _write_rows(
+    frame: pd.DataFrame,
+    names: List[str],
+    profiles: Dict[str, dict],
+    fields: Dict[str, List[str]],
+) -> Dict[str, dict]:
+    """All record-per-row profiles in one pass over the shared column conversion."""
+    sinks = {}
+    with ExitStack() as files:
+        for name in names:
+            path = Path(profiles[name]["path"])
+            _ensure_parent(path)
+            out = files.enter_context(open(path, "w", encoding="utf-8"))
+            sinks[name] = RecordSink(out, fields[name], ndjson=_row_format(profiles[name]) == "ndjson")
+        chunk_rows = min(profiles[name].get("chunk_rows", CHUNK_ROWS) for name in names)
+        shared = write_record_files(frame, list(sinks.values()), chunk_rows)
+    return {
+        name: {"path": Path(profiles[name]["path"]), "seconds": sink.seconds, "cpu_s": None, "shared_seconds": shared}
+        for name, sink in sinks.items()
+    }
+
+def _write_one(data: pd.DataFrame, name: str, spec: dict, sizes: Optional[Dict[str, dict]]) -> Dict[str, dict]:
+    wall, cpu = time.perf_counter(), time.thread_time()
+    path = _export_profile(data, name, spec, sizes)
+    return {name: {"path": path, "seconds": time.perf_counter() - wall, "cpu_s": time.thread_time() - cpu}}
+
+def _record_stages(report: Dict[str, dict], rows: int) -> None:
+    profiler = Profiler.active()
+    if profiler is None:
+        return
+    shared = next((r["shared_seconds"] for r in report.values() if "shared_seconds" in r), None)
+    records = []
+    if shared is not None:
+        records.append({"stage": "export:row_columns", "wall_s": shared, "cpu_s": None})
+    records += [{"stage": f"export:{name}", "wall_s": r["seconds"], "cpu_s": r["cpu_s"]} for name, r in report.items()]
+    # Profiles run on worker threads, so peak RSS can't be attributed to one of them
+    profiler.extend([
+        {**r, "depth": 0, "_order": i, "peak_rss_delta_mb": None, "rows_in": rows, "rows_out": rows,
+         "rows_per_s": rows / r["wall_s"] if r["wall_s"] else None}
+        for i, r in enumerate(records)
+    ])
+
+def export_profiles(
+    df: pd.DataFrame,
+    profile_path: str,
+    sizes: Optional[Dict[str, dict]] = None,
+    jobs: Optional[int] = None,
+    only: Optional[Collection[str]] = None,
+) -> Dict[str, dict]:
+    """Write every profile (or just those named in ``only``) from a single materialization, ``jobs`` profiles at a time.
+
+    Record-per-row JSON/NDJSON profiles share one conversion of their columns
+    and are written together; every other profile is its own task. ``jobs``
+    defaults to one thread per task, capped at the CPU count. Returns
+    ``{name: {"path", "seconds", "bytes"}}`` (row profiles add
+    ``shared_seconds``, the conversion they share); columnar profiles add a
+    size report to ``sizes``.
+    """
+    profiles = load_profiles(profile_path)
+    if only is not None:
+        profiles = {name: spec for name, spec in profiles.items() if name in only}
+
+    with stage("export", rows_in=len(df)) as record:
+        frame, fields = plan_exports(df, profiles)
+        row_names = [name for name, spec in profiles.items() if _row_format(spec)]
+        tasks = [partial(_write_rows, frame, row_names, profiles, fields)] if row_names else []
+        tasks += [
+            partial(_write_one, _project(frame, fields[name]), name, spec, sizes)
+            for name, spec in profiles.items()
+            if name not in row_names
+        ]
+        workers = max(1, min(len(tasks), jobs or os.cpu_count() or 1))
+
+        results: Dict[str, dict] = {}
+        if workers == 1:
+            for task in tasks:
+                results.update(task())
         else:
-            # Default to CSV
-            data.to_csv(path, index=False)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for done in [pool.submit(task) for task in tasks]:
+                    results.update(done.result())
+        record["rows_out"] = len(df)
 
-        shas[name] = str(path)
+        report = {}
+        for name in profiles:
+            result = results[name]
+            report[name] = {
+                "path": str(result["path"]),
+                "seconds": round(result["seconds"], 4),
+                "bytes": _output_bytes(result["path"], profiles[name]),
+            }
+            if "shared_seconds" in result:
+                report[name]["shared_seconds"] = round(result["shared_seconds"], 4)
+        _record_stages({name: results[name] for name in profiles}, len(df))
+    return report
 
-    return shas
+def export_from_profile(
+    df: pd.DataFrame,
+    profile_path: str,
+    sizes: Optional[Dict[str, dict]] = None,
+    jobs: Optional[int] = None,
+) -> Dict[str, str]:
+    """Write every profile and return ``{name: path}``; see ``export_profiles``."""
+    return {name: entry["path"] for name, entry in export_profiles(df, profile_path, sizes, jobs).items()}
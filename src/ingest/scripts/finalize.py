@@ -0,0 +1,110 @@
+"""Content-hashed, precompressed copies of the site data artifacts.
+
+Each JSON artifact directly under ``site/static/data`` is copied to
+``site/static/data/immutable/<stem>.<hash><suffix>`` with gzip and Brotli
+siblings at maximum level (Brotli is skipped if ``brotli`` isn't installed).
+A small stable-name pointer, ``site/static/data/artifacts.json``, maps each
+original file name to its hashed path so the map can fetch it first and then
+cache the hashed files forever.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Dict, Iterable
+
+try:  # Pinned in requirements.txt; older environments just skip the .br siblings
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+DATA_DIR = Path("site/static/data")
+IMMUTABLE_DIR = "immutable"
+POINTER_NAME = "artifacts.json"
+HASH_LENGTH = 16
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
+
+def _compressed(path: Path, compress: Callable[[], bytes]) -> int:
+    """Size of the compressed sibling at ``path``, compressing only when it doesn't exist yet.
+
+    The name carries the content hash and the encoders are deterministic, so
+    an existing sibling already has the right bytes.
+    """
+    if path.exists():
+        return path.stat().st_size
+    payload = compress()
+    _write_bytes(path, payload)
+    return len(payload)
+
+
+def hashed_name(path: Path, digest: str) -> str:
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def _hashed_pattern(stem: str, suffix: str) -> re.Pattern:
+    return re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(suffix)}(\.gz|\.br)?")
+
+
+def finalize_artifacts(paths: Iterable[str], data_dir: Path = DATA_DIR) -> dict:
+    """Hash and precompress ``paths`` that live directly in ``data_dir``.
+
+    Writes the pointer file, removes hashed copies from earlier runs, and
+    returns ``{"pointer": ..., "files": {name: details}}`` for the manifest.
+    """
+    data_dir = Path(data_dir)
+    out_dir = data_dir / IMMUTABLE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    files: Dict[str, dict] = {}
+    keep: set[str] = set()
+    for raw in paths:
+        path = Path(raw)
+        if path.suffix != ".json" or path.parent.resolve() != data_dir.resolve() or not path.is_file():
+            continue
+        if path.name == POINTER_NAME:
+            continue
+        payload = path.read_bytes()
+        digest = sha256(payload).hexdigest()
+        target = out_dir / hashed_name(path, digest)
+        if not target.exists():
+            _write_bytes(target, payload)
+        # mtime=0 keeps the gzip bytes a pure function of the content
+        gz_bytes = _compressed(target.with_name(target.name + ".gz"), lambda: gzip.compress(payload, compresslevel=9, mtime=0))
+        details = {
+            "path": f"{IMMUTABLE_DIR}/{target.name}",
+            "sha256": digest,
+            "bytes": len(payload),
+            "gzip_bytes": gz_bytes,
+            "brotli_bytes": None,
+        }
+        keep.update({target.name, target.name + ".gz"})
+        if brotli is not None:
+            details["brotli_bytes"] = _compressed(target.with_name(target.name + ".br"), lambda: brotli.compress(payload, quality=11))
+            keep.add(target.name + ".br")
+        files[path.name] = details
+
+    # Drop older generations of the artifacts we just finalized
+    patterns = [_hashed_pattern(Path(name).stem, Path(name).suffix) for name in files]
+    for existing in out_dir.iterdir():
+        if existing.name not in keep and any(p.fullmatch(existing.name) for p in patterns):
+            existing.unlink()
+
+    pointer = {"version": 1, "files": {name: d["path"] for name, d in sorted(files.items())}}
+    pointer_path = data_dir / POINTER_NAME
+    encoded = json.dumps(pointer, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    if not pointer_path.exists() or pointer_path.read_bytes() != encoded:
+        _write_bytes(pointer_path, encoded)
+    return {"pointer": str(pointer_path), "brotli": brotli is not None, "files": files}
+
+
+__all__ = ["finalize_artifacts", "hashed_name", "DATA_DIR", "POINTER_NAME"]
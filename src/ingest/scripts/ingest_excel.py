@@ -1,12 +1,13 @@
 # File: ingest/scripts/ingest_excel.py
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, List, Tuple
 import pandas as pd
 from pathlib import Path
 import yaml
 
-def _coerce_bool(series: pd.Series) -> pd.Series:
-    # Accept {1,0,True,False,"1","0"} and NaN → False
-    return series.map(lambda v: bool(int(v)) if pd.notna(v) and str(v).strip().isdigit() else bool(v) if pd.notna(v) else False)
+from ingest.scripts import arrow_backend, coerce
+from ingest.scripts.xlsx_stream import read_excel_stream
+
+ENGINES = ("pandas", "stream")
 
 def load_config(schema_path: str) -> Tuple[dict, dict, dict]:
     with open(schema_path, "r", encoding="utf-8") as f:
@@ -16,9 +17,71 @@ def load_config(schema_path: str) -> Tuple[dict, dict, dict]:
     dtypes = conf.get("dtypes", {})
     return required, rename, dtypes
 
-def ingest_excel(raw_path: str, schema_path: str) -> pd.DataFrame:
+def projected_columns(schema_path: str, mapping_path: str | None = None, profiles_path: str | None = None) -> List[str]:
+    """Raw worksheet columns the pipeline actually reads, in a stable order."""
+    required, rename, dtypes = load_config(schema_path)
+    raw_name = {v: k for k, v in rename.items()}
+    wanted: List[str] = []
+
+    def add(col):
+        if col and col != "*":
+            name = raw_name.get(col, col)
+            if name not in wanted:
+                wanted.append(name)
+
+    for col in [*required, *rename.keys(), *dtypes.keys()]:
+        add(col)
+
+    if mapping_path:
+        with open(mapping_path, "r", encoding="utf-8") as f:
+            mapping = yaml.safe_load(f) or {}
+        for col in (mapping.get("fnap_flags") or {}):
+            add(col)
+        for col in (mapping.get("text_fields") or {}).values():
+            add(col)
+        for col in (mapping.get("snap") or {}).values():
+            add(col)
+
+    if profiles_path:
+        with open(profiles_path, "r", encoding="utf-8") as f:
+            profiles = yaml.safe_load(f) or {}
+        for spec in profiles.values():
+            for col in spec.get("fields", []):
+                add(col)
+
+    return wanted
+
+def ingest_excel(
+    raw_path: str,
+    schema_path: str,
+    engine: str = "pandas",
+    columns: Iterable[str] | None = None,
+    backend: str = "pandas",
+    report: Dict[str, dict] | None = None,
+) -> pd.DataFrame:
+    if engine == "pandas":
+        df = pd.read_excel(raw_path)
+    elif engine == "stream":
+        df = read_excel_stream(raw_path, columns)
+    else:
+        raise ValueError(f"Unknown Excel engine '{engine}'. Available: {', '.join(ENGINES)}")
+    return apply_schema(df, schema_path, backend, report)
+
+def apply_schema(
+    df: pd.DataFrame,
+    schema_path: str,
+    backend: str = "pandas",
+    report: Dict[str, dict] | None = None,
+) -> pd.DataFrame:
+    """Check required columns, rename and coerce dtypes of a raw USDA-shaped frame.
+
+    Coercion is vectorized per schema dtype (see ``coerce``); ``report``
+    receives ``{column: {dtype, failed}}`` with the number of values that
+    didn't parse. ``backend="arrow"`` stores ``str`` columns as
+    ``string[pyarrow]``.
+    """
+    arrow_backend.check_backend(backend)
     required, rename, dtypes = load_config(schema_path)
-    df = pd.read_excel(raw_path)
 
     # Ensure required columns exist
     missing = [c for c in required if c not in df.columns]
@@ -29,21 +92,5 @@ def ingest_excel(raw_path: str, schema_path: str) -> pd.DataFrame:
     to_rename = {k: v for k, v in rename.items() if k in df.columns}
     df = df.rename(columns=to_rename)
 
-    # Type coercions
-    for col, typ in dtypes.items():
-        if col not in df.columns:
-            continue
-        if typ == "datetime":
-            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
-        elif typ == "float":
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-        elif typ == "bool":
-            df[col] = _coerce_bool(df[col])
-        elif typ == "str":
-            df[col] = df[col].astype("string").str.strip()
-        # else: leave as-is
-
-    # Trim whitespace globally
-    df = df.apply(lambda s: s.str.strip() if s.dtype == "string" else s)
-
-    return df
+    # Type coercions (str columns come back trimmed)
+    return coerce.apply_dtypes(df, dtypes, backend, report)
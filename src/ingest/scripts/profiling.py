@@ -0,0 +1,196 @@
+"""Per-stage wall/CPU time, peak RSS and throughput for the pipeline.
+
+Pipeline code marks its stages with ``with stage("name", rows_in=n) as record``
+and may set ``record["rows_out"]``. Outside an active ``Profiler`` that is a
+no-op; inside one it appends a record:
+
+    {"stage", "depth", "wall_s", "cpu_s", "peak_rss_delta_mb",
+     "rows_in", "rows_out", "rows_per_s"}
+
+Peak RSS delta is the stage's high-water mark above the RSS it started with.
+On Linux the kernel's peak counter is reset per stage through
+``/proc/self/clear_refs``; elsewhere it falls back to the growth of the
+process-wide peak, which reads 0 for stages below an earlier peak.
+"""
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import re
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+_ACTIVE: contextvars.ContextVar["Profiler | None"] = contextvars.ContextVar("ingest_profiler", default=None)
+
+
+def _status_kb(field: str) -> int | None:
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_mb() -> float:
+    peak = _status_kb("VmHWM")
+    if peak is not None:
+        return peak / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _rss_mb() -> float | None:
+    rss = _status_kb("VmRSS")
+    return None if rss is None else rss / 1024
+
+
+def _reset_peak() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class Profiler:
+    """Collects stage records; ``cprofile_dir`` also dumps a pstats file per top-level stage."""
+
+    def __init__(self, cprofile_dir: Path | None = None):
+        self.records: List[dict] = []
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self._started = 0
+        # Peak RSS seen by each open stage, innermost last
+        self._peaks: List[float] = []
+
+    @staticmethod
+    def active() -> "Profiler | None":
+        return _ACTIVE.get()
+
+    @contextmanager
+    def activate(self) -> Iterator["Profiler"]:
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+    def _observe_peak(self) -> None:
+        # Resetting the kernel counter for a nested stage would lose the
+        # enclosing stages' peaks, so fold the current value into them first
+        peak = _peak_rss_mb()
+        self._peaks = [max(p, peak) for p in self._peaks]
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None) -> Iterator[dict]:
+        record = {"stage": name, "depth": len(self._peaks), "rows_in": rows_in, "rows_out": None, "_order": self._started}
+        self._started += 1
+        self._observe_peak()
+        reset = _reset_peak()
+        start_rss = _rss_mb() if reset else None
+        if start_rss is None:
+            start_rss = _peak_rss_mb()
+        self._peaks.append(start_rss)
+
+        profile = None
+        if self.cprofile_dir is not None and record["depth"] == 0:
+            # cProfile can't nest; sub-stages show up inside their parent's dump
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler (e.g. python -m cProfile) is already active
+                profile = None
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall
+            record["cpu_s"] = time.process_time() - cpu
+            if profile is not None:
+                profile.disable()
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(self.cprofile_dir / f"{record['_order']:02d}-{_slug(name)}.pstats")
+            self._observe_peak()
+            peak = self._peaks.pop()
+            record["peak_rss_delta_mb"] = max(0.0, peak - start_rss)
+            rows = record["rows_in"] if record["rows_in"] is not None else record["rows_out"]
+            record["rows_per_s"] = rows / record["wall_s"] if rows is not None and record["wall_s"] > 0 else None
+            self.records.append(record)
+
+    def extend(self, records: List[dict]) -> None:
+        """Add records measured elsewhere (e.g. in a worker process or thread).
+
+        ``cpu_s`` and ``peak_rss_delta_mb`` may be None when they can't be
+        attributed to the record (threads share the process's CPU and memory).
+        """
+        depth = len(self._peaks)
+        for r in sorted(records, key=lambda r: r["_order"]):
+            self.records.append({**r, "depth": r["depth"] + depth, "_order": self._started})
+            self._started += 1
+
+    def summary(self) -> List[dict]:
+        """Records in start order with rounded numbers, for the manifest."""
+        ordered = sorted(self.records, key=lambda r: r["_order"])
+        out = []
+        for r in ordered:
+            out.append({
+                "stage": r["stage"],
+                "depth": r["depth"],
+                "wall_s": round(r["wall_s"], 4),
+                "cpu_s": _round(r["cpu_s"], 4),
+                "peak_rss_delta_mb": _round(r["peak_rss_delta_mb"], 2),
+                "rows_in": r["rows_in"],
+                "rows_out": r["rows_out"],
+                "rows_per_s": _round(r["rows_per_s"], 1),
+            })
+        return out
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    return None if value is None else round(value, digits)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+
+
+@contextmanager
+def stage(name: str, rows_in: int | None = None) -> Iterator[dict]:
+    """Measure a stage under the active profiler; a no-op without one."""
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield {}
+        return
+    with profiler.stage(name, rows_in) as record:
+        yield record
+
+
+def format_table(summary: List[dict]) -> str:
+    """Plain-text table of ``Profiler.summary()``, sub-stages indented."""
+    columns = ["stage", "wall_s", "cpu_s", "peak_rss_delta_mb", "rows_in", "rows_out", "rows_per_s"]
+    rows = [[("  " * r["depth"]) + r["stage"]] + [_fmt(r[c]) for c in columns[1:]] for r in summary]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) if rows else len(c) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+__all__ = ["Profiler", "format_table", "stage"]
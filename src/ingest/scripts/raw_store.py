@@ -0,0 +1,230 @@
+"""Content-addressed store for staged raw workbooks.
+
+Each distinct workbook is kept once, as ``data/raw/objects/<sha256><ext>``.
+The dated snapshot names the pipeline globs for
+(``farmersmarket_<date>_sha256=<digest>.xlsx``) are hardlinks to those
+objects, falling back to a reflink and then a plain copy where the
+filesystem can't link.
+
+``data/raw/index.json`` remembers the SHA-256 of every file hashed so far,
+keyed on its path, size and mtime, so runs don't re-read unchanged
+multi-MB workbooks. ``gc`` prunes old snapshots and the objects no snapshot
+uses any more.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+RAW_DIR = Path("data/raw")
+OBJECTS = "objects"
+INDEX = "index.json"
+INDEX_VERSION = 1
+# Linux FICLONE ioctl: share the source's extents (btrfs, xfs, ...)
+_FICLONE = 0x40049409
+
+
+def sha256sum(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class HashIndex:
+    """SHA-256 per file, reused while the file's size and mtime are unchanged."""
+
+    def __init__(self, raw_dir: Path = RAW_DIR):
+        self.path = Path(raw_dir) / INDEX
+        self.files: Dict[str, dict] = {}
+        self.changed = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.files = data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            # Missing or unreadable: start over, entries are only a cache
+            self.files = {}
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    def sha256(self, path: Path) -> str:
+        st = os.stat(path)
+        key = self._key(path)
+        entry = self.files.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+        digest = sha256sum(Path(path))
+        self.record(path, digest, st)
+        return digest
+
+    def record(self, path: Path, digest: str, st: os.stat_result | None = None) -> None:
+        st = st or os.stat(path)
+        self.files[self._key(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        self.changed = True
+
+    def forget(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            if self.files.pop(self._key(path), None) is not None:
+                self.changed = True
+
+    def prune(self) -> None:
+        """Drop entries for files that no longer exist."""
+        self.forget([Path(p) for p in list(self.files) if not os.path.exists(p)])
+
+    def save(self) -> bool:
+        if not self.changed:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, indent=1, sort_keys=True)
+        # Concurrent writers (--jobs) may drop each other's entries; that only costs a re-hash
+        os.replace(tmp, self.path)
+        self.changed = False
+        return True
+
+
+def file_sha256(path: Path, raw_dir: Path = RAW_DIR) -> str:
+    """SHA-256 of ``path``, from the index when the file is unchanged."""
+    index = HashIndex(raw_dir)
+    digest = index.sha256(path)
+    index.save()
+    return digest
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def clone(src: Path, dst: Path, link: bool = True) -> str:
+    """Materialize ``src`` at ``dst``: ``"hardlink"``, ``"reflink"`` or ``"copy"``."""
+    if link:
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    method = "reflink" if _reflink(src, dst) else "copy"
+    if method == "copy":
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return method
+
+
+def _snapshots(raw_dir: Path, pattern: str) -> List[Path]:
+    """Snapshots matching a dataset glob, newest first (the order ``run`` picks from)."""
+    return sorted(Path(raw_dir).glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def stage(src: Path, name: str, pattern: str | None = None, raw_dir: Path = RAW_DIR) -> dict:
+    """Add ``src`` to the store and expose it as ``raw_dir/name``.
+
+    ``name`` may contain ``{digest}`` (the first 12 hex digits). When the
+    newest snapshot matching ``pattern`` (the one ``run`` reads) already
+    holds the same content, nothing is written and that snapshot is
+    returned. Returns ``{path, sha256, status, method}`` with ``status``
+    ``"staged"`` or ``"exists"``.
+    """
+    raw_dir = Path(raw_dir)
+    index = HashIndex(raw_dir)
+    digest = index.sha256(src)
+    try:
+        snapshots = _snapshots(raw_dir, pattern) if pattern else []
+        if snapshots and index.sha256(snapshots[0]) == digest:
+            return {"path": str(snapshots[0]), "sha256": digest, "status": "exists", "method": None}
+
+        objects = raw_dir / OBJECTS
+        objects.mkdir(parents=True, exist_ok=True)
+        obj = objects / f"{digest}{Path(src).suffix}"
+        reused = obj.exists()
+        if not reused:
+            tmp = objects / f".{digest}.{os.getpid()}.tmp"
+            # Never hardlink the caller's file: editing it would corrupt the store
+            clone(Path(src), tmp, link=False)
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, obj)
+            index.record(obj, digest)
+
+        dst = raw_dir / name.format(digest=digest[:12])
+        if dst.exists():
+            dst.unlink()
+        method = clone(obj, dst)
+        if reused:
+            # Older content staged again (a rollback): a link carries the
+            # object's old mtime, so make the snapshot the newest one
+            os.utime(dst)
+        index.record(dst, digest)
+        return {"path": str(dst), "sha256": digest, "status": "staged", "method": method}
+    finally:
+        index.save()
+
+
+def gc(
+    datasets: Dict[str, dict],
+    keep: int = 3,
+    keep_days: float | None = None,
+    dry_run: bool = False,
+    raw_dir: Path = RAW_DIR,
+    now: float | None = None,
+) -> dict:
+    """Prune snapshots beyond the retention policy, then unreferenced objects.
+
+    Per dataset the ``keep`` newest snapshots (at least one, the one ``run``
+    uses) and any younger than ``keep_days`` are kept. An object is removed
+    once no kept snapshot has its content.
+    """
+    raw_dir = Path(raw_dir)
+    now = time.time() if now is None else now
+    index = HashIndex(raw_dir)
+    kept: List[Path] = []
+    removed: List[Path] = []
+    for cfg in datasets.values():
+        pattern = cfg.get("glob")
+        for rank, path in enumerate(_snapshots(raw_dir, pattern) if pattern else []):
+            young = keep_days is not None and now - path.stat().st_mtime < keep_days * 86400
+            (kept if rank < max(keep, 1) or young else removed).append(path)
+
+    referenced = {index.sha256(path) for path in kept}
+    objects = sorted(p for p in (raw_dir / OBJECTS).glob("*") if not p.name.startswith("."))
+    orphans = [p for p in objects if p.name.split(".")[0] not in referenced]
+    # Space only comes back with a file's last link
+    freed = sum(p.stat().st_size for p in orphans)
+    freed += sum(p.stat().st_size for p in removed if p.stat().st_nlink == 1)
+
+    if not dry_run:
+        for path in [*removed, *orphans]:
+            path.unlink(missing_ok=True)
+        index.forget([*removed, *orphans])
+        index.prune()
+    index.save()
+    return {
+        "snapshots_removed": [str(p) for p in removed],
+        "objects_removed": [str(p) for p in orphans],
+        "snapshots_kept": len(kept),
+        "bytes_freed": freed,
+        "dry_run": dry_run,
+    }
+
+
+__all__ = ["clone", "file_sha256", "gc", "sha256sum", "stage", "HashIndex", "RAW_DIR"]
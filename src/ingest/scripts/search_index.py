@@ -0,0 +1,133 @@
+"""Inverted token index over the search columns.
+
+Records are addressed by ordinal: their row position in the exported frame,
+which is also their position in ``markets.search.json``. Every token and every
+prefix of at least ``min_prefix`` characters maps to the sorted ordinals of the
+records containing it. Postings are delta-encoded: the first value is an
+ordinal, each following value is the gap to the previous one.
+
+Tokens use the map's normalization (``_normalize_text``), so a query term
+matches a record when it is a prefix of one of the record's tokens.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence
+
+import pandas as pd
+
+from ingest.scripts.enrich import _normalize_text
+
+INDEX_VERSION = 1
+INDEX_COLUMNS = ["search_haystack", "search_city_norm", "search_state_norm", "search_zip"]
+MIN_PREFIX = 2
+
+
+def encode_postings(ordinals: Sequence[int]) -> List[int]:
+    """Delta-encode a sorted list of ordinals."""
+    out: List[int] = []
+    previous = 0
+    for ordinal in ordinals:
+        out.append(ordinal - previous)
+        previous = ordinal
+    return out
+
+
+def decode_postings(deltas: Sequence[int]) -> List[int]:
+    out: List[int] = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        out.append(total)
+    return out
+
+
+def record_tokens(df: pd.DataFrame, columns: Iterable[str] = INDEX_COLUMNS) -> List[set]:
+    """Distinct normalized tokens per record across ``columns``."""
+    tokens: List[set] = [set() for _ in range(len(df))]
+    for col in columns:
+        if col not in df.columns:
+            continue
+        for ordinal, value in enumerate(df[col].fillna("").astype(str)):
+            tokens[ordinal].update(_normalize_text(value).split())
+    return tokens
+
+
+def build_index(
+    df: pd.DataFrame,
+    columns: Iterable[str] = INDEX_COLUMNS,
+    id_field: str | None = "record_id",
+    min_prefix: int = MIN_PREFIX,
+) -> dict:
+    """Build the index artifact for ``df`` (JSON-serializable)."""
+    by_token: Dict[str, List[int]] = defaultdict(list)
+    for ordinal, tokens in enumerate(record_tokens(df, columns)):
+        for token in tokens:
+            by_token[token].append(ordinal)
+
+    # A prefix's postings are the union of its tokens' postings
+    by_term: Dict[str, set] = defaultdict(set)
+    for token, ordinals in by_token.items():
+        by_term[token].update(ordinals)
+        for end in range(min_prefix, len(token)):
+            by_term[token[:end]].update(ordinals)
+
+    index = {
+        "version": INDEX_VERSION,
+        "records": int(len(df)),
+        "min_prefix": min_prefix,
+        "terms": {term: encode_postings(sorted(by_term[term])) for term in sorted(by_term)},
+    }
+    if id_field and id_field in df.columns:
+        index["ids"] = df[id_field].astype(str).tolist()
+    return index
+
+
+def _intersect(left: List[int], right: List[int]) -> List[int]:
+    out: List[int] = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        a, b = left[i], right[j]
+        if a == b:
+            out.append(a)
+            i += 1
+            j += 1
+        elif a < b:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def query(index: dict, text: str) -> List[int]:
+    """Ordinals of records matching every term of ``text``; all records for an empty query.
+
+    Terms shorter than the index's ``min_prefix`` only match whole tokens.
+    """
+    terms = sorted(set(_normalize_text(text).split()))
+    if not terms:
+        return list(range(index["records"]))
+    postings = []
+    for term in terms:
+        deltas = index["terms"].get(term)
+        if deltas is None:
+            return []
+        postings.append(decode_postings(deltas))
+    # Smallest list first keeps every intersection bounded by the rarest term
+    postings.sort(key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        result = _intersect(result, other)
+        if not result:
+            break
+    return result
+
+
+__all__ = [
+    "INDEX_COLUMNS",
+    "build_index",
+    "decode_postings",
+    "encode_postings",
+    "query",
+    "record_tokens",
+]
@@ -0,0 +1,133 @@
+"""Uniform-grid spatial index over market coordinates.
+
+Markets are bucketed into the same lat/lon grid as the tile export
+(``tiles.grid_cells``). A radius query computes the exact longitude extent of
+the search circle, visits only the cells it overlaps and runs a vectorized
+haversine over their markets. The per-cell ordinals can be exported so the map
+can do the same without scanning every marker.
+"""
+from __future__ import annotations
+
+import math
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from ingest.scripts.search_index import encode_postings
+from ingest.scripts.tiles import grid_cells, grid_shape
+
+# Same radius the map uses for its distance filter
+EARTH_RADIUS_MILES = 3958.7613
+CELL_DEGREES = 0.5
+# Widens the cell window so float rounding never drops a market on the circle's edge
+_MARGIN_DEGREES = 1e-7
+
+
+def haversine_miles(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in miles from one point to many."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """Markets grouped by grid cell, stored as a sorted cell-id/offset table."""
+
+    def __init__(self, lat: pd.Series, lon: pd.Series, cell_degrees: float = CELL_DEGREES):
+        if cell_degrees <= 0:
+            raise ValueError("cell_degrees must be positive")
+        self.cell_degrees = float(cell_degrees)
+        self.rows, self.cols = grid_shape(self.cell_degrees)
+        lat_v = pd.to_numeric(lat, errors="coerce").to_numpy(dtype=float)
+        lon_v = pd.to_numeric(lon, errors="coerce").to_numpy(dtype=float)
+        located = np.isfinite(lat_v) & np.isfinite(lon_v) & (np.abs(lat_v) <= 90) & (np.abs(lon_v) <= 180)
+
+        self.size = len(lat_v)
+        ordinals = np.flatnonzero(located)
+        row, col = grid_cells(lat_v[ordinals], lon_v[ordinals], self.cell_degrees)
+        cell = row * self.cols + col
+        order = np.argsort(cell, kind="stable")
+        # Ordinals stay ascending within each cell thanks to the stable sort
+        self.ordinals = ordinals[order]
+        self.lat = lat_v[self.ordinals]
+        self.lon = lon_v[self.ordinals]
+        self.cell_ids, self.starts = np.unique(cell[order], return_index=True)
+        self.ends = np.append(self.starts[1:], len(self.ordinals))
+
+    def _candidate_cells(self, lat: float, lon: float, miles: float) -> np.ndarray:
+        radius = miles / EARTH_RADIUS_MILES
+        dlat = math.degrees(radius) + _MARGIN_DEGREES
+        south, north = lat - dlat, lat + dlat
+        row_bounds, _ = grid_cells(np.array([max(-90.0, south), min(90.0, north)]), np.zeros(2), self.cell_degrees)
+        rows = np.arange(row_bounds[0], row_bounds[1] + 1)
+
+        cos_lat = math.cos(math.radians(lat))
+        if south <= -90 or north >= 90 or math.sin(radius) >= cos_lat:
+            # The circle reaches a pole: every longitude is in range
+            cols = np.arange(self.cols)
+        else:
+            # Widest longitude offset reached by the spherical cap around (lat, lon)
+            dlon = math.degrees(math.asin(math.sin(radius) / cos_lat)) + _MARGIN_DEGREES
+            west, east = lon - dlon, lon + dlon
+            # Split a window crossing the antimeridian into two in-range spans
+            if west < -180:
+                spans = [(west + 360.0, 180.0), (-180.0, east)]
+            elif east > 180:
+                spans = [(west, 180.0), (-180.0, east - 360.0)]
+            else:
+                spans = [(west, east)]
+            cols = np.unique(np.concatenate([self._col_range(a, b) for a, b in spans]))
+        return (rows[:, None] * self.cols + cols[None, :]).ravel()
+
+    def _col_range(self, west: float, east: float) -> np.ndarray:
+        _, bounds = grid_cells(np.zeros(2), np.array([max(-180.0, west), min(180.0, east)]), self.cell_degrees)
+        return np.arange(bounds[0], bounds[1] + 1)
+
+    def query_radius(self, lat: float, lon: float, miles: float) -> np.ndarray:
+        """Sorted ordinals of markets within ``miles`` of (lat, lon)."""
+        if miles < 0:
+            return np.array([], dtype=np.int64)
+        cells = self._candidate_cells(lat, lon, miles)
+        pos = np.searchsorted(self.cell_ids, cells)
+        present = pos < len(self.cell_ids)
+        present[present] = self.cell_ids[pos[present]] == cells[present]
+        pos = pos[present]
+        if not len(pos):
+            return np.array([], dtype=np.int64)
+        slots = np.concatenate([np.arange(self.starts[p], self.ends[p]) for p in pos])
+        distances = haversine_miles(lat, lon, self.lat[slots], self.lon[slots])
+        return np.sort(self.ordinals[slots[distances <= miles]])
+
+    def cells(self) -> dict:
+        """``{"row_col": ordinals}`` for every non-empty cell (tile-export key format)."""
+        out = {}
+        for cell_id, start, end in zip(self.cell_ids, self.starts, self.ends):
+            row, col = divmod(int(cell_id), self.cols)
+            out[f"{row}_{col}"] = self.ordinals[start:end].tolist()
+        return out
+
+    def to_artifact(self) -> dict:
+        """JSON-serializable index with delta-encoded per-cell ordinals."""
+        return {
+            "cell_degrees": self.cell_degrees,
+            "records": int(self.size),
+            "cells": {key: encode_postings(ordinals) for key, ordinals in self.cells().items()},
+        }
+
+
+def brute_force_radius(lat: float, lon: float, miles: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Reference scan: haversine against every market."""
+    distances = haversine_miles(lat, lon, np.asarray(lats, dtype=float), np.asarray(lons, dtype=float))
+    return np.flatnonzero(distances <= miles)
+
+
+def query_radius(df: pd.DataFrame, lat: float, lon: float, miles: float) -> List[int]:
+    """One-off radius query over ``df`` row ordinals; build a GridIndex to reuse it."""
+    return GridIndex(df["latitude"], df["longitude"]).query_radius(lat, lon, miles).tolist()
+
+
+__all__ = ["EARTH_RADIUS_MILES", "GridIndex", "brute_force_radius", "haversine_miles", "query_radius"]
@@ -1,22 +1,14 @@
 # File: ingest/scripts/stage_raw.py
-import hashlib
-import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict
 
 import yaml
 
-RAW_DIR = Path("data/raw")
-DATASETS = Path("ingest/config/datasets.yml")
-
+from ingest.scripts import raw_store
 
-def sha256sum(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+RAW_DIR = raw_store.RAW_DIR
+DATASETS = Path("ingest/config/datasets.yml")
 
 
 def _load_dataset_config() -> Dict[str, dict]:
@@ -25,8 +17,14 @@ def _load_dataset_config() -> Dict[str, dict]:
     return conf.get("datasets", {})
 
 
-def stage_raw(src_path: str, dataset_key: str | None = None) -> str:
-    """Copy a source Excel into data/raw with a timestamp + checksum in the filename."""
+def stage_raw(src_path: str, dataset_key: str | None = None, report: dict | None = None) -> str:
+    """Stage a source Excel into data/raw with a timestamp + checksum in the filename.
+
+    The content goes into the content-addressed store (``raw_store``); when
+    the dataset's newest snapshot already has the same content, that
+    snapshot's path is returned and nothing is written. ``report`` receives
+    ``raw_store.stage``'s result (``status``, ``method``, ``sha256``).
+    """
     RAW_DIR.mkdir(parents=True, exist_ok=True)
     src = Path(src_path).expanduser().resolve()
     if not src.exists():
@@ -40,8 +38,8 @@ def stage_raw(src_path: str, dataset_key: str | None = None) -> str:
 
     prefix = cfg.get("prefix") or f"{key}_"
     stamp = datetime.utcnow().strftime("%Y-%m-%d")
-    digest = sha256sum(src)[:12]
-    dst_name = f"{prefix}{stamp}_sha256={digest}{src.suffix}"
-    dst = RAW_DIR / dst_name
-    shutil.copy2(src, dst)
-    return str(dst)
+    name = f"{prefix}{stamp}_sha256={{digest}}{src.suffix}"
+    result = raw_store.stage(src, name, cfg.get("glob") or f"{prefix}*", RAW_DIR)
+    if report is not None:
+        report.update(result)
+    return result["path"]
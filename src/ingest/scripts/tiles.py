@@ -0,0 +1,187 @@
+"""Partition records into geographic tiles for the map payload.
+
+Two schemes are supported:
+
+- ``grid``: fixed lat/lon cells of ``precision`` degrees. Keys are
+  ``"{row}_{col}"`` counted from the south-west corner (-90, -180).
+- ``geohash``: geohash prefixes of ``precision`` characters.
+
+Cells are half-open: a record on a shared edge belongs to the cell to its north
+and east. Records on the north pole or the antimeridian fall in the last cell.
+"""
+from __future__ import annotations
+
+import json
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ingest.scripts.json_writer import write_json_records
+
+SCHEMES = ("grid", "geohash")
+INDEX_NAME = "index.json"
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# File stems that write_tiles owns and may delete when a tile empties
+_KEY_PATTERNS = {
+    "grid": re.compile(r"\d+_\d+"),
+    "geohash": re.compile(f"[{_GEOHASH_ALPHABET}]{{1,12}}"),
+}
+# Tolerance for coordinates that sit on a grid line but divide just below it
+_EDGE_EPS = 1e-9
+
+
+def grid_shape(precision: float) -> Tuple[int, int]:
+    """Number of (rows, cols) in a grid of ``precision``-degree cells."""
+    return math.ceil(180 / precision - _EDGE_EPS), math.ceil(360 / precision - _EDGE_EPS)
+
+
+def grid_cells(lat: np.ndarray, lon: np.ndarray, precision: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Row and column of each coordinate, clamped into the grid."""
+    rows, cols = grid_shape(precision)
+    row = np.floor((lat + 90.0) / precision + _EDGE_EPS).astype(np.int64)
+    col = np.floor((lon + 180.0) / precision + _EDGE_EPS).astype(np.int64)
+    return np.clip(row, 0, rows - 1), np.clip(col, 0, cols - 1)
+
+
+def _grid_bbox(key: str, precision: float) -> List[float]:
+    row, col = (int(part) for part in key.split("_"))
+    south = max(-90.0, row * precision - 90.0)
+    west = max(-180.0, col * precision - 180.0)
+    north = min(90.0, south + precision)
+    east = min(180.0, west + precision)
+    return [round(v, 9) for v in (west, south, east, north)]
+
+
+def geohash_encode(lat: np.ndarray, lon: np.ndarray, precision: int) -> np.ndarray:
+    """Vectorized geohash of ``precision`` characters."""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    if not lat.size:
+        return np.array([], dtype=object)
+    lat_lo, lat_hi = np.full(lat.shape, -90.0), np.full(lat.shape, 90.0)
+    lon_lo, lon_hi = np.full(lon.shape, -180.0), np.full(lon.shape, 180.0)
+    codes = np.zeros((precision, lat.size), dtype=np.int64)
+    even = True
+    for bit in range(precision * 5):
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            upper = lon >= mid
+            lon_lo = np.where(upper, mid, lon_lo)
+            lon_hi = np.where(upper, lon_hi, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            upper = lat >= mid
+            lat_lo = np.where(upper, mid, lat_lo)
+            lat_hi = np.where(upper, lat_hi, mid)
+        codes[bit // 5] = (codes[bit // 5] << 1) | upper
+        even = not even
+    alphabet = np.array(list(_GEOHASH_ALPHABET))
+    return np.array(["".join(chars) for chars in alphabet[codes].T], dtype=object)
+
+
+def geohash_bbox(key: str) -> List[float]:
+    """``[west, south, east, north]`` of a geohash cell."""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    even = True
+    for char in key:
+        value = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            upper = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if upper else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if upper else (lat_lo, mid)
+            even = not even
+    return [lon_lo, lat_lo, lon_hi, lat_hi]
+
+
+def tile_keys(lat: pd.Series, lon: pd.Series, scheme: str = "grid", precision: float = 1.0) -> pd.Series:
+    """Tile key per record; None where the coordinates are missing or out of range."""
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown tiling scheme '{scheme}'. Expected one of: {', '.join(SCHEMES)}")
+    lat_v = pd.to_numeric(lat, errors="coerce").to_numpy(dtype=float)
+    lon_v = pd.to_numeric(lon, errors="coerce").to_numpy(dtype=float)
+    located = (
+        np.isfinite(lat_v) & np.isfinite(lon_v)
+        & (np.abs(lat_v) <= 90) & (np.abs(lon_v) <= 180)
+    )
+    keys = np.full(len(lat_v), None, dtype=object)
+    if located.any():
+        if scheme == "grid":
+            if precision <= 0:
+                raise ValueError("Grid precision must be a positive number of degrees")
+            row, col = grid_cells(lat_v[located], lon_v[located], float(precision))
+            keys[located] = [f"{r}_{c}" for r, c in zip(row, col)]
+        else:
+            if int(precision) != precision or not 1 <= precision <= 12:
+                raise ValueError("Geohash precision must be an integer between 1 and 12")
+            keys[located] = geohash_encode(lat_v[located], lon_v[located], int(precision))
+    return pd.Series(keys, index=lat.index, dtype=object)
+
+
+def tile_bbox(key: str, scheme: str, precision: float) -> List[float]:
+    return _grid_bbox(key, float(precision)) if scheme == "grid" else geohash_bbox(key)
+
+
+def write_tiles(
+    data: pd.DataFrame,
+    out_dir: Path,
+    scheme: str = "grid",
+    precision: float = 1.0,
+    lat_col: str = "latitude",
+    lon_col: str = "longitude",
+) -> Path:
+    """Write one JSON file per non-empty tile plus ``index.json``; returns the index path.
+
+    Tiles left over from a previous run that are now empty are removed, so the
+    directory always matches the index.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    keys = tile_keys(data[lat_col], data[lon_col], scheme, precision)
+
+    tiles: Dict[str, dict] = {}
+    located = keys.notna()
+    for key, group in data[located].groupby(keys[located], sort=True):
+        path = out_dir / f"{key}.json"
+        with open(path, "w", encoding="utf-8") as out:
+            write_json_records(group, out)
+        tiles[key] = {
+            "path": path.name,
+            "count": int(len(group)),
+            "bbox": tile_bbox(key, scheme, precision),
+        }
+
+    for stale in out_dir.glob("*.json"):
+        if stale.stem not in tiles and _KEY_PATTERNS[scheme].fullmatch(stale.stem):
+            stale.unlink()
+
+    index = {
+        "scheme": scheme,
+        "precision": precision,
+        "records": int(located.sum()),
+        "unlocated": int((~located).sum()),
+        "tiles": tiles,
+    }
+    index_path = out_dir / INDEX_NAME
+    with open(index_path, "w", encoding="utf-8") as out:
+        json.dump(index, out, separators=(",", ":"), sort_keys=True)
+    return index_path
+
+
+__all__ = [
+    "SCHEMES",
+    "grid_cells",
+    "grid_shape",
+    "tile_keys",
+    "tile_bbox",
+    "geohash_encode",
+    "geohash_bbox",
+    "write_tiles",
+]
@@ -1,28 +1,198 @@
 # File: ingest/scripts/validate.py
-from typing import Tuple
+"""Row validation from ``ingest/config/validation.yml``: one reject bit per rule,
+packed into an ``int64`` per row; only ``unique`` rules look beyond the row."""
+import operator
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import yaml
+
+from ingest.scripts import arrow_backend
 
+RULES = "ingest/config/validation.yml"
 REJECT_COL = "_reject_reason"
+MAX_RULES = 63
+_OPS: Dict[str, Callable] = {
+    "<": operator.lt, "<=": operator.le, "==": operator.eq,
+    "!=": operator.ne, ">": operator.gt, ">=": operator.ge,
+}
+
+
+def _missing(series: pd.Series) -> np.ndarray:
+    missing = series.isna().to_numpy()
+    if series.dtype == object or isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype)):
+        # Only strings stringify to ''; compare instead of astype(str)
+        missing |= (series == "").to_numpy(dtype=bool, na_value=False)
+    return missing
+
+
+def _missing_mask(series: pd.Series) -> np.ndarray:
+    arr = arrow_backend.to_arrow(series)
+    if pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type):
+        empty = pc.equal(pc.utf8_length(arr), 0)
+    elif pa.types.is_integer(arr.type) or pa.types.is_floating(arr.type) or pa.types.is_boolean(arr.type):
+        # str() of a number is never empty
+        empty = pa.array(np.zeros(len(arr), dtype=bool))
+    else:
+        empty = pa.array(_missing(series))
+    missing = pc.or_(pc.is_null(arr, nan_is_null=True), pc.fill_null(empty, False))
+    return missing.to_numpy(zero_copy_only=False)
+
+
+def _outside(series: pd.Series, low: float | None, high: float | None) -> np.ndarray:
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    bad = np.isnan(values)
+    if low is not None:
+        bad |= values < low
+    if high is not None:
+        bad |= values > high
+    return bad
+
+
+def _out_of_range(series: pd.Series, low: float | None, high: float | None) -> np.ndarray:
+    arr = pc.cast(arrow_backend.to_arrow(series), pa.float64())
+    # NaN compares false against both bounds, so count it (and nulls) explicitly
+    bad = pc.is_null(arr, nan_is_null=True)
+    if low is not None:
+        bad = pc.or_(bad, pc.less(arr, low))
+    if high is not None:
+        bad = pc.or_(bad, pc.greater(arr, high))
+    return pc.fill_null(bad, True).to_numpy(zero_copy_only=False)
+
+
+class Rule:
+    """One entry of ``validation.yml``; ``mask`` returns the rows it rejects."""
+
+    TYPES = ("required", "range", "regex", "unique", "compare")
 
-def basic_validate(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """Split into (valid, rejects) with reason codes."""
-    df = df.copy()
-    df[REJECT_COL] = ""
+    def __init__(self, spec: dict, bit: int):
+        self.spec = spec
+        self.bit = bit
+        self.type = spec.get("type")
+        if self.type not in self.TYPES:
+            raise ValueError(f"Validation rule {spec.get('name')!r}: unknown type {self.type!r}. Available: {', '.join(self.TYPES)}")
+        if self.type == "compare" and spec.get("op") not in _OPS:
+            raise ValueError(f"Validation rule {spec.get('name')!r}: op must be one of {', '.join(_OPS)}")
+        self.name = spec.get("name") or f"{self.type}_{bit}"
+        self.code = spec.get("code", self.name)
+        self.row_local = self.type != "unique"
 
-    # Required basic fields
-    req = ["listing_id", "listing_name", "location_address", "longitude", "latitude"]
-    for col in req:
-        df.loc[df[col].isna() | (df[col].astype(str).str.len() == 0), REJECT_COL] += f"missing:{col};"
+    def mask(self, df: pd.DataFrame, backend: str = "pandas") -> np.ndarray:
+        spec = self.spec
+        arrow = backend == "arrow"
+        if self.type == "required":
+            column = df[spec["column"]]
+            return _missing_mask(column) if arrow else _missing(column)
+        if self.type == "range":
+            outside = _out_of_range if arrow else _outside
+            return outside(df[spec["column"]], spec.get("min"), spec.get("max"))
+        if self.type == "regex":
+            # Python re semantics on every backend
+            values = pd.Series(df[spec["column"]].to_numpy(dtype=object), index=df.index)
+            # Non-string values can't match
+            matched = values.str.fullmatch(spec["pattern"]).astype("boolean").fillna(False)
+            return ~_missing(values) & ~matched.to_numpy(dtype=bool)
+        if self.type == "unique":
+            return df.duplicated(subset=spec["columns"], keep="first").to_numpy()
+        left = df[spec["left"]]
+        right = df[spec["right"]] if "right" in spec else spec["value"]
+        present = left.notna().to_numpy()
+        if "right" in spec:
+            present &= right.notna().to_numpy()
+        holds = _OPS[spec["op"]](left, right).astype("boolean").fillna(True)
+        return present & ~holds.to_numpy(dtype=bool)
 
-    # Coordinate bounds
-    df.loc[(df["longitude"] < -180) | (df["longitude"] > 180) | df["longitude"].isna(), REJECT_COL] += "bad:longitude;"
-    df.loc[(df["latitude"] < -90) | (df["latitude"] > 90) | df["latitude"].isna(), REJECT_COL] += "bad:latitude;"
 
-    # Deduplicate by listing_id, keep first
-    dupes = df.duplicated(subset=["listing_id"], keep="first")
-    df.loc[dupes, REJECT_COL] += "dup:listing_id;"
+def load_rules(path: str = RULES) -> List[Rule]:
+    with open(path, "r", encoding="utf-8") as f:
+        conf = yaml.safe_load(f) or {}
+    specs = conf.get("rules", [])
+    if len(specs) > MAX_RULES:
+        raise ValueError(f"At most {MAX_RULES} validation rules fit the reject bitmask, got {len(specs)}")
+    return [Rule(spec, bit) for bit, spec in enumerate(specs)]
 
-    rejects = df[df[REJECT_COL] != ""].copy()
-    valid = df[df[REJECT_COL] == ""].copy()
 
+def _accumulate(
+    bits: np.ndarray,
+    df: pd.DataFrame,
+    rules: List[Rule],
+    backend: str,
+    report: Dict[str, dict] | None,
+) -> np.ndarray:
+    for rule in rules:
+        start = time.perf_counter()
+        bits |= rule.mask(df, backend).astype(np.int64) << rule.bit
+        if report is not None:
+            report[rule.name] = {"type": rule.type, "code": rule.code, "seconds": time.perf_counter() - start}
+    return bits
+
+
+def row_reject_bits(
+    df: pd.DataFrame,
+    rules: List[Rule] | None = None,
+    backend: str = "pandas",
+    report: Dict[str, dict] | None = None,
+) -> np.ndarray:
+    """Bitmask of the row-local rules each row fails (``unique`` rules excluded)."""
+    arrow_backend.check_backend(backend)
+    rules = load_rules() if rules is None else rules
+    bits = np.zeros(len(df), dtype=np.int64)
+    return _accumulate(bits, df, [r for r in rules if r.row_local], backend, report)
+
+
+def decode_reasons(bits: np.ndarray, rules: List[Rule]) -> np.ndarray:
+    """``"code;code;"`` strings for ``bits``, built once per distinct bitmask."""
+    present, codes = np.unique(bits, return_inverse=True)
+    labels = np.array(
+        ["".join(f"{rule.code};" for rule in rules if value >> rule.bit & 1) for value in present.tolist()],
+        dtype=object,
+    )
+    return labels[codes.reshape(-1)]
+
+
+def row_reject_reasons(df: pd.DataFrame, backend: str = "pandas", rules: List[Rule] | None = None) -> pd.Series:
+    """Reason codes of the row-local rules, for every row ('' when it passes)."""
+    rules = load_rules() if rules is None else rules
+    return pd.Series(decode_reasons(row_reject_bits(df, rules, backend), rules), index=df.index, dtype=object)
+
+
+def basic_validate(
+    df: pd.DataFrame,
+    row_bits: np.ndarray | pd.Series | None = None,
+    backend: str = "pandas",
+    rules: List[Rule] | None = None,
+    report: Dict[str, dict] | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Split into (valid, rejects); rejects carry their reason codes in ``_reject_reason``.
+
+    ``row_bits`` may carry precomputed ``row_reject_bits`` (e.g. reused from an
+    incremental run); ``unique`` rules are always checked across the frame.
+    ``df`` is not modified. ``report`` receives ``{rule: {type, code,
+    rejected, seconds}}`` (``rejected`` counts every row the rule flags,
+    ``seconds`` only covers rules evaluated here).
+    """
+    rules = load_rules() if rules is None else rules
+    if row_bits is None:
+        bits = row_reject_bits(df, rules, backend, report)
+    else:
+        bits = np.asarray(row_bits, dtype=np.int64).copy()
+    bits = _accumulate(bits, df, [r for r in rules if not r.row_local], backend, report)
+    if report is not None:
+        for rule in rules:
+            entry = report.setdefault(rule.name, {"type": rule.type, "code": rule.code, "seconds": None})
+            entry["rejected"] = int(np.count_nonzero(bits >> rule.bit & 1))
+
+    rejected = bits != 0
+    valid = df.take(np.flatnonzero(~rejected))
+    rejects = df.take(np.flatnonzero(rejected))
+    # Valid rows keep an empty reason column so the full export's schema doesn't change
+    valid[REJECT_COL] = ""
+    rejects[REJECT_COL] = decode_reasons(bits[rejected], rules)
     return valid, rejects
+
+
+__all__ = ["basic_validate", "decode_reasons", "load_rules", "row_reject_bits", "row_reject_reasons", "Rule", "REJECT_COL", "RULES"]
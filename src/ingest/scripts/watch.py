@@ -0,0 +1,72 @@
+"""Polling watcher over ``data/raw`` for ``cli watch``.
+
+No filesystem-event service is needed: each ``poll`` looks up the newest file
+matching every dataset's ``glob`` (the file ``run`` would ingest) and compares
+its name, size and mtime with the state last handed out. Changes are
+debounced: they are reported only once every pending dataset has been quiet
+for ``debounce`` seconds, so a copy still in progress or several drops in a
+row lead to a single pipeline run.
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# (path, size, mtime_ns) of a dataset's newest source, None without one
+Signature = Tuple[str, int, int]
+
+
+def latest_sources(raw_dir: Path, datasets: Dict[str, dict]) -> Dict[str, Signature | None]:
+    """The newest file per dataset glob, as picked by ``run``."""
+    found: Dict[str, Signature | None] = {}
+    for key, cfg in datasets.items():
+        pattern = cfg.get("glob")
+        stats = []
+        for path in Path(raw_dir).glob(pattern) if pattern else []:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                # Removed between glob and stat
+                continue
+            stats.append((st.st_mtime, (str(path), st.st_size, st.st_mtime_ns)))
+        found[key] = max(stats)[1] if stats else None
+    return found
+
+
+class Watcher:
+    """Debounced per-dataset change detection; the first ``poll`` compares against the state at construction."""
+
+    def __init__(
+        self,
+        raw_dir: Path,
+        datasets: Dict[str, dict],
+        debounce: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.raw_dir = Path(raw_dir)
+        self.datasets = datasets
+        self.debounce = debounce
+        self.clock = clock
+        self.current = latest_sources(self.raw_dir, datasets)
+        # dataset -> (signature seen, when it was first seen)
+        self._pending: Dict[str, Tuple[Signature | None, float]] = {}
+
+    def poll(self) -> List[str]:
+        """Datasets whose source changed, in config order, once all pending changes have settled."""
+        now = self.clock()
+        for key, signature in latest_sources(self.raw_dir, self.datasets).items():
+            if signature == self.current.get(key):
+                # Reverted (or never changed)
+                self._pending.pop(key, None)
+            elif key not in self._pending or self._pending[key][0] != signature:
+                self._pending[key] = (signature, now)
+        if not self._pending or any(now - since < self.debounce for _, since in self._pending.values()):
+            return []
+        changed = [key for key in self.datasets if key in self._pending]
+        for key in changed:
+            self.current[key] = self._pending.pop(key)[0]
+        return changed
+
+
+__all__ = ["latest_sources", "Watcher", "Signature"]
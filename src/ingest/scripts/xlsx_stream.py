@@ -0,0 +1,174 @@
+"""Streaming, column-projected reader for the first worksheet of an .xlsx file.
+
+openpyxl's read-only mode still builds a cell object per value; this reader
+walks the sheet XML with ``iterparse`` and only converts cells in the projected
+columns. Shared strings, date styles and the workbook epoch come from
+openpyxl's workbook loader so values match ``pd.read_excel`` exactly. Those
+are private openpyxl attributes: when a release drops them the reader raises
+``UnsupportedOpenpyxl`` and callers fall back to ``pd.read_excel``.
+"""
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from typing import Any, Iterable, Iterator, List
+
+import openpyxl
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+from pandas.io.parsers import TextParser
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+SHEET_DATA_TAG = f"{NS}sheetData"
+ROW_TAG = f"{NS}row"
+CELL_TAG = f"{NS}c"
+VALUE_TAG = f"{NS}v"
+INLINE_TAG = f"{NS}is"
+TEXT_TAG = f"{NS}t"
+RUN_TAG = f"{NS}r"
+
+_DIGITS = "0123456789"
+
+# Private openpyxl attributes the reader needs, as (owner, name)
+INTERNALS = (
+    ("worksheet", "_shared_strings"),
+    ("worksheet", "_get_source"),
+    ("workbook", "_date_formats"),
+    ("workbook", "_timedelta_formats"),
+)
+
+
+class UnsupportedOpenpyxl(RuntimeError):
+    """The installed openpyxl lacks the loader internals the reader relies on."""
+
+
+class _SheetContext:
+    def __init__(self, workbook, worksheet):
+        owners = {"workbook": workbook, "worksheet": worksheet}
+        missing = [f"{owner}.{name}" for owner, name in INTERNALS if not hasattr(owners[owner], name)]
+        if missing:
+            raise UnsupportedOpenpyxl(f"openpyxl {openpyxl.__version__} has no {', '.join(missing)}")
+        self.shared_strings = worksheet._shared_strings
+        self.epoch = workbook.epoch
+        self.date_formats = workbook._date_formats
+        self.timedelta_formats = workbook._timedelta_formats
+        self._columns: dict[str, int] = {}
+
+    def column(self, ref: str) -> int:
+        letters = ref.rstrip(_DIGITS)
+        idx = self._columns.get(letters)
+        if idx is None:
+            idx = self._columns[letters] = column_index_from_string(letters) - 1
+        return idx
+
+    def convert(self, el: ET.Element) -> Any:
+        # Mirrors openpyxl's WorkSheetParser.parse_cell followed by pandas'
+        # _convert_cell: blanks -> "", errors -> NaN, integral floats -> int
+        kind = el.get("t", "n")
+        if kind == "inlineStr":
+            node = el.find(INLINE_TAG)
+            if node is None:
+                return ""
+            text = node.find(TEXT_TAG)
+            if text is not None:
+                return text.text or ""
+            return "".join(run.findtext(TEXT_TAG) or "" for run in node.findall(RUN_TAG))
+
+        raw = el.findtext(VALUE_TAG) or None
+        if raw is None:
+            return ""
+        if kind == "n":
+            value = float(raw) if ("." in raw or "E" in raw or "e" in raw) else int(raw)
+            style = el.get("s")
+            if style and int(style) in self.date_formats:
+                try:
+                    return from_excel(value, self.epoch, timedelta=int(style) in self.timedelta_formats)
+                except (OverflowError, ValueError):
+                    return float("nan")
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            return value
+        if kind == "s":
+            return self.shared_strings[int(raw)]
+        if kind == "b":
+            return bool(int(raw))
+        if kind == "e":
+            return float("nan")
+        if kind == "d":
+            return from_ISO8601(raw)
+        return raw
+
+
+def iter_rows(raw_path: str, columns: Iterable[str] | None = None) -> Iterator[List[Any]]:
+    """Yield the header then each data row, restricted to ``columns`` when given."""
+    wb = load_workbook(raw_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb.worksheets[0]
+        ctx = _SheetContext(wb, ws)
+        wanted = set(columns) if columns is not None else None
+        keep: dict[int, int] | None = None
+        current: dict[int, Any] = {}
+        next_col = 0
+        expected_row = 1
+        sheet_data = None
+
+        with ws._get_source() as src:
+            for event, el in ET.iterparse(src, events=("start", "end")):
+                tag = el.tag
+                if event == "start":
+                    if tag == SHEET_DATA_TAG:
+                        sheet_data = el
+                    continue
+                if tag == CELL_TAG:
+                    ref = el.get("r")
+                    col = ctx.column(ref) if ref else next_col
+                    next_col = col + 1
+                    if keep is None or col in keep:
+                        current[col] = ctx.convert(el)
+                elif tag == ROW_TAG:
+                    row_number = int(el.get("r") or expected_row)
+                    # Drop finished rows so memory stays flat on large sheets
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    if keep is None:
+                        # Header row decides which physical columns survive
+                        keep = {
+                            col: pos
+                            for pos, col in enumerate(
+                                col for col, name in sorted(current.items())
+                                if name != "" and (wanted is None or str(name) in wanted)
+                            )
+                        }
+                        yield [current[col] for col in keep]
+                    else:
+                        for _ in range(expected_row, row_number):
+                            yield [""] * len(keep)
+                        row = [""] * len(keep)
+                        for col, value in current.items():
+                            pos = keep.get(col)
+                            if pos is not None:
+                                row[pos] = value
+                        yield row
+                    expected_row = row_number + 1
+                    current = {}
+                    next_col = 0
+    finally:
+        wb.close()
+
+
+def read_excel_stream(raw_path: str, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """Equivalent of ``pd.read_excel(raw_path)[columns]`` without loading unused cells."""
+    data: List[List[Any]] = []
+    last_with_data = 0
+    for row in iter_rows(raw_path, columns):
+        if any(v != "" for v in row):
+            last_with_data = len(data)
+        data.append(row)
+    if not data:
+        return pd.DataFrame()
+    # Trim trailing empty rows, as pandas does
+    return TextParser(data[: last_with_data + 1], header=0, skip_blank_lines=False).read()
+
+
+__all__ = ["UnsupportedOpenpyxl", "iter_rows", "read_excel_stream"]
@@ -3,3 +3,31 @@ import sys, pathlib
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+import pytest
+
+
+def make_raw_frame(n=6, offset=0):
+    """USDA-shaped rows suitable for writing to a staged workbook."""
+    return pd.DataFrame({
+        "listing_id": [offset + i + 1 for i in range(n)],
+        "listing_name": [f"Market {offset + i}" for i in range(n)],
+        "location_address": [f"{i} Main St, Columbus, Ohio {43200 + i}" for i in range(n)],
+        "location_x": [-83.0 - i * 0.01 for i in range(n)],
+        "location_y": [40.0 + i * 0.01 for i in range(n)],
+        "orgnization": ["Org"] * n,
+        "FNAP_1": [i % 2 for i in range(n)],
+        "FNAP_2": [1] * n,
+        "SNAP_option_1": [1] * n,
+        "SNAP_option_2": [0] * n,
+    })
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Run the CLI helpers against an empty repo-shaped directory."""
+    (tmp_path / "ingest").symlink_to(ROOT / "src" / "ingest", target_is_directory=True)
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
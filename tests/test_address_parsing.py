@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from ingest.scripts.enrich import STATE_MAP, _parse_address, parse_addresses
+
+CASES = [
+    "123 Main St, Columbus, Ohio 43215",
+    "Somewhere in Alaska",
+    "10 Market Rd, Miami, FL 33101",
+    "6601 Biscayne Blvd, Miami, FL 33138",
+    "1 Main St, Columbus, OH 43215, USA",
+    "123456789",
+    "1234567890",
+    "12345-67890 x",
+    "x\nOhio\n43215",
+    "a\tb\tc OH",
+    "Columbia",
+    "PO Box 12345, Springfield, IL",
+    "Route 9; Hudson; New York 12534-1234",
+    "\xa0 44 Elm\xa0Street, Burlington, vt\xa0",
+    "Farm Rd,, , TX",
+    "OH 43215",
+    "Main St Kansas City Missouri",
+    "",
+    "   ",
+    None,
+    np.nan,
+    pd.NA,
+    43215,
+    4.5,
+]
+
+
+def fuzz_addresses(n, seed=20250901):
+    rng = random.Random(seed)
+    states = list(STATE_MAP) + sorted(set(STATE_MAP.values())) + ["Wash", "Ont", "D.C.", "XX"]
+    streets = ["123 Main St", "PO Box 77", "4500 N. Country Club Rd Suite 12", "Farm", "", "Hwy 1 & 5th",
+               "10 Ocean Blvd Apt 5B", "Rural Route 3 Box 12345", "1 Café Plaza"]
+    cities = ["Columbus", "Columbia", "Kansas City", "Washington", "St. Louis", "Indianapolis", "", "Alexandria",
+              "New York", "Nome", "Us", "Virginia Beach", "São Paulo"]
+    countries = ["", "", "", " USA", ", USA", ", U.S.A.", " United States", ", united states of america", " us"]
+    seps = [", ", " ", "; ", ",", "\n", ",, ", "\xa0"]
+    out = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.03:
+            out.append(rng.choice([None, np.nan, pd.NA, "", " ", 90210, 12.5]))
+            continue
+        state = rng.choice(states)
+        if rng.random() < 0.3:
+            state = state.upper() if rng.random() < 0.5 else state.title()
+        zipcode = rng.choice(["", f"{rng.randint(0, 99999):05d}", f"{rng.randint(0, 99999):05d}-{rng.randint(0, 9999):04d}",
+                              str(rng.randint(0, 9999)), str(rng.randint(100000, 9999999))])
+        parts = [rng.choice(streets), rng.choice(cities), state]
+        if zipcode:
+            parts.append(zipcode) if rng.random() < 0.8 else parts.insert(rng.randint(0, 2), zipcode)
+        rng.shuffle(parts) if rng.random() < 0.1 else None
+        text = ""
+        for part in parts:
+            text = f"{text}{rng.choice(seps)}{part}" if text else part
+        text += rng.choice(countries)
+        if rng.random() < 0.1:
+            text = rng.choice([" ", "\t", "\xa0", ";"]) + text + rng.choice([" ", ",", "\xa0", ";"])
+        out.append(text)
+    return out
+
+
+def expected_rows(values):
+    return [_parse_address(v) for v in values]
+
+
+def actual_rows(values, dtype=object):
+    parsed = parse_addresses(pd.Series(values, dtype=dtype))
+    assert list(parsed.columns) == ["street", "city", "state", "zip"]
+    return [tuple(row) for row in parsed.itertuples(index=False)]
+
+
+def test_parse_addresses_matches_scalar_parser_on_known_cases():
+    assert actual_rows(CASES) == expected_rows(CASES)
+
+
+def test_parse_addresses_matches_scalar_parser_on_string_dtype():
+    values = pd.Series([c for c in CASES if not isinstance(c, (int, float))], dtype="string")
+    parsed = parse_addresses(values)
+    assert [tuple(r) for r in parsed.itertuples(index=False)] == [_parse_address(v) for v in values]
+
+
+def test_parse_addresses_matches_scalar_parser_on_fuzzed_corpus():
+    corpus = fuzz_addresses(20000)
+    assert actual_rows(corpus) == expected_rows(corpus)
+
+
+def test_parse_addresses_keeps_index_and_handles_empty_input():
+    values = pd.Series(["1 Main St, Columbus, OH 43215"], index=[42])
+    assert parse_addresses(values).index.tolist() == [42]
+    assert parse_addresses(pd.Series([], dtype=object)).empty
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingest.scripts import arrow_backend, cli
+from ingest.scripts.enrich import enrich_rows
+from ingest.scripts.validate import row_reject_reasons
+from conftest import make_raw_frame
+
+def python_bool(series):
+    # The per-value rule schema bool coercion has always followed
+    return series.map(lambda v: bool(int(v)) if pd.notna(v) and str(v).strip().isdigit() else bool(v) if pd.notna(v) else False)
+
+
+TRICKY = [" Columbus ", "Zürich ", "tab\there", "sep\x1cend\x1f", "", "   ", None, np.nan, "0042", " 0 ", "no"]
+
+
+def test_coerce_str_matches_pandas():
+    for values in (TRICKY, [1.0, 2.5, None], [1, 2, 3]):
+        series = pd.Series(values, dtype=object if values is TRICKY else None)
+        expected = series.astype("string").str.strip()
+        got = arrow_backend.coerce_str(series)
+        assert got.dtype == arrow_backend.STRING_DTYPE
+        assert got.astype(object).where(got.notna(), None).tolist() == expected.astype(object).where(expected.notna(), None).tolist()
+
+
+def test_coerce_bool_matches_python_and_defers_mixed_columns():
+    for values in (TRICKY, [0, 1, 2, None], [0.0, 0.5, np.nan], [True, False]):
+        series = pd.Series(values)
+        expected = python_bool(series).astype(bool)
+        pd.testing.assert_series_equal(arrow_backend.coerce_bool(series), expected, check_names=False)
+    assert arrow_backend.coerce_bool(pd.Series(["yes", 1, None], dtype=object)) is None
+
+
+def test_arrow_kernels_match_pandas_on_tricky_rows():
+    df = pd.DataFrame({
+        "listing_id": [str(i) for i in range(len(TRICKY))],
+        "listing_name": TRICKY,
+        "city": TRICKY[::-1],
+        "state": ["OH", "ohio", None, "Zürich", "", "CA", "oh", "TX", "NY", "wa", "\x1eOH"],
+        "zip": ["43201", "4320", "Zip 12345-6789", None, "", "１２３４５", "00000 ", "1234567", "a12345", "43201\x1c", "x"],
+        "location_address": [
+            "1 Main St, Columbus, OH 43201", "Zürich, ZH 80001", None, "", "5 Elm, Troy, NY １２３４５",
+            "9 Oak Ave, St. Paul,  mn 55101-1234", "x\x1cy, Austin, tx 73301", "PO Box 4, Ohio 4320", "no zip",
+            " 7 Pine Rd , Salem , Oregon 97301 ", "Québec City, QC",
+        ],
+        "latitude": [40.0, 91.0, np.nan, 40.0, -90.0, 10.0, 0.0, 1.0, 2.0, 3.0, 4.0],
+        "longitude": [-83.0, -83.0, 0.0, np.nan, 181.0, 10.0, 0.0, 1.0, 2.0, 3.0, 4.0],
+    })
+    arrow_df = df.astype({c: arrow_backend.STRING_DTYPE for c in ("listing_id", "listing_name", "city", "state", "zip", "location_address")})
+
+    pd.testing.assert_series_equal(row_reject_reasons(arrow_df, backend="arrow"), row_reject_reasons(df))
+    expected = enrich_rows(df)
+    got = enrich_rows(arrow_df, backend="arrow")
+    for column in ("zip", "search_city", "search_state", "search_zip", "search_city_norm", "search_state_norm"):
+        values = got[column].astype(object).where(got[column].notna(), None).tolist()
+        assert values == expected[column].astype(object).where(expected[column].notna(), None).tolist(), column
+
+
+def test_check_backend_rejects_unknown():
+    with pytest.raises(ValueError):
+        arrow_backend.check_backend("polars")
+
+
+def test_arrow_run_writes_identical_artifacts(workspace):
+    raw = make_raw_frame(8)
+    raw.loc[2, "location_address"] = "12 Rue Café, Montréal, Québec 43210"
+    raw.loc[3, "listing_id"] = raw.loc[2, "listing_id"]
+    raw.loc[5, "location_y"] = 123.0
+    raw.to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    make_raw_frame(3, offset=20).to_excel(workspace / "data" / "raw" / "csa_2025-01-01.xlsx", index=False)
+
+    outputs = {}
+    for backend in arrow_backend.BACKENDS:
+        assert cli._run(None, None, True, 1, False, backend=backend)
+        site = workspace / "site" / "static" / "data"
+        files = sorted(site.rglob("*.json")) + sorted((workspace / "data" / "processed").glob("*.csv"))
+        outputs[backend] = {
+            "files": {str(p.relative_to(workspace)): p.read_bytes() for p in files},
+            "full": pq.read_table(workspace / "data" / "processed" / "markets.full.parquet"),
+        }
+
+    pandas_out, arrow_out = outputs["pandas"], outputs["arrow"]
+    assert pandas_out["files"] and pandas_out["files"] == arrow_out["files"]
+    # Same values; the Arrow run keeps its string columns as large_string
+    full = arrow_out["full"].replace_schema_metadata(None)
+    assert full.cast(pandas_out["full"].schema.remove_metadata()).equals(pandas_out["full"].replace_schema_metadata(None))
+    assert pa.types.is_large_string(full.schema.field("search_zip").type)
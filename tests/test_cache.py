@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+
+from ingest.scripts import cache, cli
+from conftest import make_raw_frame
+
+
+def make_df():
+    return pd.DataFrame({
+        "listing_id": pd.Series(["1", "2"], dtype="string"),
+        "longitude": [-81.0, -82.5],
+        "FNAP_1": [True, False],
+        "update_time": pd.to_datetime(["2025-01-01", None], utc=True),
+    })
+
+
+def test_cache_roundtrip_preserves_frame(tmp_path):
+    df = make_df()
+    key = cache.cache_key("source-sha", "schema-sha")
+    assert cache.load(key, tmp_path) is None
+    assert cache.store(key, df, tmp_path)
+    loaded = cache.load(key, tmp_path)
+    pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_cache_key_depends_on_every_part():
+    base = cache.cache_key("a", "b")
+    assert base == cache.cache_key("a", "b")
+    assert base != cache.cache_key("a", "c")
+    assert base != cache.cache_key("ab", "")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    df = make_df()
+    for i, key in enumerate(["old", "mid", "new"]):
+        cache.store(key, df, tmp_path)
+        os.utime(tmp_path / f"{key}.parquet", (1000 + i, 1000 + i))
+
+    removed = cache.evict(tmp_path, max_entries=2, max_bytes=None)
+    assert removed == ["old"]
+    assert cache.load("mid", tmp_path) is not None
+
+    # "mid" was just touched by load, so "new" is now the LRU entry
+    removed = cache.evict(tmp_path, max_entries=1, max_bytes=None)
+    assert removed == ["new"]
+
+
+def test_cache_summary_counts_hits_and_misses():
+    meta = [{"cache": "hit"}, {"cache": "miss"}, {"cache": "hit"}]
+    assert cache.summarize(meta) == {"enabled": True, "hits": 2, "misses": 1}
+    assert cache.summarize([{"cache": "disabled"}])["enabled"] is False
+
+
+def test_parser_edits_invalidate_cached_frames(workspace, monkeypatch):
+    src = workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx"
+    make_raw_frame().to_excel(src, index=False)
+    scripts = workspace / "scripts"
+    scripts.mkdir()
+    for path in cli.SCRIPTS_DIR.glob("*.py"):
+        (scripts / path.name).write_bytes(path.read_bytes())
+    monkeypatch.setattr(cli, "SCRIPTS_DIR", scripts)
+
+    def state():
+        return cli._ingest_cached(src, cli.SCHEMA, "source-sha", use_cache=True)[1]
+
+    assert (state(), state()) == ("miss", "hit")
+    for module in cli.INGEST_MODULES:
+        with open(scripts / f"{module}.py", "a", encoding="utf-8") as f:
+            f.write("\n# edited\n")
+        assert (state(), state()) == ("miss", "hit")
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from ingest.scripts.centroids import compute_centroids
+from ingest.scripts.enrich import with_zip_means
+
+
+def frame(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "zip": rng.choice(["", "30303", "30305", "12345", "99501"], n),
+        "search_city_norm": rng.choice(["", "atlanta", "springfield", "salem"], n),
+        "search_state_norm": rng.choice(["", "GA", "IL"], n),
+        "latitude": rng.uniform(-90, 90, n),
+        "longitude": rng.uniform(-180, 180, n),
+    })
+    df.loc[df.index % 9 == 0, "latitude"] = np.nan
+    # salem is only ever seen in one state, springfield always has one
+    df.loc[df["search_city_norm"] == "salem", "search_state_norm"] = df["search_state_norm"].replace("GA", "IL")
+    df.loc[(df["search_city_norm"] == "springfield") & (df["search_state_norm"] == ""), "search_state_norm"] = "GA"
+    return with_zip_means(df)
+
+
+def test_zip_centroids_match_per_group_means_bit_for_bit():
+    df = frame()
+    zips = compute_centroids(df).zip_centroids()
+    coords = df.dropna(subset=["zip_lat", "zip_lon"])
+    for zip_code, group in coords.groupby("zip"):
+        if zip_code:
+            assert zips[zip_code] == [float(group["zip_lat"].mean()), float(group["zip_lon"].mean())]
+    prefixes = coords.assign(prefix=coords["zip"].str[:3]).groupby("prefix")[["zip_lat", "zip_lon"]].mean()
+    assert zips["303"] == prefixes.loc["303"].tolist()
+    assert "" not in zips
+
+
+def test_city_centroids_and_single_state_fallbacks():
+    df = frame()
+    cities = compute_centroids(df).city_centroids()
+    grouped = df.dropna(subset=["latitude"]).groupby(["search_city_norm", "search_state_norm"])
+    means, counts = grouped[["latitude", "longitude"]].mean(), grouped.size()
+    assert cities["atlanta|GA"] == means.loc[("atlanta", "GA")].tolist()
+    assert cities["salem|IL"] == means.loc[("salem", "IL")].tolist()
+    # Seen in two states: no state-less fallback
+    assert "springfield" not in cities and "springfield|GA" in cities
+    # salem's rows without a state already give the state-less key
+    assert cities["salem"] == means.loc[("salem", "")].tolist()
+
+    single = df[df["search_city_norm"].isin(["salem"]) & (df["search_state_norm"] == "IL")]
+    fallback = compute_centroids(single).city_centroids()["salem"]
+    lat = 0.0 + means.loc[("salem", "IL"), "latitude"] * counts.loc[("salem", "IL")]
+    assert fallback[0] == lat / counts.loc[("salem", "IL")]
+
+
+def test_empty_frame_has_no_centroids():
+    centroids = compute_centroids(frame().iloc[:0])
+    assert centroids.zip_centroids() == {} and centroids.city_centroids() == {}
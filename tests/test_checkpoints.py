@@ -0,0 +1,119 @@
+import json
+
+import pandas as pd
+import pytest
+import typer
+
+from ingest.scripts import checkpoints, cli
+from conftest import make_raw_frame
+
+
+def site_files(workspace):
+    site = workspace / "site" / "static" / "data"
+    return {p.name: p.read_bytes() for p in site.glob("*.json") if p.name != "artifacts.json"}
+
+
+def write_sources(workspace, n=6):
+    raw = make_raw_frame(n)
+    raw.loc[1, "location_y"] = 123.0
+    raw.to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+
+
+def test_checkpoint_roundtrip_and_staleness(tmp_path):
+    df = pd.DataFrame({"record_id": pd.Series(["a", "b"], dtype="string"), "latitude": [40.0, None]})
+    assert checkpoints.status("validate", "k1", tmp_path) == "missing"
+    assert checkpoints.save("validate", [df, df.iloc[:0]], "k1", {"sources": [{"dataset": "x"}]}, tmp_path)
+
+    assert checkpoints.status("validate", "k1", tmp_path) == "current"
+    assert checkpoints.status("validate", "k2", tmp_path) == "stale"
+    (valid, rejects), info = checkpoints.load("validate", tmp_path)
+    pd.testing.assert_frame_equal(valid, df)
+    assert rejects.empty and info == {"sources": [{"dataset": "x"}]}
+
+    assert checkpoints.invalidate(["validate", "map"], tmp_path) == ["validate"]
+    assert checkpoints.status("validate", "k1", tmp_path) == "missing"
+
+
+def test_stage_keys_chain():
+    ingest = checkpoints.stage_key("", "source-sha")
+    assert checkpoints.stage_key(ingest, "mapping") != checkpoints.stage_key(checkpoints.stage_key("", "other"), "mapping")
+
+
+def test_run_from_export_reuses_validated_checkpoint(workspace):
+    write_sources(workspace)
+    manifest = cli._run(None, None, True, 1, False)
+    assert manifest["checkpoints"]["written"] == ["ingest", "map", "enrich", "validate"]
+    expected = site_files(workspace)
+
+    for path in (workspace / "site" / "static" / "data").glob("*.json"):
+        path.unlink()
+    manifest = cli._run(None, None, True, 1, False, start="export")
+    assert manifest["checkpoints"]["loaded"] == "validate"
+    assert manifest["checkpoints"]["written"] == []
+    assert site_files(workspace) == expected
+    stored = json.loads((workspace / "data" / "processed" / "manifest.json").read_text())
+    assert stored["checkpoints"]["loaded"] == "validate" and stored["records_rejected"] == 1
+    # The per-rule report travels with the validated checkpoint
+    assert stored["validation"]["rules"]["latitude_range"]["rejected"] == 1
+
+
+def test_run_to_stops_early_and_from_resumes(workspace):
+    write_sources(workspace)
+    report = cli._run(None, None, True, 1, False, stop="enrich")
+    assert report == {"checkpoints": {
+        "start": "ingest", "stop": "enrich", "loaded": None, "written": ["ingest", "map", "enrich"], "invalidated": [],
+    }}
+    assert not (workspace / "data" / "processed" / "manifest.json").exists()
+
+    manifest = cli._run(None, None, True, 1, False, start="validate")
+    assert manifest["checkpoints"]["loaded"] == "enrich"
+    assert manifest["checkpoints"]["written"] == ["validate"]
+    assert manifest["records_valid"] == 5
+
+
+def test_stale_checkpoints_are_rebuilt(workspace):
+    write_sources(workspace)
+    cli._run(None, None, True, 1, False)
+    # Changed sources make every checkpoint stale
+    write_sources(workspace, n=8)
+    manifest = cli._run(None, None, True, 1, False, start="export")
+    assert manifest["checkpoints"]["start"] == "ingest"
+    assert manifest["checkpoints"]["invalidated"] == ["validate", "enrich", "map", "ingest"]
+    assert manifest["records_valid"] == 7
+
+    # A checkpoint written for other inputs is replaced, earlier ones are reused
+    keys = cli._checkpoint_keys(None, False, "pandas")
+    (valid, rejects), info = checkpoints.load("validate", cli.STAGE_DIR)
+    checkpoints.save("validate", [valid, rejects], "outdated", info, cli.STAGE_DIR)
+    manifest = cli._run(None, None, True, 1, False, start="export")
+    assert manifest["checkpoints"]["loaded"] == "enrich"
+    assert checkpoints.status("validate", keys["validate"], cli.STAGE_DIR) == "current"
+
+
+def test_coercion_code_is_part_of_the_ingest_key(workspace, monkeypatch):
+    write_sources(workspace)
+    scripts = workspace / "scripts"
+    scripts.mkdir()
+    for path in cli.SCRIPTS_DIR.glob("*.py"):
+        (scripts / path.name).write_bytes(path.read_bytes())
+    monkeypatch.setattr(cli, "SCRIPTS_DIR", scripts)
+    before = cli._checkpoint_keys(None, False, "pandas")
+    with open(scripts / "coerce.py", "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    after = cli._checkpoint_keys(None, False, "pandas")
+    assert all(before[stage] != after[stage] for stage in before)
+
+    with open(scripts / "centroids.py", "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    edited = cli._checkpoint_keys(None, False, "pandas")
+    assert edited["map"] == after["map"] and edited["enrich"] != after["enrich"]
+
+
+def test_stage_selection_is_checked():
+    with pytest.raises(typer.BadParameter):
+        cli._check_stages("export", "validate", False)
+    with pytest.raises(typer.BadParameter):
+        cli._check_stages("enrich", "export", True)
+    with pytest.raises(typer.BadParameter):
+        cli._check_stages("ingest", "done", False)
+    cli._check_stages("export", "export", True)
@@ -0,0 +1,80 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest.scripts import coerce
+from ingest.scripts.ingest_excel import apply_schema, load_config
+from conftest import make_raw_frame
+
+SCHEMA = "ingest/config/schema.yml"
+
+
+def python_bool(series):
+    return series.map(lambda v: bool(int(v)) if pd.notna(v) and str(v).strip().isdigit() else bool(v) if pd.notna(v) else False)
+
+
+def legacy_apply_schema(df):
+    # apply_schema before the coercion engine: per-value bools, then a strip over every column
+    _, rename, dtypes = load_config(SCHEMA)
+    df = df.rename(columns={k: v for k, v in rename.items() if k in df.columns})
+    for col, typ in dtypes.items():
+        if col not in df.columns:
+            continue
+        if typ == "datetime":
+            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
+        elif typ == "float":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        elif typ == "bool":
+            df[col] = python_bool(df[col])
+        elif typ == "str":
+            df[col] = df[col].astype("string").str.strip()
+    return df.apply(lambda s: s.str.strip() if s.dtype == "string" else s)
+
+
+def test_bool_matches_python_rule_and_counts_truthiness_only_values():
+    cases = [
+        ([" 1 ", "0", "0042", "", None, "yes", "１"], 1),
+        ([1, 0, None, True, "1", " 0 ", "x", dt.date(2025, 1, 1), np.nan], 2),
+        ([0.0, 2.5, np.nan], 0),
+        ([True, False], 0),
+    ]
+    for values, failed in cases:
+        series = pd.Series(values)
+        got, n = coerce.coerce_column(series, "bool")
+        pd.testing.assert_series_equal(got, python_bool(series).astype(bool))
+        assert n == failed, values
+
+
+def test_numeric_and_datetime_failures_skip_blank_values():
+    series = pd.Series(["1.5", " ", None, "abc", 3, "2"], dtype=object)
+    values, failed = coerce.coerce_column(series, "float")
+    assert failed == 1 and values.isna().sum() == 3
+
+    ints, failed = coerce.coerce_column(series, "int")
+    assert ints.dtype == "Int64" and failed == 2
+    assert ints.tolist()[3:] == [pd.NA, 3, 2]
+
+    dates, failed = coerce.coerce_column(pd.Series(["2025-01-02", "soon", "", None]), "datetime")
+    assert failed == 1 and str(dates.dtype) == "datetime64[ns, UTC]"
+
+
+def test_category_and_unknown_dtype():
+    values, failed = coerce.coerce_column(pd.Series([" OH", "OH ", None]), "category")
+    assert failed == 0 and values.dtype == "category" and values.cat.categories.tolist() == ["OH"]
+    with pytest.raises(ValueError, match="Unknown schema dtype"):
+        coerce.coerce_column(pd.Series([1]), "decimal")
+
+
+def test_apply_schema_matches_legacy_coercion():
+    raw = make_raw_frame(50)
+    raw[["FNAP_1", "FNAP_2"]] = raw[["FNAP_1", "FNAP_2"]].astype(object)
+    raw.loc[::7, "FNAP_2"] = "1"
+    raw.loc[3, "FNAP_1"] = "yes"
+    raw["notes"] = pd.Series(["  keep  "] * len(raw), dtype="string")
+    report = {}
+    got = apply_schema(raw.copy(), SCHEMA, report=report)
+    pd.testing.assert_frame_equal(got, legacy_apply_schema(raw.copy()))
+    assert report["FNAP_1"] == {"dtype": "bool", "failed": 1}
+    assert report["longitude"] == {"dtype": "float", "failed": 0}
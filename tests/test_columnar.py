@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ingest.scripts.columnar import decode_columnar, dumps, encode_columnar, row_bytes, row_records
+from ingest.scripts.export_artifacts import export_from_profile
+
+
+def make_df(n=40):
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "record_id": [f"fm:{i}" for i in range(n)],
+        "listing_type_label": rng.choice(["Farmers Market", "CSA", "On-Farm Market"], n),
+        "state": pd.Series(rng.choice(["OH", "FL", None], n), dtype=object),
+        "latitude": np.where(rng.random(n) < 0.2, np.nan, rng.uniform(25, 48, n)),
+        "program_snap": rng.random(n) < 0.5,
+        "program_wic": rng.random(n) < 0.3,
+        "program_incentives": pd.array(rng.choice([True, False, None], n), dtype="boolean"),
+        "update_time": pd.to_datetime(["2025-01-01"] * (n - 1) + [None], utc=True),
+        "visits": rng.integers(0, 100, n),
+    })
+
+
+def test_roundtrip_matches_row_records():
+    df = make_df()
+    payload = encode_columnar(df)
+    assert decode_columnar(json.loads(json.dumps(payload))) == row_records(df)
+
+
+def test_encoding_choices():
+    payload = encode_columnar(make_df())
+    columns = payload["columns"]
+    assert "dictionary" in columns["listing_type_label"]
+    assert "dictionary" in columns["state"] and None in columns["state"]["dictionary"]
+    # Unique ids and numbers stay plain
+    assert "values" in columns["record_id"] and "values" in columns["latitude"]
+    # Flags without nulls are packed; the nullable one stays a plain column
+    assert payload["bitmasks"][0]["fields"] == ["program_snap", "program_wic"]
+    assert "program_incentives" in columns and "program_snap" not in columns
+
+
+def test_bitmasks_hold_at_most_31_flags():
+    df = pd.DataFrame({f"flag_{i}": [i % 2 == 0, True] for i in range(40)})
+    payload = encode_columnar(df)
+    assert [len(m["fields"]) for m in payload["bitmasks"]] == [31, 9]
+    assert all(v < 2 ** 31 for m in payload["bitmasks"] for v in m["values"])
+    assert decode_columnar(payload) == row_records(df)
+
+
+def test_chunked_encoding_and_row_size():
+    df = make_df(50)
+    df.loc[0, "record_id"] = "fm:Marché"
+    assert encode_columnar(df, chunk_rows=7) == encode_columnar(df)
+    assert row_bytes(df, chunk_rows=7) == len(dumps(row_records(df)).encode("utf-8"))
+
+
+def test_empty_frame_roundtrip():
+    df = make_df().iloc[:0]
+    assert decode_columnar(encode_columnar(df)) == []
+
+
+def test_export_reports_sizes_against_row_format(tmp_path):
+    out = tmp_path / "map.columnar.json"
+    profile = {"map_columnar": {"path": str(out), "format": "columnar", "fields": ["record_id", "state", "program_snap"]}}
+    path = tmp_path / "profiles.yml"
+    path.write_text(yaml.safe_dump(profile), encoding="utf-8")
+    sizes = {}
+    df = make_df(500)
+    export_from_profile(df, str(path), sizes)
+    report = sizes["map_columnar"]
+    assert report["bytes"] == out.stat().st_size
+    assert report["bytes"] < report["row_bytes"]
+    assert decode_columnar(json.loads(out.read_text(encoding="utf-8"))) == row_records(df[["record_id", "state", "program_snap"]])
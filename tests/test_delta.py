@@ -0,0 +1,70 @@
+import json
+from hashlib import sha256
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from ingest.scripts import delta
+from ingest.scripts.cli import APP
+from conftest import make_raw_frame
+
+
+def frame(**changes):
+    df = pd.DataFrame({
+        "record_id": ["fm:1", "fm:2", "fm:3"],
+        "listing_name": ["A", "B", "C"],
+        "latitude": [40.0, 41.0, None],
+        "accepts_snap": [True, False, True],
+    })
+    return df.assign(**changes)
+
+
+def as_records(df):
+    fields, records = delta.snapshot_records(df)
+    return {rid: dict(zip(fields, values)) for rid, values in records.items()}
+
+
+def test_delta_reports_field_level_changes(tmp_path):
+    snap, out = tmp_path / "snapshot.json.gz", tmp_path / "deltas"
+    first = delta.write_delta(frame(), None, snap, out)
+    assert first["baseline"] is True and first["path"] is None
+
+    new = pd.concat([frame(listing_name=["A", "Bee", "C"]).drop(index=2), frame().iloc[[0]].assign(record_id="fm:9")])
+    entry = delta.write_delta(new, "abc", snap, out)
+    assert (entry["added"], entry["removed"], entry["changed"]) == (1, 1, 1)
+    assert entry["from_sha256"] == first["to_sha256"]
+
+    payload = json.loads(open(entry["path"], encoding="utf-8").read())
+    assert payload["previous_manifest_sha256"] == "abc"
+    assert payload["removed"] == ["fm:3"]
+    assert payload["changed"] == [{"record_id": "fm:2", "changes": {"listing_name": ["B", "Bee"]}}]
+    assert delta.apply_delta(as_records(frame()), payload) == as_records(new)
+
+
+def test_delta_handles_schema_changes_and_no_ops(tmp_path):
+    snap, out = tmp_path / "snapshot.json.gz", tmp_path / "deltas"
+    delta.write_delta(frame(), None, snap, out)
+    assert delta.write_delta(frame(), None, snap, out)["path"] is None
+
+    new = frame(zip=["43215", "43215", "43210"]).drop(columns=["accepts_snap"])
+    entry = delta.write_delta(new, None, snap, out)
+    payload = json.loads(open(entry["path"], encoding="utf-8").read())
+    assert payload["dropped_fields"] == ["accepts_snap"]
+    assert entry["changed"] == 3
+    assert delta.apply_delta(as_records(frame()), payload) == as_records(new)
+
+
+def test_run_links_previous_manifest(workspace):
+    raw = make_raw_frame()
+    raw.to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    runner = CliRunner()
+    assert runner.invoke(APP, ["run", "--no-cache"]).exit_code == 0
+    manifest = workspace / "data" / "processed" / "manifest.json"
+    first_sha = sha256(manifest.read_bytes()).hexdigest()
+
+    raw.loc[0, "listing_name"] = "Renamed Market"
+    raw.to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    assert runner.invoke(APP, ["run", "--no-cache"]).exit_code == 0
+    entry = json.loads(manifest.read_text())["delta"]
+    assert entry["previous_manifest_sha256"] == first_sha
+    assert (entry["added"], entry["removed"], entry["changed"]) == (0, 0, 1)
@@ -0,0 +1,116 @@
+import json
+
+import numpy as np
+import pandas as pd
+from typer.testing import CliRunner
+
+from ingest.scripts.cli import APP
+from ingest.scripts.duplicates import block_pairs, canonical_records, duplicate_clusters, find_duplicates, load_config
+from conftest import make_raw_frame
+
+CONFIG = "src/ingest/config/dedupe.yml"
+
+
+def clusters(n_markets=60, seed=7):
+    """Markets in a tight area, each listed by 1-3 datasets with reworded names and addresses."""
+    rng = np.random.default_rng(seed)
+    words = ["maple", "cedar", "river", "union", "prairie", "harbor", "summit", "willow", "orchard", "valley"]
+    rows = []
+    for m in range(n_markets):
+        name = f"{words[m % 10]} {words[(m // 10) % 10]} {m}"
+        number = 100 + m
+        lat, lon = 39.9 + rng.uniform(0, 0.2), -83.1 + rng.uniform(0, 0.2)
+        zip_code = f"432{m % 20:02d}"
+        datasets = rng.choice(["farmers_market", "csa", "on_farm_market"], rng.integers(1, 4), replace=False)
+        for k, dataset in enumerate(datasets):
+            rows.append({
+                "record_id": f"{dataset}:{m}",
+                "source_dataset": dataset,
+                "listing_name": [f"{name} Farmers Market", f"The {name} CSA", f"{name.title()} Farm Stand"][k],
+                "full_address": [
+                    f"{number} Main Street, Columbus, OH, {zip_code}",
+                    f"{number} Main St, Columbus, OH {zip_code}",
+                    f"{number} MAIN ST., Columbus, Ohio",
+                ][k],
+                "zip": zip_code if k < 2 else "",
+                "latitude": lat + rng.normal(0, 0.0002),
+                "longitude": lon + rng.normal(0, 0.0002),
+                "truth": m,
+            })
+    return pd.DataFrame(rows).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_synthetic_clusters_are_recovered_exactly():
+    df = clusters()
+    # The second listings lost their coordinates: the ZIP block still pairs them
+    df.loc[df["listing_name"].str.startswith("The "), ["latitude", "longitude"]] = np.nan
+    report = {}
+    cluster_ids = find_duplicates(df, load_config(CONFIG), report)
+
+    assert cluster_ids.equals(df.groupby("truth")["record_id"].transform("min").rename("cluster_id").astype(object))
+    assert report["duplicate_pairs"] > 0
+    assert report["compared_pairs"] < len(df) * (len(df) - 1) // 2
+
+
+def test_similar_names_at_other_addresses_stay_apart():
+    df = pd.DataFrame({
+        "record_id": ["farmers_market:1", "csa:1", "csa:2", "farmers_market:2"],
+        "source_dataset": ["farmers_market", "csa", "csa", "farmers_market"],
+        "listing_name": ["Riverside Market", "Riverside CSA", "Riverside Market", "Hilltop Orchard"],
+        "full_address": ["10 Oak Road, Salem, MA, 01970", "10 Oak Rd, Salem, MA 01970", "850 Oak Rd, Salem, MA 01970", "10 Oak Rd, Salem, MA 01970"],
+        "zip": ["01970"] * 4,
+        "latitude": [42.5, np.nan, 42.6, 42.5],
+        "longitude": [-70.9, np.nan, -70.8, -70.9],
+    })
+    cluster_ids = find_duplicates(df, load_config(CONFIG))
+    assert cluster_ids.tolist() == ["csa:1", "csa:1", "csa:2", "farmers_market:2"]
+    # Two listings of one dataset are never paired directly
+    same = find_duplicates(df.assign(source_dataset="csa"), load_config(CONFIG))
+    assert same.nunique() == 4
+
+
+def test_block_pairs_window_large_blocks():
+    keys = np.array([0, 0, 0, 1, 1, 1, 1, 1, -1])
+    rank = np.arange(len(keys))
+    a, b = block_pairs(keys, rank, max_block=3, window=2)
+    pairs = sorted(zip(a.tolist(), b.tolist()))
+    assert pairs == [(0, 1), (0, 2), (1, 2), (3, 4), (3, 5), (4, 5), (4, 6), (5, 6), (5, 7), (6, 7)]
+
+
+def test_canonical_records_merge_clusters():
+    df = pd.DataFrame({
+        "record_id": ["csa:7", "farmers_market:3", "csa:8"],
+        "source_dataset": ["csa", "farmers_market", "csa"],
+        "listing_name": ["River CSA", "River Market", "Other"],
+        "organization": ["River Org", None, None],
+        "program_snap": [True, False, False],
+    })
+    cluster_ids = pd.Series(["csa:7", "csa:7", "csa:8"])
+    out = canonical_records(df, cluster_ids, ["farmers_market", "csa"])
+    assert out["cluster_id"].tolist() == ["csa:7", "csa:8"]
+    first = out.iloc[0]
+    # The farmers market listing leads, gaps and flags come from the CSA one
+    assert (first["listing_name"], first["organization"], bool(first["program_snap"])) == ("River Market", "River Org", True)
+    assert (first["cluster_size"], first["cluster_records"], first["cluster_datasets"]) == (2, "csa:7;farmers_market:3", "csa;farmers_market")
+    assert out.iloc[1]["cluster_records"] == "csa:8"
+
+    dups = duplicate_clusters(df.assign(full_address="", latitude=0.0, longitude=0.0), cluster_ids)
+    assert dups["record_id"].tolist() == ["csa:7", "farmers_market:3"]
+
+
+def test_run_writes_duplicate_clusters(workspace):
+    raw = workspace / "data" / "raw"
+    make_raw_frame(3).to_excel(raw / "farmersmarket_2025-01-01.xlsx", index=False)
+    # Same markets under other listing ids
+    csa = make_raw_frame(3, offset=10).assign(listing_name=["The Market 0", "Market 1 CSA", "Market 2"])
+    csa.to_excel(raw / "csa_2025-01-01.xlsx", index=False)
+    result = CliRunner().invoke(APP, ["run", "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    manifest = json.loads((workspace / "data" / "processed" / "manifest.json").read_text())
+    entry = manifest["duplicates"]
+    assert (entry["clusters"], entry["records_in_clusters"]) == (3, 6)
+    dups = pd.read_csv(workspace / entry["path"])
+    assert set(dups["cluster_id"]) == {"csa:11", "csa:12", "csa:13"}
+    canonical = pd.read_parquet(workspace / entry["canonical_path"])
+    assert len(canonical) == 3 and (canonical["source_dataset"] == "farmers_market").all()
@@ -1,7 +1,18 @@
+import random
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from ingest.scripts.enrich import enrich_markets, generate_zip_centroids, generate_city_centroids
+from ingest.scripts.enrich import (
+    HAYSTACK_COLUMNS,
+    _join_address,
+    _maybe,
+    enrich_markets,
+    generate_zip_centroids,
+    generate_city_centroids,
+    search_tokens,
+)
 
 
 def make_df(address, name="Test Market", org="Org", desc="Desc", lat=40.0, lon=-75.0):
@@ -97,3 +108,47 @@ def test_generate_city_centroids_handles_city_state_and_fallback():
     # Multiple Springfield entries keep individual state centroids separate
     assert centroids['springfield|IL'][0] != centroids['springfield|MO'][0]
     assert 'springfield' not in centroids
+
+
+def fuzz_markets(n, seed=11):
+    rng = random.Random(seed)
+    words = ["Farm", "MARKET", "  Fresh\tFoods ", "", "Café", "CO-OP", "İstanbul", "a\u2003b", "x\x1fy",
+             "Ünion\nSquare", None, np.nan]
+    addresses = ["123 Main St, Columbus, Ohio 43215", "Somewhere in Alaska", "", None, "  PO Box 5  ",
+                 "1 Café Plaza, Québec", "Route 9; Hudson; New York 12534-1234"]
+    return pd.DataFrame({
+        "listing_name": [rng.choice(words) for _ in range(n)],
+        "organization": [rng.choice(words) for _ in range(n)],
+        "location_address": [rng.choice(addresses) for _ in range(n)],
+        "location_desc": [rng.choice(words) for _ in range(n)],
+        "listing_desc": [rng.choice(words) for _ in range(n)],
+        "listing_type_label": [rng.choice(["Farmers Market", "CSA", None]) for _ in range(n)],
+        "latitude": [40.0] * n,
+        "longitude": [-75.0] * n,
+    })
+
+
+def test_columnar_text_matches_row_wise_build():
+    out = enrich_markets(fuzz_markets(2000))
+
+    full_address = out.apply(
+        lambda r: _join_address(r.get('street'), r.get('city'), r.get('state'), r.get('zip'))
+        or _maybe(r.get('location_address')),
+        axis=1,
+    )
+    sources = pd.concat(
+        [out.get(col, pd.Series('', index=out.index)) for col in HAYSTACK_COLUMNS], axis=1
+    ).fillna('').astype(str)
+    haystack = sources.apply(lambda parts: ' '.join(p for p in parts if p), axis=1)
+    haystack = haystack.str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+
+    assert out['full_address'].tolist() == full_address.tolist()
+    assert out['search_haystack'].tolist() == haystack.tolist()
+
+
+def test_search_tokens_are_normalized_and_deduplicated():
+    hay = pd.Series(["little havana market, miami fl 33101 miami", "", None])
+    tokens = search_tokens(hay)
+    assert tokens.iloc[0] == ["little", "havana", "market", "miami", "fl", "33101"]
+    assert tokens.iloc[1] == []
+    assert tokens.iloc[2] == []
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from ingest.scripts.export_artifacts import export_from_profile, export_profiles
+
+
+def write_profile(tmp_path, **options):
+    out = tmp_path / "search.json"
+    profile = {"search": {"path": str(out), "fields": ["record_id", "search_haystack"], **options}}
+    path = tmp_path / "profiles.yml"
+    path.write_text(yaml.safe_dump(profile), encoding="utf-8")
+    return path, out
+
+
+def make_df():
+    return pd.DataFrame({
+        "record_id": ["a", "b"],
+        "search_haystack": ["green farm market green farm, ohio", ""],
+    })
+
+
+def test_export_keeps_haystack_by_default(tmp_path):
+    profile, out = write_profile(tmp_path)
+    export_from_profile(make_df(), str(profile))
+    rows = json.loads(out.read_text(encoding="utf-8"))
+    assert rows[0] == {"record_id": "a", "search_haystack": "green farm market green farm, ohio"}
+
+
+def test_export_search_tokens_option(tmp_path):
+    profile, out = write_profile(tmp_path, search_tokens=True)
+    export_from_profile(make_df(), str(profile))
+    rows = json.loads(out.read_text(encoding="utf-8"))
+    assert rows == [
+        {"record_id": "a", "search_tokens": ["green", "farm", "market", "ohio"]},
+        {"record_id": "b", "search_tokens": []},
+    ]
+
+
+def test_export_profiles_report_and_thread_pool(tmp_path):
+    df = pd.DataFrame({
+        "record_id": ["a", "b", "c"],
+        "listing_name": ["Green Market", "Farm Stand", None],
+        "latitude": [40.1, 39.5, 41.25],
+        "longitude": [-83.0, -84.2, -82.75],
+        "search_haystack": ["green market ohio", "farm stand", ""],
+    })
+    profiles = {
+        "map": {"path": "map.json", "fields": ["record_id", "listing_name", "latitude", "longitude"]},
+        "search": {"path": "search.json", "search_tokens": True, "fields": ["record_id", "listing_name", "search_haystack"]},
+        "lines": {"path": "search.ndjson", "fields": ["record_id", "search_haystack"]},
+        "full": {"path": "full.parquet", "fields": ["*"]},
+        "spatial": {"path": "spatial.json", "format": "spatial_index", "fields": ["latitude", "longitude"]},
+    }
+    outputs = {}
+    for jobs in (1, 3):
+        out_dir = tmp_path / f"jobs{jobs}"
+        path = tmp_path / f"profiles{jobs}.yml"
+        path.write_text(
+            yaml.safe_dump({name: {**spec, "path": str(out_dir / spec["path"])} for name, spec in profiles.items()}, sort_keys=False),
+            encoding="utf-8",
+        )
+        report = export_profiles(df, str(path), jobs=jobs)
+        assert list(report) == list(profiles)
+        for name, entry in report.items():
+            assert entry["bytes"] == Path(entry["path"]).stat().st_size > 0
+            assert entry["seconds"] >= 0
+        # Row profiles share one conversion of their columns
+        assert {name for name, entry in report.items() if "shared_seconds" in entry} == {"map", "search", "lines"}
+        outputs[jobs] = {p.name: p.read_bytes() for p in out_dir.iterdir()}
+
+    assert outputs[1] == outputs[3]
+    search = json.loads(outputs[1]["search.json"])
+    assert search[0] == {"record_id": "a", "listing_name": "Green Market", "search_tokens": ["green", "market", "ohio"]}
+    assert [json.loads(line) for line in outputs[1]["search.ndjson"].decode("utf-8").splitlines()][2] == {
+        "record_id": "c", "search_haystack": "",
+    }
+    assert list(pd.read_parquet(tmp_path / "jobs1" / "full.parquet").columns) == list(df.columns)
@@ -0,0 +1,69 @@
+import gzip
+import json
+import zlib
+
+from ingest.scripts import finalize
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_finalize_writes_hashed_precompressed_copies(tmp_path, monkeypatch):
+    monkeypatch.setattr(finalize, "brotli", None)
+    data = tmp_path / "data"
+    paths = [
+        write(data / "markets.map.json", '[{"a":1}]' * 50),
+        write(data / "zip.centroids.json", '{"43215":[40,-83]}'),
+        write(data / "tiles" / "index.json", "{}"),
+        write(tmp_path / "markets.full.parquet", "x"),
+    ]
+    result = finalize.finalize_artifacts(paths, data)
+
+    assert sorted(result["files"]) == ["markets.map.json", "zip.centroids.json"]
+    entry = result["files"]["markets.map.json"]
+    hashed = data / entry["path"]
+    assert hashed.read_bytes() == (data / "markets.map.json").read_bytes()
+    assert entry["path"] == f"immutable/markets.map.{entry['sha256'][:16]}.json"
+    gz = hashed.with_name(hashed.name + ".gz").read_bytes()
+    assert gzip.decompress(gz) == hashed.read_bytes()
+    assert entry["gzip_bytes"] == len(gz) < entry["bytes"]
+    assert entry["brotli_bytes"] is None and result["brotli"] is False
+
+    pointer = json.loads((data / "artifacts.json").read_text())
+    assert pointer["files"] == {name: d["path"] for name, d in result["files"].items()}
+
+
+def test_finalize_is_deterministic_and_prunes_old_generations(tmp_path, monkeypatch):
+    monkeypatch.setattr(finalize, "brotli", None)
+    data = tmp_path / "data"
+    path = write(data / "markets.map.json", "[1]")
+    first = finalize.finalize_artifacts([path], data)["files"]["markets.map.json"]
+    gz = (data / (first["path"] + ".gz")).read_bytes()
+    again = finalize.finalize_artifacts([path], data)["files"]["markets.map.json"]
+    assert again == first
+    assert (data / (first["path"] + ".gz")).read_bytes() == gz
+
+    write(data / "immutable" / "unrelated.json", "{}")
+    write(data / "markets.map.json", "[1,2]")
+    second = finalize.finalize_artifacts([path], data)["files"]["markets.map.json"]
+    assert second["path"] != first["path"]
+    names = sorted(p.name for p in (data / "immutable").iterdir())
+    assert names == sorted([second["path"].split("/")[1], second["path"].split("/")[1] + ".gz", "unrelated.json"])
+
+
+def test_finalize_uses_brotli_when_available(tmp_path, monkeypatch):
+    class FakeBrotli:
+        @staticmethod
+        def compress(payload, quality):
+            assert quality == 11
+            return zlib.compress(payload, 9)
+
+    monkeypatch.setattr(finalize, "brotli", FakeBrotli)
+    data = tmp_path / "data"
+    result = finalize.finalize_artifacts([write(data / "city.centroids.json", '{"a":[1,2]}')], data)
+    entry = result["files"]["city.centroids.json"]
+    assert (data / (entry["path"] + ".br")).stat().st_size == entry["brotli_bytes"]
+    assert result["brotli"] is True
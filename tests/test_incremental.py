@@ -0,0 +1,70 @@
+import pandas as pd
+
+from ingest.scripts import cli, incremental
+from conftest import make_raw_frame
+
+
+def stage(workspace, frame):
+    frame.to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+
+
+def full_and_incremental(workspace):
+    base, _ = cli._prepare_datasets(use_cache=False)
+    valid, rejects, stats = incremental.run_incremental(base.copy(), cli.MAPPING, workspace / "state")
+    expected_valid, expected_rejects = cli._run_pipeline(base.copy())
+    pd.testing.assert_frame_equal(valid, expected_valid)
+    pd.testing.assert_frame_equal(rejects, expected_rejects)
+    return valid, stats
+
+
+def test_incremental_reuses_unchanged_records(workspace):
+    raw = make_raw_frame(8)
+    stage(workspace, raw)
+    _, stats = full_and_incremental(workspace)
+    assert (stats["reused"], stats["recomputed"], stats["dropped"]) == (0, 8, 0)
+
+    _, stats = full_and_incremental(workspace)
+    assert (stats["reused"], stats["recomputed"]) == (8, 0)
+
+    # Move one market into another's ZIP, duplicate a listing_id, drop one, add one
+    raw.loc[1, "location_address"] = "9 Oak Ave, Columbus, Ohio 43200"
+    raw.loc[1, "location_y"] = 41.0
+    added = make_raw_frame(1, offset=50).assign(location_address="1 Elm St, Salem, OR 97301")
+    raw = pd.concat([raw.drop(index=7), added], ignore_index=True)
+    stage(workspace, raw)
+    valid, stats = full_and_incremental(workspace)
+    assert (stats["reused"], stats["recomputed"], stats["dropped"]) == (6, 2, 1)
+
+    # The ZIP mean covers the reused record and the changed one
+    shared = valid[valid["zip"] == "43200"]
+    assert len(shared) == 2
+    assert shared["zip_lat"].tolist() == [40.5, 40.5]
+
+
+def test_incremental_state_is_invalidated_by_mapping_changes(workspace, tmp_path, monkeypatch):
+    stage(workspace, make_raw_frame(4))
+    full_and_incremental(workspace)
+
+    mapping = tmp_path / "mapping.yml"
+    mapping.write_text(open(cli.MAPPING, encoding="utf-8").read() + "\n# changed\n", encoding="utf-8")
+    monkeypatch.setattr(cli, "MAPPING", str(mapping))
+    _, stats = full_and_incremental(workspace)
+    assert (stats["reused"], stats["recomputed"]) == (0, 4)
+
+
+def test_incremental_state_is_invalidated_by_code_changes(workspace, tmp_path, monkeypatch):
+    stage(workspace, make_raw_frame(4))
+    full_and_incremental(workspace)
+
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    for path in incremental.SCRIPTS_DIR.glob("*.py"):
+        (scripts / path.name).write_bytes(path.read_bytes())
+    monkeypatch.setattr(incremental, "SCRIPTS_DIR", scripts)
+    _, stats = full_and_incremental(workspace)
+    assert stats["reused"] == 4
+
+    with open(scripts / "enrich.py", "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    _, stats = full_and_incremental(workspace)
+    assert (stats["reused"], stats["recomputed"]) == (0, 4)
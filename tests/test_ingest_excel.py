@@ -0,0 +1,151 @@
+import datetime as dt
+
+import pandas as pd
+import pytest
+
+from ingest.scripts.ingest_excel import ingest_excel, projected_columns
+from ingest.scripts.xlsx_stream import UnsupportedOpenpyxl, read_excel_stream
+from conftest import make_raw_frame
+
+SCHEMA = "ingest/config/schema.yml"
+MAPPING = "ingest/config/mapping_programs.yml"
+EXPORTS = "ingest/config/export_profiles.yml"
+
+
+def write_workbook(path):
+    pd.DataFrame({
+        "listing_id": [1, 2, 3, 4],
+        "listing_name": ["  A ", "B", None, "NA"],
+        "location_address": ["1 Main St, Columbus, OH 43215", "", "x", "y"],
+        "location_x": [-83.0, -82.5, None, 10],
+        "location_y": [40, 41.25, 42, None],
+        "orgnization": ["Org", None, "Org", "Org"],
+        "update_time": [dt.datetime(2025, 1, 2), None, dt.datetime(2024, 5, 6, 7, 8), None],
+        "FNAP_1": [1, 0, None, True],
+        "FNAP_2": ["1", "0", None, 1],
+        "location_desc": ["desc", None, None, None],
+        "unused_wide": ["x" * 50] * 4,
+        "unused_num": [1.5, 2.5, 3.5, 4.5],
+    }).to_excel(path, index=False)
+
+
+def test_projected_columns_use_raw_names():
+    cols = projected_columns(SCHEMA, MAPPING, EXPORTS)
+    assert "location_x" in cols and "longitude" not in cols
+    assert "orgnization" in cols and "organization" not in cols
+    assert {"FNAP_1", "FNAP_3_desc", "SNAP_option_2", "location_desc"} <= set(cols)
+    assert "*" not in cols
+    assert len(cols) == len(set(cols))
+
+
+def test_stream_reader_matches_read_excel(tmp_path):
+    path = tmp_path / "fm.xlsx"
+    write_workbook(path)
+
+    expected = pd.read_excel(path)
+    pd.testing.assert_frame_equal(read_excel_stream(str(path)), expected)
+
+    cols = projected_columns(SCHEMA, MAPPING, EXPORTS)
+    projected = read_excel_stream(str(path), cols)
+    assert "unused_wide" not in projected.columns
+    pd.testing.assert_frame_equal(projected, expected[[c for c in expected.columns if c in cols]])
+
+
+def test_stream_engine_matches_pandas_engine(tmp_path):
+    path = tmp_path / "fm.xlsx"
+    write_workbook(path)
+    cols = projected_columns(SCHEMA, MAPPING, EXPORTS)
+
+    baseline = ingest_excel(str(path), SCHEMA)
+    streamed = ingest_excel(str(path), SCHEMA, engine="stream", columns=cols)
+
+    pd.testing.assert_frame_equal(streamed, baseline[list(streamed.columns)])
+
+
+def test_stream_engine_falls_back_without_openpyxl_internals(workspace, monkeypatch):
+    from ingest.scripts import cli, xlsx_stream
+
+    path = workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx"
+    make_raw_frame(4).to_excel(path, index=False)
+    expected, _, _ = cli._load_dataset("farmers_market", {}, path, use_cache=False)
+
+    def load_workbook(*args, **kwargs):
+        # A release that renamed one of the private attributes
+        wb = real_load(*args, **kwargs)
+        del wb._timedelta_formats
+        return wb
+
+    real_load = xlsx_stream.load_workbook
+    monkeypatch.setattr(xlsx_stream, "load_workbook", load_workbook)
+    with pytest.raises(UnsupportedOpenpyxl, match="workbook._timedelta_formats"):
+        read_excel_stream(str(path))
+    df, meta, messages = cli._load_dataset("farmers_market", {"engine": "stream"}, path, use_cache=False)
+    assert meta["engine"] == "pandas"
+    assert messages[0].startswith("[warn] openpyxl ") and messages[0].endswith("with engine: pandas")
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def write_shared_string_workbook(path):
+    # Excel (unlike openpyxl) stores text in sharedStrings.xml and dates as
+    # styled serial numbers; build that layout by hand.
+    import zipfile
+
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    rel_ns = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+    strings = ["listing_id", "listing_name", "update_time", "FNAP_1", "unused", "Alpha", "Beta", "junk"]
+    parts = {
+        "[Content_Types].xml": (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/workbook.xml": f'<workbook {ns} {rel_ns}><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        "xl/_rels/workbook.xml.rels": (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+            '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/sharedStrings.xml": f'<sst {ns}>' + "".join(f"<si><t>{s}</t></si>" for s in strings) + "</sst>",
+        "xl/styles.xml": (
+            f'<styleSheet {ns}><cellXfs count="2"><xf numFmtId="0"/><xf numFmtId="14" applyNumberFormat="1"/></cellXfs></styleSheet>'
+        ),
+        "xl/worksheets/sheet1.xml": (
+            f'<worksheet {ns}><sheetData>'
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="s"><v>2</v></c>'
+            '<c r="D1" t="s"><v>3</v></c><c r="E1" t="s"><v>4</v></c></row>'
+            '<row r="2"><c r="A2"><v>1</v></c><c r="B2" t="s"><v>5</v></c><c r="C2" s="1"><v>45720</v></c>'
+            '<c r="D2" t="b"><v>1</v></c><c r="E2" t="s"><v>7</v></c></row>'
+            '<row r="4"><c r="A4"><v>2.0</v></c><c r="B4" t="s"><v>6</v></c><c r="C4" t="e"><v>#N/A</v></c>'
+            '<c r="E4"><v>1.5</v></c></row>'
+            '<row r="5"><c r="A5"><v>3</v></c><c r="D5" t="b"><v>0</v></c></row>'
+            '<row r="6"/>'
+            '</sheetData></worksheet>'
+        ),
+    }
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, body in parts.items():
+            zf.writestr(name, body)
+
+
+@pytest.mark.filterwarnings("ignore:Workbook contains no default style")
+def test_stream_reader_handles_shared_strings_dates_and_gaps(tmp_path):
+    path = tmp_path / "excel_layout.xlsx"
+    write_shared_string_workbook(path)
+
+    expected = pd.read_excel(path)
+    pd.testing.assert_frame_equal(read_excel_stream(str(path)), expected)
+
+    projected = read_excel_stream(str(path), ["listing_id", "update_time", "FNAP_1"])
+    pd.testing.assert_frame_equal(projected, expected[["listing_id", "update_time", "FNAP_1"]])
@@ -0,0 +1,55 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ingest.scripts.export_artifacts import export_from_profile
+from ingest.scripts.json_writer import write_json_records, write_ndjson_records
+
+
+def legacy(df):
+    return json.dumps(json.loads(df.to_json(orient="records")), ensure_ascii=False, separators=(",", ":"))
+
+
+def make_df():
+    return pd.DataFrame({
+        "record_id": ["a", "b/c", "Española", None, "😀"],
+        "text": ['q"\\\n', pd.NA, np.nan, "", "x"],
+        "latitude": [1.23456789012345, -21.33370586805, np.nan, 1e17, -0.0],
+        "listing_id": [1, 2, 3, 4, 5],
+        "program_snap": [True, False, True, False, True],
+        "flag": [True, None, False, pd.NA, True],
+        "updated": pd.to_datetime(["2020-01-01", "2021-05-05 12:00", None, "2020-01-01", "2020-01-01"], format="mixed"),
+        "mixed": [1, "a", 2.5, None, pd.Timestamp("2020-01-01")],
+        "state": pd.Categorical(["OH", None, "OH", "MO", "MO"]),
+        "count": pd.array([1, None, 3, 4, 5], dtype="Int64"),
+    })
+
+
+def test_streaming_json_matches_to_json_round_trip():
+    df = make_df()
+    for chunk_rows in (1, 2, 5, 100):
+        out = io.StringIO()
+        assert write_json_records(df, out, chunk_rows) == len(df)
+        assert out.getvalue() == legacy(df)
+
+    out = io.StringIO()
+    write_json_records(df.iloc[:0], out)
+    assert out.getvalue() == "[]"
+
+
+def test_ndjson_profile_writes_one_record_per_line(tmp_path):
+    out = tmp_path / "markets.ndjson"
+    profile = tmp_path / "profiles.yml"
+    profile.write_text(yaml.safe_dump({"lines": {"path": str(out), "fields": ["*"], "chunk_rows": 2}}), encoding="utf-8")
+    df = make_df()
+    export_from_profile(df, str(profile))
+
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(legacy(df))
+
+    buffer = io.StringIO()
+    write_ndjson_records(df.iloc[:0], buffer)
+    assert buffer.getvalue() == ""
@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+
+from ingest.scripts import cli
+from conftest import make_raw_frame
+
+
+def test_low_memory_pipeline_matches_default(workspace):
+    raw = make_raw_frame(6)
+    raw.loc[3, "listing_id"] = raw.loc[2, "listing_id"]
+    raw.loc[4, "location_y"] = 123.0
+    raw.to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    make_raw_frame(3, offset=20).to_excel(workspace / "data" / "raw" / "csa_2025-01-01.xlsx", index=False)
+
+    base, _ = cli._prepare_datasets(use_cache=False)
+    expected_valid, expected_rejects = cli._run_pipeline(base)
+
+    lean, _ = cli._prepare_datasets(use_cache=False, low_memory=True)
+    valid, rejects = cli._run_pipeline(lean, low_memory=True)
+
+    assert isinstance(valid["source_dataset"].dtype, pd.CategoricalDtype)
+    assert isinstance(valid["state"].dtype, pd.CategoricalDtype)
+    decoded = {c: object for c in cli.DATASET_COLUMNS + cli.CATEGORICAL_COLUMNS}
+    pd.testing.assert_frame_equal(valid.astype(decoded), expected_valid)
+    pd.testing.assert_frame_equal(rejects.astype(decoded), expected_rejects)
+
+
+def test_low_memory_run_writes_identical_exports(workspace):
+    make_raw_frame(5).to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    canonical = workspace / "data" / "processed" / "markets.canonical.parquet"
+    outputs = {}
+    for flags in ([], ["--low-memory"]):
+        assert cli._run(None, None, True, 1, False, bool(flags))
+        outputs[tuple(flags)] = {
+            p.name: p.read_bytes() for p in (workspace / "site" / "static" / "data").glob("markets*.json")
+        }
+        outputs[tuple(flags)][canonical.name] = canonical.read_bytes()
+        if not flags:
+            os.utime(canonical, (1, 1))
+    assert outputs[()] and outputs[()] == outputs[("--low-memory",)]
+    # Same content: the canonical parquet isn't rewritten
+    assert canonical.stat().st_mtime == 1
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from ingest.scripts import cli
+from conftest import make_raw_frame
+
+
+def stage(workspace, name, frame):
+    frame.to_excel(workspace / "data" / "raw" / name, index=False)
+
+
+def test_prepare_datasets_parallel_matches_serial(workspace):
+    stage(workspace, "farmersmarket_2025-01-01.xlsx", make_raw_frame())
+    stage(workspace, "csa_2025-01-01.xlsx", make_raw_frame(offset=100))
+    stage(workspace, "foodhub_2025-01-01.xlsx", make_raw_frame(offset=200))
+
+    serial, serial_meta = cli._prepare_datasets(use_cache=False, jobs=1)
+    parallel, parallel_meta = cli._prepare_datasets(use_cache=False, jobs=3)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial_meta == parallel_meta
+    assert [m["dataset"] for m in parallel_meta] == ["farmers_market", "csa", "food_hub"]
+
+
+def test_prepare_datasets_reports_missing_sources(workspace, capsys):
+    stage(workspace, "csa_2025-01-01.xlsx", make_raw_frame())
+
+    combined, meta = cli._prepare_datasets(use_cache=False, jobs=2)
+    err = capsys.readouterr().err
+
+    assert len(combined) == 6
+    assert [m["dataset"] for m in meta] == ["csa"]
+    assert "No source file found for dataset 'farmers_market'" in err
+    assert "No source file found for dataset 'agritourism'" in err
+
+
+def test_prepare_datasets_uses_cache_on_second_run(workspace):
+    stage(workspace, "csa_2025-01-01.xlsx", make_raw_frame())
+
+    first, first_meta = cli._prepare_datasets()
+    second, second_meta = cli._prepare_datasets()
+
+    assert [m["cache"] for m in first_meta] == ["miss"]
+    assert [m["cache"] for m in second_meta] == ["hit"]
+    pd.testing.assert_frame_equal(first, second)
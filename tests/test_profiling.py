@@ -0,0 +1,50 @@
+import json
+
+from typer.testing import CliRunner
+
+from ingest.scripts.cli import APP
+from ingest.scripts.profiling import Profiler, format_table, stage
+from conftest import make_raw_frame
+
+
+def test_stage_is_a_no_op_without_a_profiler():
+    with stage("orphan", rows_in=3) as record:
+        record["rows_out"] = 3
+    assert Profiler.active() is None
+
+
+def test_profiler_records_nested_stages_in_start_order(tmp_path):
+    profiler = Profiler(tmp_path / "pstats")
+    with profiler.activate():
+        with stage("outer", rows_in=10) as record:
+            with stage("inner") as inner:
+                buf = bytearray(8 * 1024 * 1024)
+                inner["rows_out"] = len(buf)
+            record["rows_out"] = 4
+
+    summary = profiler.summary()
+    assert [(r["stage"], r["depth"]) for r in summary] == [("outer", 0), ("inner", 1)]
+    outer, inner = summary
+    assert outer["rows_in"] == 10 and outer["rows_out"] == 4 and outer["rows_per_s"] > 0
+    assert outer["wall_s"] >= inner["wall_s"]
+    # The allocation shows up in both the stage and its parent
+    assert inner["peak_rss_delta_mb"] >= 7 and outer["peak_rss_delta_mb"] >= 7
+    # One pstats dump per top-level stage
+    assert [p.name for p in (tmp_path / "pstats").iterdir()] == ["00-outer.pstats"]
+    assert "  inner" in format_table(summary)
+
+
+def test_run_writes_profile_to_manifest(workspace):
+    make_raw_frame().to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    result = CliRunner(mix_stderr=False).invoke(APP, ["run", "--no-cache", "--profile"])
+    assert result.exit_code == 0, result.stderr
+
+    manifest = json.loads((workspace / "data" / "processed" / "manifest.json").read_text())
+    stages = [r["stage"] for r in manifest["profile"]]
+    for expected in [
+        "prepare_datasets", "ingest_excel:farmers_market", "map_program_flags", "enrich_markets",
+        "enrich:parse_addresses", "enrich:search_haystack", "enrich:zip_means", "basic_validate",
+        "export:map", "zip_centroids", "city_centroids",
+    ]:
+        assert expected in stages
+    assert "rows_per_s" in result.stderr
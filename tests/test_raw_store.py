@@ -0,0 +1,90 @@
+import os
+
+from typer.testing import CliRunner
+
+from ingest.scripts import raw_store
+from ingest.scripts.cli import APP, _latest_for_glob
+from ingest.scripts.stage_raw import stage_raw
+from conftest import make_raw_frame
+
+
+def download(path, n=6, offset=0):
+    make_raw_frame(n, offset).to_excel(path, index=False)
+    return path
+
+
+def test_restaging_identical_content_is_a_no_op(workspace):
+    src = download(workspace / "download.xlsx")
+    first, second = {}, {}
+    path = stage_raw(str(src), report=first)
+    assert stage_raw(str(src), report=second) == path
+    assert (first["status"], second["status"]) == ("staged", "exists")
+
+    objects = list((workspace / "data" / "raw" / "objects").iterdir())
+    assert [p.name for p in objects] == [f"{first['sha256']}.xlsx"]
+    if first["method"] == "hardlink":
+        assert os.stat(path).st_ino == objects[0].stat().st_ino
+    assert len(list((workspace / "data" / "raw").glob("farmersmarket_*.xlsx"))) == 1
+
+    # Same content under another dataset: a new name, no new object
+    other = stage_raw(str(src), dataset_key="csa")
+    assert other != path and len(list((workspace / "data" / "raw" / "objects").iterdir())) == 1
+
+
+def test_restaging_older_content_makes_it_the_newest_snapshot(workspace):
+    x = download(workspace / "x.xlsx")
+    y = download(workspace / "y.xlsx", offset=10)
+    os.utime(x, (1_000_000,) * 2)
+    os.utime(y, (2_000_000,) * 2)
+    reports = [{}, {}, {}]
+    for src, report in zip([x, y, x], reports):
+        stage_raw(str(src), report=report)
+    # Rolling back to X must not be a no-op: run reads the newest snapshot
+    assert [r["status"] for r in reports] == ["staged", "staged", "staged"]
+    latest = _latest_for_glob("farmersmarket_*.xlsx")
+    assert raw_store.sha256sum(latest) == reports[0]["sha256"]
+    assert len(list((workspace / "data" / "raw" / "objects").iterdir())) == 2
+
+    again = {}
+    stage_raw(str(x), report=again)
+    assert again["status"] == "exists" and again["path"] == str(latest)
+
+
+def test_index_reuses_hashes_of_unchanged_files(workspace, monkeypatch):
+    path = stage_raw(str(download(workspace / "download.xlsx")))
+    expected = raw_store.sha256sum(path)
+
+    def unexpected(_):
+        raise AssertionError("re-read an unchanged file")
+
+    monkeypatch.setattr(raw_store, "sha256sum", unexpected)
+    assert raw_store.file_sha256(path) == expected
+
+    monkeypatch.setattr(raw_store, "sha256sum", lambda _: "rehashed")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert raw_store.file_sha256(path) == "rehashed"
+
+
+def test_gc_keeps_newest_snapshots_and_their_objects(workspace):
+    raw = workspace / "data" / "raw"
+    paths = []
+    for i in range(3):
+        src = download(workspace / f"download{i}.xlsx", offset=i * 10)
+        os.utime(src, (1_000_000 + i * 86400,) * 2)
+        paths.append(stage_raw(str(src)))
+    assert len(set(paths)) == 3
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(APP, ["gc", "--keep", "1", "--dry-run"])
+    assert result.exit_code == 0, result.stderr
+    assert "Would remove 2 snapshot(s) and 2 object(s)" in result.stdout
+    assert len(list((raw / "objects").iterdir())) == 3
+
+    result = runner.invoke(APP, ["gc", "--keep", "1"])
+    assert result.exit_code == 0, result.stderr
+    assert [p.name for p in raw.glob("farmersmarket_*.xlsx")] == [os.path.basename(paths[-1])]
+    assert [p.name for p in (raw / "objects").iterdir()] == [f"{raw_store.sha256sum(paths[-1])}.xlsx"]
+    index = raw_store.HashIndex(raw)
+    assert all(os.path.exists(p) for p in index.files)
+    assert str((raw / os.path.basename(paths[-1])).resolve()) in index.files
@@ -0,0 +1,83 @@
+import json
+import random
+
+import pandas as pd
+import yaml
+
+from ingest.scripts.enrich import _normalize_text
+from ingest.scripts.export_artifacts import export_from_profile
+from ingest.scripts.search_index import build_index, decode_postings, encode_postings, query, record_tokens
+
+
+def make_df():
+    return pd.DataFrame({
+        "record_id": ["a", "b", "c", "d"],
+        "search_haystack": [
+            "little havana market miami fl 33101",
+            "green farm co-op columbus oh 43215",
+            "miami beach farmers market",
+            None,
+        ],
+        "search_city_norm": ["miami", "columbus", "miami beach", ""],
+        "search_state_norm": ["FL", "OH", "FL", ""],
+        "search_zip": ["33101", "43215", "33139", ""],
+    })
+
+
+def brute_force(df, text):
+    terms = _normalize_text(text).split()
+    tokens = record_tokens(df)
+    min_prefix = 2
+    return [
+        i for i, toks in enumerate(tokens)
+        if all(any(t == term or (len(term) >= min_prefix and t.startswith(term)) for t in toks) for term in terms)
+    ]
+
+
+def test_postings_roundtrip():
+    ordinals = [0, 3, 4, 10, 250]
+    assert encode_postings(ordinals) == [0, 3, 1, 6, 240]
+    assert decode_postings(encode_postings(ordinals)) == ordinals
+
+
+def test_query_intersects_tokens_and_prefixes():
+    index = build_index(make_df())
+    assert index["ids"] == ["a", "b", "c", "d"]
+    assert query(index, "miami") == [0, 2]
+    assert query(index, "Miami  MARKET") == [0, 2]
+    assert query(index, "mia fl") == [0, 2]
+    assert query(index, "co-op") == [1]
+    assert query(index, "331") == [0, 2]
+    assert query(index, "oh") == [1]
+    assert query(index, "m") == []
+    assert query(index, "pizza") == []
+    assert query(index, "") == [0, 1, 2, 3]
+
+
+def test_query_matches_brute_force_on_fuzzed_records():
+    rng = random.Random(5)
+    words = ["farm", "farmers", "market", "fresh", "miami", "mia", "columbus", "co", "fl", "oh", "33101", "331"]
+    df = pd.DataFrame({
+        "search_haystack": [" ".join(rng.sample(words, rng.randint(0, 5))) for _ in range(300)],
+        "search_zip": [rng.choice(["33101", "43215", ""]) for _ in range(300)],
+    })
+    index = build_index(df, id_field=None)
+    for _ in range(200):
+        text = " ".join(rng.choice(words + ["fa", "mar", "x", "4321"]) for _ in range(rng.randint(1, 3)))
+        assert query(index, text) == brute_force(df, text), text
+
+
+def test_export_profile_token_index(tmp_path):
+    out = tmp_path / "index.json"
+    profile = {"search_index": {
+        "path": str(out), "format": "token_index", "id_field": "record_id", "min_prefix": 3,
+        "fields": ["record_id", "search_haystack", "search_zip"],
+    }}
+    path = tmp_path / "profiles.yml"
+    path.write_text(yaml.safe_dump(profile), encoding="utf-8")
+    export_from_profile(make_df(), str(path))
+    index = json.loads(out.read_text(encoding="utf-8"))
+    assert index["min_prefix"] == 3
+    assert "mi" not in index["terms"] and "mia" in index["terms"]
+    # search_state_norm isn't listed, so record "c" (FL) only matches via its haystack
+    assert query(index, "fl") == [0]
@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from ingest.scripts.export_artifacts import export_from_profile
+from ingest.scripts.search_index import decode_postings
+from ingest.scripts.spatial_index import GridIndex, brute_force_radius, haversine_miles, query_radius
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    return pd.Series(lat), pd.Series(lon)
+
+
+def test_haversine_known_distance():
+    # Columbus, OH to Miami, FL is roughly 1,000 miles
+    miles = haversine_miles(39.9612, -82.9988, np.array([25.7617]), np.array([-80.1918]))[0]
+    assert miles == pytest.approx(990, abs=15)
+
+
+@pytest.mark.parametrize("cell", [0.5, 7.0])
+def test_query_radius_matches_brute_force(cell):
+    lat, lon = random_points(5000)
+    index = GridIndex(lat, lon, cell)
+    rng = np.random.default_rng(1)
+    centers = [(89.9, 10.0), (-89.5, -170.0), (10.0, 179.9), (-20.0, -179.95), (0.0, 0.0)]
+    centers += list(zip(rng.uniform(-85, 85, 60), rng.uniform(-180, 180, 60)))
+    for clat, clon in centers:
+        for miles in (0.0, 5.0, 150.0, 900.0, 13000.0):
+            expected = brute_force_radius(clat, clon, miles, lat, lon)
+            assert index.query_radius(clat, clon, miles).tolist() == expected.tolist(), (clat, clon, miles)
+
+
+def test_missing_coordinates_are_not_indexed():
+    df = pd.DataFrame({"latitude": [40.0, None, 40.01, "bad"], "longitude": [-75.0, -75.0, -75.01, -75.0]})
+    assert query_radius(df, 40.0, -75.0, 5) == [0, 2]
+    assert GridIndex(df.latitude, df.longitude).cells() == {"260_209": [2], "260_210": [0]}
+
+
+def test_export_profile_spatial_index(tmp_path):
+    out = tmp_path / "spatial.json"
+    profile = {"spatial_index": {
+        "path": str(out), "format": "spatial_index", "cell_degrees": 1.0, "fields": ["latitude", "longitude"],
+    }}
+    path = tmp_path / "profiles.yml"
+    path.write_text(yaml.safe_dump(profile), encoding="utf-8")
+    df = pd.DataFrame({"latitude": [40.2, 25.8, 40.9], "longitude": [-75.1, -80.2, -75.5]})
+    export_from_profile(df, str(path))
+    artifact = json.loads(out.read_text())
+    assert artifact["records"] == 3
+    assert {k: decode_postings(v) for k, v in artifact["cells"].items()} == {"130_104": [0, 2], "115_99": [1]}
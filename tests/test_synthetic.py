@@ -0,0 +1,30 @@
+from benchmarks.suite import compare
+from benchmarks.synthetic import make_listings
+from ingest.scripts import cli
+from ingest.scripts.enrich import enrich_markets
+from ingest.scripts.ingest_excel import apply_schema
+from ingest.scripts.map_programs import map_program_flags
+from ingest.scripts.validate import basic_validate
+
+
+def test_synthetic_listings_run_through_the_pipeline():
+    raw = make_listings(2000, seed=4, duplicate_rate=0.05, bad_coordinate_rate=0.05)
+    assert raw["listing_id"].duplicated().any()
+    assert (raw["location_x"] > 180).any() and raw["location_y"].isna().any()
+    assert make_listings(50, seed=4).equals(make_listings(50, seed=4))
+
+    base = cli._tag_dataset(apply_schema(raw, cli.SCHEMA), "farmers_market", "Farmers Markets", "farmers_market")
+    valid, rejects = basic_validate(enrich_markets(map_program_flags(base, cli.MAPPING)))
+    reasons = rejects["_reject_reason"].str.cat()
+    for reason in ("dup:listing_id", "bad:longitude", "bad:latitude", "missing:location_address"):
+        assert reason in reasons
+    # Most addresses parse to a ZIP
+    assert (valid["zip"] != "").mean() > 0.7
+
+
+def test_compare_flags_slowdowns_above_threshold():
+    baseline = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "tiny": {"seconds": 0.001}}}
+    current = {"results": {"a": {"seconds": 1.2}, "b": {"seconds": 1.4}, "tiny": {"seconds": 0.01}, "new": {"seconds": 1}}}
+    rows = {r["benchmark"]: r for r in compare(current, baseline, threshold=1.25)}
+    assert sorted(rows) == ["a", "b", "tiny"]
+    assert [rows[n]["regressed"] for n in ("a", "b", "tiny")] == [False, True, False]
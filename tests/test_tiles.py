@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from ingest.scripts.export_artifacts import export_from_profile
+from ingest.scripts.tiles import geohash_bbox, geohash_encode, tile_bbox, tile_keys, write_tiles
+
+
+def make_df(coords):
+    return pd.DataFrame({
+        "record_id": [f"r{i}" for i in range(len(coords))],
+        "latitude": [lat for lat, _ in coords],
+        "longitude": [lon for _, lon in coords],
+    })
+
+
+def contains(bbox, lat, lon):
+    west, south, east, north = bbox
+    return south <= lat <= north and west <= lon <= east
+
+
+def test_grid_edges_belong_to_north_east_cell():
+    df = make_df([(40.0, -75.0), (40.3, -75.3), (39.999999, -75.000001)])
+    keys = tile_keys(df.latitude, df.longitude, "grid", 0.1)
+    assert tile_bbox(keys[0], "grid", 0.1)[:2] == [-75.0, 40.0]
+    assert tile_bbox(keys[1], "grid", 0.1)[:2] == [-75.3, 40.3]
+    assert keys[2] != keys[0]
+
+
+def test_grid_poles_and_antimeridian_stay_in_range():
+    coords = [(90.0, 180.0), (-90.0, -180.0), (0.0, 180.0)]
+    df = make_df(coords)
+    keys = tile_keys(df.latitude, df.longitude, "grid", 7.0)
+    for key, (lat, lon) in zip(keys, coords):
+        assert contains(tile_bbox(key, "grid", 7.0), lat, lon)
+
+
+def test_missing_or_invalid_coordinates_have_no_tile():
+    df = make_df([(None, -75.0), (40.0, np.nan), (91.0, 0.0), (40.0, -75.0)])
+    keys = tile_keys(df.latitude, df.longitude)
+    assert keys.isna().tolist() == [True, True, True, False]
+
+
+def test_geohash_matches_reference_and_bbox():
+    assert geohash_encode(np.array([57.64911]), np.array([10.40744]), 11)[0] == "u4pruydqqvj"
+    west, south, east, north = geohash_bbox("u4pruydqqvj")
+    assert south <= 57.64911 <= north and west <= 10.40744 <= east
+    with pytest.raises(ValueError):
+        tile_keys(pd.Series([1.0]), pd.Series([1.0]), "geohash", 0.5)
+
+
+def test_write_tiles_index_counts_and_removes_empty_tiles(tmp_path):
+    df = make_df([(40.2, -75.1), (40.7, -75.9), (41.5, -74.5), (None, None)])
+    index_path = write_tiles(df, tmp_path, "grid", 1.0)
+    index = json.loads(index_path.read_text())
+    assert index["records"] == 3 and index["unlocated"] == 1
+    assert sorted(t["count"] for t in index["tiles"].values()) == [1, 2]
+    for key, tile in index["tiles"].items():
+        rows = json.loads((tmp_path / tile["path"]).read_text())
+        assert len(rows) == tile["count"]
+        assert all(contains(tile["bbox"], r["latitude"], r["longitude"]) for r in rows)
+
+    # A rerun where a tile has emptied drops its file, leaving unrelated files alone
+    (tmp_path / "markets.map.json").write_text("[]")
+    write_tiles(df.iloc[:2], tmp_path, "grid", 1.0)
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["130_104.json", "index.json", "markets.map.json"]
+
+    index = json.loads(write_tiles(df.iloc[:0], tmp_path, "grid", 1.0).read_text())
+    assert index["tiles"] == {} and index["records"] == 0
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["index.json", "markets.map.json"]
+
+
+def test_export_profile_tiles_format(tmp_path):
+    out = tmp_path / "tiles"
+    profile = {"map_tiles": {
+        "path": str(out), "format": "tiles",
+        "tiling": {"scheme": "geohash", "precision": 3},
+        "fields": ["record_id", "latitude", "longitude"],
+    }}
+    path = tmp_path / "profiles.yml"
+    path.write_text(yaml.safe_dump(profile), encoding="utf-8")
+    exports = export_from_profile(make_df([(40.2, -75.1), (25.8, -80.2)]), str(path))
+    index = json.loads((out / "index.json").read_text())
+    assert exports["map_tiles"] == str(out / "index.json")
+    assert index["scheme"] == "geohash" and len(index["tiles"]) == 2
+    assert all(len(key) == 3 for key in index["tiles"])
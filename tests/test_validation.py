@@ -14,3 +14,60 @@ def test_basic_validate():
     # Row 0 valid, row1 dup, row2 bad longitude, row3 missing lat
     assert len(valid) == 1
     assert len(rejects) == 3
+
+
+def write_rules(tmp_path, body):
+    path = tmp_path / "validation.yml"
+    path.write_text(body, encoding="utf-8")
+    return str(path)
+
+
+def test_rules_from_yaml_report_counts(tmp_path):
+    import numpy as np
+    from ingest.scripts.validate import load_rules, row_reject_bits
+
+    rules = load_rules(write_rules(tmp_path, """
+rules:
+  - {name: name, type: required, column: listing_name, code: "missing:name"}
+  - {name: zip, type: regex, column: zip, pattern: "[0-9]{5}", code: "bad:zip"}
+  - {name: lat, type: range, column: latitude, min: 0, code: "bad:lat"}
+  - {name: snap_pos, type: compare, left: snap_vendor_pos, op: "<=", right: program_snap, code: "bad:pos"}
+  - {name: dup, type: unique, columns: [listing_id], code: "dup"}
+"""))
+    df = pd.DataFrame({
+        "listing_id": ["1", "2", "2", "3", "4"],
+        "listing_name": ["A", "", "C", None, "E"],
+        "zip": ["43201", "4320", None, "", "１２３４５"],
+        "latitude": [1.0, -1.0, 5.0, 2.0, float("nan")],
+        "snap_vendor_pos": [True, True, False, None, True],
+        "program_snap": [True, False, False, True, None],
+    })
+    report = {}
+    valid, rejects = basic_validate(df, rules=rules, report=report)
+
+    assert valid["listing_id"].tolist() == ["1"] and valid["_reject_reason"].tolist() == [""]
+    assert rejects["_reject_reason"].tolist() == [
+        "missing:name;bad:zip;bad:lat;bad:pos;",
+        "dup;",
+        "missing:name;",
+        "bad:zip;bad:lat;",
+    ]
+    assert {name: entry["rejected"] for name, entry in report.items()} == {"name": 2, "zip": 2, "lat": 2, "snap_pos": 1, "dup": 1}
+    assert all(entry["seconds"] >= 0 for entry in report.values())
+    assert "listing_id" in df and "_reject_reason" not in df
+    # Bits are rule positions; unique rules are left to basic_validate
+    assert row_reject_bits(df, rules).tolist() == [0, 0b1111, 0, 0b1, 0b110]
+    assert basic_validate(df, row_bits=np.zeros(len(df), dtype=np.int64), rules=rules)[1]["_reject_reason"].tolist() == ["dup;"]
+
+
+def test_invalid_rules_are_rejected(tmp_path):
+    import pytest
+    from ingest.scripts.validate import load_rules
+
+    with pytest.raises(ValueError, match="unknown type"):
+        load_rules(write_rules(tmp_path, "rules:\n  - {name: x, type: fancy, column: a}\n"))
+    with pytest.raises(ValueError, match="op must be"):
+        load_rules(write_rules(tmp_path, "rules:\n  - {name: x, type: compare, left: a, op: '=~', value: 1}\n"))
+    too_many = "rules:\n" + "".join(f"  - {{name: r{i}, type: required, column: a}}\n" for i in range(64))
+    with pytest.raises(ValueError, match="At most 63"):
+        load_rules(write_rules(tmp_path, too_many))
@@ -0,0 +1,124 @@
+import os
+
+from typer.testing import CliRunner
+
+from ingest.scripts import cli
+from ingest.scripts.watch import Watcher
+from conftest import make_raw_frame
+
+DATASETS = {
+    "farmers_market": {"glob": "farmersmarket_*.xlsx"},
+    "csa": {"glob": "csa_*.xlsx"},
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_watcher_debounces_changes(tmp_path):
+    (tmp_path / "farmersmarket_2025-01-01.xlsx").write_bytes(b"old")
+    clock = Clock()
+    watcher = Watcher(tmp_path, DATASETS, debounce=2.0, clock=clock)
+    assert watcher.poll() == []
+
+    new = tmp_path / "farmersmarket_2025-02-01.xlsx"
+    new.write_bytes(b"partial")
+    os.utime(new, (2e9, 2e9))
+    assert watcher.poll() == []
+    clock.now = 1.5
+    # Still being written: the quiet period starts over
+    new.write_bytes(b"partial, now complete")
+    os.utime(new, (2e9 + 1, 2e9 + 1))
+    (tmp_path / "csa_2025-02-01.xlsx").write_bytes(b"csa")
+    assert watcher.poll() == []
+    clock.now = 3.0
+    assert watcher.poll() == []
+    clock.now = 3.6
+    assert watcher.poll() == ["farmers_market", "csa"]
+    clock.now = 10.0
+    assert watcher.poll() == []
+
+
+def test_watcher_ignores_reverted_changes(tmp_path):
+    path = tmp_path / "csa_2025-01-01.xlsx"
+    path.write_bytes(b"a")
+    clock = Clock()
+    watcher = Watcher(tmp_path, DATASETS, debounce=1.0, clock=clock)
+    path.unlink()
+    assert watcher.poll() == []
+    path.write_bytes(b"a")
+    os.utime(path, ns=(watcher.current["csa"][2],) * 2)
+    clock.now = 5.0
+    assert watcher.poll() == []
+
+
+def test_watch_cycle_reingests_only_changed_dataset(workspace, monkeypatch):
+    raw = workspace / "data" / "raw"
+    make_raw_frame(5).to_excel(raw / "farmersmarket_2025-01-01.xlsx", index=False)
+    make_raw_frame(3, offset=20).to_excel(raw / "csa_2025-01-01.xlsx", index=False)
+    # An opt-in profile that doesn't read listing_name
+    exports = workspace / "export_profiles.yml"
+    exports.write_text(open(cli.EXPORTS).read() + "spatial_index:\n  path: site/static/data/markets.spatial.json\n"
+                       "  format: spatial_index\n  fields: [latitude, longitude]\n")
+    monkeypatch.setattr(cli, "EXPORTS", str(exports))
+    state = {}
+    manifest = cli._watch_cycle(state, list(cli._load_dataset_config()))
+    assert manifest["records_valid"] == 8
+    assert set(manifest["exported"]) == set(manifest["exports"]) - {"zip_centroids", "city_centroids"}
+    csa_frame = state["sources"]["csa"][0]
+    centroids = workspace / "site" / "static" / "data" / "city.centroids.json"
+    os.utime(centroids, (1, 1))
+
+    loads = []
+    real_load = cli._load_dataset
+    monkeypatch.setattr(cli, "_load_dataset", lambda key, *args, **kwargs: loads.append(key) or real_load(key, *args, **kwargs))
+    changed = make_raw_frame(5)
+    changed.loc[0, "listing_name"] = "Renamed Market"
+    changed.to_excel(raw / "farmersmarket_2025-02-01.xlsx", index=False)
+    os.utime(raw / "farmersmarket_2025-02-01.xlsx", (2e9, 2e9))
+
+    manifest = cli._watch_cycle(state, ["farmers_market"])
+    assert loads == ["farmers_market"]
+    assert state["sources"]["csa"][0] is csa_frame
+    assert "map" in manifest["exported"] and "spatial_index" not in manifest["exported"]
+    assert set(manifest["export_report"]) == set(state["digests"])
+    # Same cities: the centroid file isn't rewritten
+    assert centroids.stat().st_mtime == 1
+    assert manifest["delta"]["changed"] == 1
+
+    manifest = cli._watch_cycle(state, ["farmers_market"])
+    assert manifest["exported"] == []
+
+
+def test_watch_command_runs_once(workspace):
+    make_raw_frame(4).to_excel(workspace / "data" / "raw" / "farmersmarket_2025-01-01.xlsx", index=False)
+    result = CliRunner().invoke(cli.APP, ["watch", "--max-runs", "1", "--interval", "0.05"])
+    assert result.exit_code == 0, result.output
+    assert "[watch] initial run: 4 valid records" in result.output
+    assert (workspace / "data" / "processed" / "manifest.json").exists()
+
+
+def test_watch_survives_a_corrupt_workbook(workspace, monkeypatch):
+    raw = workspace / "data" / "raw"
+    make_raw_frame(4).to_excel(raw / "csa_2025-01-01.xlsx", index=False)
+    (raw / "farmersmarket_2025-01-01.xlsx").write_bytes(b"PK\x03\x04 half-copied")
+    sleeps = []
+
+    def sleep(_):
+        # The copy finishes while the watcher waits
+        if not sleeps:
+            make_raw_frame(5, offset=10).to_excel(raw / "farmersmarket_2025-01-01.xlsx", index=False)
+            os.utime(raw / "farmersmarket_2025-01-01.xlsx", (2e9, 2e9))
+        sleeps.append(1)
+
+    monkeypatch.setattr(cli.time, "sleep", sleep)
+    result = CliRunner(mix_stderr=False).invoke(cli.APP, ["watch", "--max-runs", "2", "--debounce", "0"])
+    assert result.exit_code == 0, result.stderr
+    assert "[error] initial run failed" in result.stderr
+    # The failed datasets are retried along with the change
+    assert "[watch] farmers_market, csa, " in result.stdout and ": 9 valid records" in result.stdout